@@ -7,7 +7,6 @@ import win32api
 import os
 import winreg
 import subprocess
-import pandas as pd
 import re
 from datetime import datetime
 import pygetwindow as gw
@@ -17,10 +16,6 @@ from PyQt5.QtWidgets import QMessageBox, QApplication
 import sys
 import threading
 
-import pickle
-
-focus_data_csv = pd.read_csv('finalised/dataset/focus_data.csv')
-
 
 class AppTracker:
     def __init__(self):
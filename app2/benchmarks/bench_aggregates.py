@@ -0,0 +1,116 @@
+"""Cost of updating the Suggestions tab after a session, and of loading it at startup.
+
+"recompute" is the path SuggestionsUI.update_models used to take after every
+session: re-query the last 10 sessions, rebuild the feature frame and run a
+groupby per prediction. "aggregates" reads only the new session, folds it into
+the running SessionAggregates, saves them and reads the same three
+predictions. Startup compares building the aggregates from every session with
+loading the saved ones.
+
+Run from the app2 directory:
+    python benchmarks/bench_aggregates.py [sessions]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+
+import numpy as np
+
+import bench_stats_refresh
+from database import Database
+from features import load_encoders, prepare_sessions
+from session_aggregates import load_user_aggregates, HALF_LIFE_DAYS
+
+UPDATES = 50
+
+
+def add_session(db, user_id, i):
+    db.connect()
+    db.cursor.execute(
+        """INSERT INTO focus_sessions
+           (user_id, date, day, start_time, end_time, task_type, app_switch_count,
+            distraction_duration, total_focus_duration, focus_score,
+            productivity_percentage, break_duration)
+           VALUES (?, '2025-01-15', 'Wednesday', '10:00:00', '10:45:00', 'Coding', ?, 5, 40, 7, 80, 5)""",
+        (user_id, i % 10)
+    )
+    db.conn.commit()
+    db.sessions_version += 1  # As end_focus_session does
+    db.close()
+
+
+def best(df, column):
+    stats = df.groupby(column).agg({'Focus Score (0-10)': 'mean', 'Productivity %': 'mean',
+                                    'Weighted Focus Score': 'mean', 'Weighted Productivity': 'mean'})
+    return stats.prod(axis=1).idxmax()
+
+
+def recompute(db, user_id, encoders):
+    df, _ = prepare_sessions(db.get_user_sessions(user_id, limit=10), encoders)
+    return best(df, 'Day'), best(df, 'Hour'), best(df, 'Session Length')
+
+
+def fold(db, user_id, aggregates):
+    aggregates.catch_up(db, user_id)
+    db.save_user_aggregates(user_id, aggregates.to_json())
+    return aggregates.best_day(), aggregates.best_hour(), aggregates.best_length()
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def check(db, user_id, aggregates):
+    """The running means match a decayed mean computed from scratch."""
+    sessions = db.get_completed_sessions_after(user_id, 0)
+    days = np.array([np.datetime64(s[1], 'D').astype(np.int64) + int(s[3][:2]) / 24 for s in sessions])
+    hours = np.array([int(s[3][:2]) for s in sessions])
+    focus = np.array([s[9] for s in sessions], dtype=np.float64)
+    weights = 2.0 ** ((days - days.max()) / HALF_LIFE_DAYS)
+    expected = [np.average(focus[hours == h], weights=weights[hours == h]) if (hours == h).any() else np.nan
+                for h in range(24)]
+    assert np.allclose(aggregates.mean('hour', 'focus_score'), expected, equal_nan=True)
+
+
+def main():
+    bench_stats_refresh.SESSION_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    encoders = load_encoders()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        db.register_user("bench", "bench")
+        bench_stats_refresh.populate(db, 1)
+
+        cold_ms = timed(load_user_aggregates, db, 1)  # Nothing saved yet: reads every session
+        warm_ms = statistics.median(timed(load_user_aggregates, db, 1) for _ in range(20))
+        aggregates = load_user_aggregates(db, 1)
+        check(db, 1, aggregates)
+
+        recompute_ms, fold_ms = [], []
+        for i in range(UPDATES):
+            add_session(db, 1, i)
+            recompute_ms.append(timed(recompute, db, 1, encoders))
+            fold_ms.append(timed(fold, db, 1, aggregates))
+        check(db, 1, aggregates)
+        state_bytes = len(db.get_user_aggregates(1))
+
+    count = bench_stats_refresh.SESSION_COUNT
+    print(f"{count:,} stored sessions, {UPDATES} new sessions")
+    print(f"per session  recompute (last 10 + groupby)  {statistics.median(recompute_ms):7.2f} ms")
+    print(f"per session  aggregates (fold + save)       {statistics.median(fold_ms):7.2f} ms")
+    print(f"startup      build from all sessions        {cold_ms:7.2f} ms")
+    print(f"startup      load saved aggregates          {warm_ms:7.2f} ms  ({state_bytes:,} bytes saved)")
+    print(f"recommends {aggregates.best_day()} at {aggregates.best_hour()}:00, "
+          f"{aggregates.best_length()} min sessions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark the Statistics chart aggregations on synthetic session data.
+
+Run from the app2 directory:
+    python benchmarks/bench_chart_aggregations.py [session_count]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from session_stats import SessionColumns
+
+
+def synthetic_rows(count, seed=0):
+    """Build (date, start_time, focus_score, focus_duration, distraction_duration) rows."""
+    rng = np.random.default_rng(seed)
+    years = rng.integers(2019, 2026, count)
+    months = rng.integers(1, 13, count)
+    days = rng.integers(1, 29, count)
+    hours = rng.integers(0, 24, count)
+    minutes = rng.integers(0, 60, count)
+    scores = rng.integers(1, 11, count).astype(object)
+    scores[rng.random(count) < 0.05] = None  # Unrated sessions
+    focus = rng.uniform(5, 60, count)
+    distraction = rng.uniform(0, 20, count)
+
+    dates = [f"{y}-{m:02d}-{d:02d}" for y, m, d in zip(years.tolist(), months.tolist(), days.tolist())]
+    times = [f"{h:02d}:{mi:02d}:00" for h, mi in zip(hours.tolist(), minutes.tolist())]
+    return list(zip(dates, times, scores.tolist(), focus.tolist(), distraction.tolist()))
+
+
+def dict_of_lists_by_hour(rows):
+    """The per-row grouping update_chart used before the columnar layer."""
+    hour_data = {}
+    for date, start_time, score, focus, distraction in rows:
+        if start_time and score is not None:
+            hour = int(start_time.split(':')[0])
+            hour_data.setdefault(hour, []).append(score)
+    hours = sorted(hour_data)
+    return hours, [sum(hour_data[h]) / len(hour_data[h]) for h in hours]
+
+
+def timed(label, fn, repeat=5):
+    """Print the best time of fn in milliseconds and return its result."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:10.2f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"Generating {count} synthetic sessions...")
+    rows = synthetic_rows(count)
+
+    columns = timed("Build typed columns (once per snapshot)", lambda: SessionColumns.from_rows(rows), repeat=3)
+    print()
+    timed("Focus score by hour", columns.mean_score_by_hour)
+    timed("Focus score by day of month", columns.mean_score_by_day_of_month)
+    timed("Focus score by month", columns.mean_score_by_month)
+    timed("Focus vs. distraction totals", columns.total_focus_and_distraction)
+    dates, _ = timed("Focus score trend by date", columns.mean_score_by_date)
+    print(f"  ({len(dates)} distinct dates)")
+    print()
+    timed("Previous dict-of-lists by hour", lambda: dict_of_lists_by_hour(rows), repeat=1)
+
+    # The columnar result must match the old per-row grouping
+    old_hours, old_means = dict_of_lists_by_hour(rows)
+    new_hours, new_means = columns.mean_score_by_hour()
+    assert list(new_hours) == old_hours and np.allclose(new_means, old_means)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Measure chart switching in the Statistics tab with the off-thread image cache.
+
+Also times showing the tab and resizing it: the Qt-thread time spent
+rendering the live figure, and how long until the chart at the new size is
+on screen as an image.
+
+Run from the app2 directory:
+    python benchmarks/bench_chart_cache.py [session_count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+import bench_stats_refresh
+from database import Database
+from stats_ui import StatsWidget
+
+CHARTS = [
+    ("Focus Score vs Time", "Day"),
+    ("Focus Score vs Time", "Week"),
+    ("Focus Score vs Time", "Month"),
+    ("Focus Score vs Time", "Year"),
+    ("Focus vs. Distraction Time", "Day"),
+    ("Productivity by Time of Day", "Day"),
+    ("Focus Score Trend Over Days", "Day"),
+]
+
+
+def select(widget, chart_type, period):
+    """Pick a chart the way the user would, through the combo boxes."""
+    widget.time_period_combo.blockSignals(True)
+    widget.time_period_combo.setCurrentText(period)
+    widget.time_period_combo.blockSignals(False)
+    if widget.chart_type_combo.currentText() == chart_type:
+        widget.update_chart()
+    else:
+        widget.chart_type_combo.setCurrentText(chart_type)
+
+
+def wait_for_image(app, widget, timeout=5.0):
+    """Spin the event loop until the selected chart is on screen as an image."""
+    key = widget.current_image_key()
+    deadline = time.perf_counter() + timeout
+    while widget.chart_images.get(key) is None and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.0005)
+
+
+class LiveDrawTimer:
+    """Adds up the time the Qt thread spends rendering the widget's live figure."""
+
+    def __init__(self, widget):
+        self.ms = 0.0
+        self.wrap(widget.chart_renderer, "render")
+        self.wrap(widget.canvas, "draw")
+
+    def wrap(self, owner, name):
+        method = getattr(owner, name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.ms += (time.perf_counter() - start) * 1000
+
+        setattr(owner, name, timed)
+
+
+def show_and_resize(app, widget):
+    """Print the Qt-thread rendering and time to image for showing and resizing the tab."""
+    live = LiveDrawTimer(widget)
+    steps = [
+        ("Show the tab", lambda: (widget.resize(1000, 900), widget.show())),
+        ("Resize to 1200 x 1000", lambda: widget.resize(1200, 1000)),
+        ("Resize back to 1000 x 900", lambda: widget.resize(1000, 900)),
+    ]
+    print(f"{'Step':<42} {'live render':>12} {'image on screen':>16}")
+    for label, action in steps:
+        live.ms = 0.0
+        start = time.perf_counter()
+        action()
+        app.processEvents()
+        wait_for_image(app, widget)
+        image = widget.chart_images.get(widget.current_image_key())
+        on_screen = image is not None and widget.canvas.cached_image is image
+        ready = (time.perf_counter() - start) * 1000
+        print(f"{label:<42} {live.ms:9.2f} ms {ready:10.2f} ms{'' if on_screen else ' (not shown)'}")
+    print()
+
+
+def main():
+    bench_stats_refresh.SESSION_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app = QApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        db.register_user("bench", "bench")
+        bench_stats_refresh.populate(db, 1)
+
+        widget = StatsWidget(db, 1)
+        show_and_resize(app, widget)
+        sessions = widget.get_sessions()
+        print(f"{len(sessions)} sessions\n")
+        # What every switch cost before: render and draw the live figure on the Qt thread
+        for chart_type, period in CHARTS:
+            widget.chart_renderer.render(chart_type, period, sessions)  # Build the axes once
+        sync = {}
+        for chart_type, period in CHARTS:
+            start = time.perf_counter()
+            widget.chart_renderer.render(chart_type, period, sessions)
+            widget.canvas.draw()
+            sync[chart_type, period] = (time.perf_counter() - start) * 1000
+
+        first_view = {}
+        for chart_type, period in CHARTS:
+            start = time.perf_counter()
+            select(widget, chart_type, period)
+            miss = (time.perf_counter() - start) * 1000
+            wait_for_image(app, widget)
+            first_view[chart_type, period] = miss, (time.perf_counter() - start) * 1000
+
+        print(f"{'Chart':<42} {'sync draw':>10} {'first view':>11} {'on screen':>10} {'revisit':>9}")
+        for chart_type, period in CHARTS:
+            start = time.perf_counter()
+            select(widget, chart_type, period)
+            hit = (time.perf_counter() - start) * 1000
+            miss, ready = first_view[chart_type, period]
+            label = f"{chart_type} ({period})"
+            print(f"{label:<42} {sync[chart_type, period]:7.2f} ms {miss:8.2f} ms "
+                  f"{ready:7.2f} ms {hit:6.2f} ms")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Measure pan/zoom frame times of the Statistics chart.
+
+Plots the focus score trend for one session per day (10k days by default)
+and times full redraws against the blitted pan/zoom frames.
+
+Run from the app2 directory:
+    python benchmarks/bench_chart_interaction.py [day_count ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from database import Database
+from stats_ui import StatsWidget
+
+FRAMES = 100
+
+
+def populate(db, user_id, count):
+    """Insert one finished session per day for count consecutive days."""
+    rng = random.Random(3)
+    first = date(2000, 1, 1)
+    rows = []
+    for i in range(count):
+        rows.append((
+            user_id, (first + timedelta(days=i)).isoformat(), "Monday", "09:00:00", "10:00:00",
+            "Coding", 3, 5.0, 40.0, rng.randint(1, 10), 88.0, 5
+        ))
+    db.connect()
+    db.cursor.executemany(
+        """INSERT INTO focus_sessions
+           (user_id, date, day, start_time, end_time, task_type, app_switch_count,
+            distraction_duration, total_focus_duration, focus_score,
+            productivity_percentage, break_duration)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows
+    )
+    db.conn.commit()
+    db.close()
+
+
+def frame_times(app, frame):
+    """Run frame(i) FRAMES times, flushing Qt paint events after each one."""
+    timings = []
+    for i in range(FRAMES):
+        start = time.perf_counter()
+        frame(i)
+        app.processEvents()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+
+
+def report(label, times):
+    median, p95 = times
+    print(f"{label:<40} median {median:7.2f} ms   p95 {p95:7.2f} ms")
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10000]
+    app = QApplication(sys.argv[:1])
+    for count in counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, "bench.db"))
+            db.register_user("bench", "bench")
+            populate(db, 1, count)
+            run(app, db, count)
+    app.quit()
+
+
+def run(app, db, count):
+    """Print frame times for the trend chart over count days of history."""
+    widget = StatsWidget(db, 1)
+    widget.resize(1000, 900)
+    widget.show()
+    widget.chart_type_combo.setCurrentText("Focus Score Trend Over Days")
+    widget.show_live_chart()
+    widget.canvas.draw()
+    app.processEvents()
+    chart = widget.chart_renderer.current
+    print(f"{count} days of history, {len(chart.line.get_xdata())} points drawn "
+          f"({chart.ax.get_title()})")
+
+    ax = chart.ax
+    x0, y0 = ax.bbox.x0 + ax.bbox.width / 2, ax.bbox.y0 + ax.bbox.height / 2
+
+    report("Full redraw", frame_times(app, lambda i: widget.canvas.draw()))
+
+    widget.is_panning = True
+    widget.pan_start = (x0, y0, ax.get_xlim(), ax.get_ylim())
+    report("Pan, blitted frames", frame_times(app, lambda i: widget.pan_chart(x0 - i, y0)))
+    widget.is_panning = False
+    widget.finish_interaction()
+    widget.reset_view()
+    widget.show_live_chart()
+
+    report("Zoom in, blitted frames", frame_times(app, lambda i: widget.zoom_chart(0.95)))
+    widget.finish_interaction()
+    print(f"  zoomed to {len(chart.line.get_xdata())} points ({ax.get_title()})")
+    report("Zoom out, blitted frames", frame_times(app, lambda i: widget.zoom_chart(1 / 0.95)))
+    widget.finish_interaction()
+
+    print()
+    widget.close()
+
+
+if __name__ == "__main__":
+    main()
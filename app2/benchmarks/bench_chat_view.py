@@ -0,0 +1,122 @@
+"""Time adding and streaming chat messages as a conversation grows.
+
+"setHtml" is the old update_chat_display: regenerate the HTML of every
+message and replace the whole document on each change. "ChatView" appends
+one frame per message and redraws only the message being streamed into.
+Each line gives the median time to add one message, and to apply one
+streamed chunk to the last message, once the chat holds that many messages.
+
+Run from the app2 directory:
+    python benchmarks/bench_chat_view.py
+"""
+import os
+import statistics
+import sys
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QTextEdit
+
+from chat_view import ChatView, MAX_RENDERED_MESSAGES
+from suggestions_ui import ChatMessage, ACCENT_COLOR, DARK_TERTIARY, DARK_TEXT
+
+CHECKPOINTS = [10, 100, 300, 600]
+CHUNKS = 20
+REPLY = ("Based on your recent sessions, your focus peaks in the late morning. "
+         "Try blocking notifications for the first twenty minutes of each session.\n") * 3
+
+
+def legacy_html(message):
+    align = "right" if message.is_user else "left"
+    bg_color = ACCENT_COLOR if message.is_user else DARK_TERTIARY
+    sender = "You" if message.is_user else "Focus AI"
+    text = message.text.replace('\n', '<br>')
+    return f"""
+        <div style="text-align: {align}; margin: 10px;">
+            <div style="display: inline-block; background-color: {bg_color}; color: {DARK_TEXT}; padding: 10px; border-radius: 10px; max-width: 80%;">
+                <b>{sender}</b>
+                <p style="color: {DARK_TEXT};">{text}</p>
+                <div style="font-size: 8pt; color: #cccccc; text-align: right;">{message.timestamp.strftime("%H:%M")}</div>
+            </div>
+        </div>
+        """
+
+
+class SetHtmlChat:
+    def __init__(self, view):
+        self.view = view
+        self.messages = []
+
+    def redraw(self):
+        self.view.setHtml("".join(legacy_html(message) for message in self.messages))
+        self.view.verticalScrollBar().setValue(self.view.verticalScrollBar().maximum())
+
+    def append_message(self, message):
+        self.messages.append(message)
+        self.redraw()
+
+    def update_message(self, message):
+        self.redraw()
+
+
+def run(app, chat):
+    """Per checkpoint: (median ms to add a message, median ms per streamed chunk)."""
+    results = {}
+    count = 0
+    for checkpoint in CHECKPOINTS:
+        adds = []
+        while count < checkpoint:
+            start = time.perf_counter()
+            chat.append_message(ChatMessage(f"question {count}" if count % 2 else REPLY, count % 2 == 1))
+            app.processEvents()
+            adds.append((time.perf_counter() - start) * 1000)
+            count += 1
+        streaming = ChatMessage("")
+        chat.append_message(streaming)
+        count += 1
+        chunks = []
+        for i in range(CHUNKS):
+            start = time.perf_counter()
+            streaming.text += f"word{i} "
+            chat.update_message(streaming)
+            app.processEvents()
+            chunks.append((time.perf_counter() - start) * 1000)
+        results[checkpoint] = (statistics.median(adds[-10:]), statistics.median(chunks))
+    return results
+
+
+def main():
+    app = QApplication(sys.argv[:1])
+
+    old_view = QTextEdit()
+    old_view.resize(600, 500)
+    old_view.show()
+    old = run(app, SetHtmlChat(old_view))
+
+    view = ChatView()
+    view.resize(600, 500)
+    view.show()
+    new = run(app, view)
+
+    print(f"{'messages':>8} {'add: setHtml':>13} {'ChatView':>9} {'chunk: setHtml':>15} {'ChatView':>9}")
+    for checkpoint in CHECKPOINTS:
+        (old_add, old_chunk), (new_add, new_chunk) = old[checkpoint], new[checkpoint]
+        print(f"{checkpoint:8} {old_add:10.2f} ms {new_add:6.2f} ms {old_chunk:12.2f} ms {new_chunk:6.2f} ms")
+
+    rendered = len(view.document().rootFrame().childFrames())
+    print(f"ChatView keeps {len(view.messages)} messages, {rendered} rendered "
+          f"(limit {MAX_RENDERED_MESSAGES}); setHtml document holds all {len(old_view.toPlainText()):,} characters")
+    start = time.perf_counter()
+    view.verticalScrollBar().setValue(0)
+    app.processEvents()
+    print(f"scrolling to the top draws {len(view.document().rootFrame().childFrames()) - rendered} earlier "
+          f"messages in {(time.perf_counter() - start) * 1000:.1f} ms")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Time loading the training datasets from their sources and from the columnar cache.
+
+"source" parses each CSV/XLSX file with pandas, as training used to.
+"cache" is dataset_cache.load_dataset on a warm cache, including hashing
+the source to check the cache is current. "convert" is building a cache
+from scratch. The script also checks the cached frames hold the same
+values as the parsed ones, and that numeric columns are views of the
+memory-mapped files rather than copies.
+
+Run from the app2 directory:
+    python benchmarks/bench_dataset_cache.py
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+
+import numpy as np
+import pandas as pd
+
+import dataset_cache
+
+REPEATS = 20
+
+
+def median_ms(action, repeats=REPEATS):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        action()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def same_values(parsed, cached):
+    if list(parsed.columns) != list(cached.columns):
+        return False
+    for name in parsed.columns:
+        left, right = parsed[name], cached[name]
+        if isinstance(right.dtype, pd.CategoricalDtype):
+            left = [None if pd.isna(value) else str(value) for value in left]
+            right = [None if pd.isna(value) else value for value in right]
+            if left != right:
+                return False
+        elif pd.api.types.is_datetime64_any_dtype(right):
+            if not np.array_equal(left.to_numpy(dtype="datetime64[ns]"), right.to_numpy()):
+                return False
+        elif not np.array_equal(left.to_numpy(), right.to_numpy(), equal_nan=True):
+            return False
+    return True
+
+
+def file_backed(array):
+    """Whether an array is a view into a memory-mapped file."""
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset_dir = os.path.join(tmp, "dataset")
+        shutil.copytree(dataset_cache.DATASET_DIR, dataset_dir,
+                        ignore=shutil.ignore_patterns(dataset_cache.CACHE_DIRNAME))
+        names = sorted(name for name in os.listdir(dataset_dir)
+                       if name.endswith(dataset_cache.SOURCE_EXTENSIONS))
+
+        print(f"{'dataset':16} {'rows':>5} {'source':>10} {'cache':>9} {'convert':>10}")
+        totals = np.zeros(3)
+        checks = []
+        for name in names:
+            path = os.path.join(dataset_dir, name)
+            directory = dataset_cache.cache_path(path)
+            source_ms = median_ms(lambda: dataset_cache.read_source(path))
+
+            def convert():
+                shutil.rmtree(directory, ignore_errors=True)
+                dataset_cache.load_dataset(path)
+            convert_ms = median_ms(convert, 5)
+            cache_ms = median_ms(lambda: dataset_cache.load_dataset(path))
+
+            parsed, cached = dataset_cache.read_source(path), dataset_cache.load_dataset(path)
+            numeric = [name for name in cached.columns if pd.api.types.is_numeric_dtype(cached[name])]
+            mapped = all(file_backed(cached[name].to_numpy()) for name in numeric)
+            checks.append((same_values(parsed, cached), mapped))
+
+            totals += (source_ms, cache_ms, convert_ms)
+            print(f"{name:16} {len(parsed):5} {source_ms:7.2f} ms {cache_ms:6.2f} ms {convert_ms:7.2f} ms")
+        print(f"{'all':16} {'':5} {totals[0]:7.2f} ms {totals[1]:6.2f} ms {totals[2]:7.2f} ms")
+        print(f"same values as parsed: {sum(same for same, _ in checks)}/{len(checks)}; "
+              f"numeric columns memory-mapped: {sum(mapped for _, mapped in checks)}/{len(checks)}")
+
+        # A changed source invalidates its cache on the next load
+        path = os.path.join(dataset_dir, "student1.csv")
+        with open(path, "a") as f:
+            f.write("999,01-03-2025,Saturday,09:00,09:30,studying,1,2,28,8,93.3\n")
+        print(f"after appending a row to student1.csv: {len(dataset_cache.load_dataset(path))} rows "
+              f"(source has {len(dataset_cache.read_source(path))})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Per-tick cost of the distraction anomaly check during a simulated session.
+
+Replays a 50 minute session checked every 5 seconds, as PomodoroWidget does,
+once focused and once drifting into distraction halfway through, and
+reports the cost of each DistractionMonitor.update() against TICK_BUDGET_MS.
+"sklearn predict" is the same check through the model's predict(), for
+comparison.
+
+Run from the app2 directory:
+    python benchmarks/bench_distraction_monitor.py
+"""
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+
+import numpy as np
+
+from distraction_monitor import DistractionMonitor, TICK_BUDGET_MS
+from model_registry import models
+
+TICK_MINS = 5 / 60
+SESSION_MINS = 50
+
+
+def replay(monitor, distracted_from):
+    """Feed the monitor one session; returns tick costs in ms and the alerts raised."""
+    alerts = []
+    monitor.anomaly_detected.connect(lambda observed, expected: alerts.append((observed, expected)))
+    monitor.start("Coding", datetime(2025, 4, 28, 10, 0))
+
+    switches, distraction, focus, costs = 0, 0.0, 0.0, []
+    for tick in range(int(SESSION_MINS / TICK_MINS)):
+        minute = tick * TICK_MINS
+        if minute >= distracted_from:
+            distraction += TICK_MINS
+            switches += tick % 6 == 0
+        else:
+            focus += TICK_MINS
+            switches += tick % 60 == 0
+        monitor.update(switches, distraction, focus)
+        costs.append(monitor.last_tick_ms)
+    return costs, alerts
+
+
+def main():
+    models.get("anomaly")  # Loaded at login in the app; not part of a tick
+
+    for name, distracted_from in [("focused session", SESSION_MINS), ("distracted after 25 min", 25)]:
+        costs, alerts = replay(DistractionMonitor(), distracted_from)
+        costs = sorted(costs)
+        print(f"{name}: {len(costs)} ticks, median {statistics.median(costs) * 1000:.1f} us, "
+              f"p99 {costs[int(len(costs) * 0.99)] * 1000:.1f} us, max {costs[-1] * 1000:.1f} us "
+              f"(budget {TICK_BUDGET_MS * 1000:.0f} us)")
+        for observed, expected in alerts:
+            print(f"  alert: {observed:.1f} min distracted, {expected:.1f} min expected")
+
+    predictor = models.get("anomaly")
+    row = [4, 0, 1, 10, 30.0]
+    for label, function in [("forward pass", lambda: predictor.predict_one(row)),
+                            ("sklearn predict", lambda: predictor.predict(np.array([row])))]:
+        start = time.perf_counter()
+        for _ in range(2000):
+            function()
+        print(f"{label:<16} {(time.perf_counter() - start) / 2000 * 1e6:6.1f} us per prediction")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Throughput of exporting sessions to the feature store and reading them back.
+
+Fills a temporary database with ROWS finished sessions and exports them all
+to a SessionStore, then times the incremental case: one new session
+exported after each of SINGLE_EXPORTS sessions end. Reads are timed for the
+whole store, for only the rows after a watermark, and, as the alternative of
+re-reading everything, for fetching all sessions from SQLite.
+
+Run from the app2 directory:
+    python benchmarks/bench_feature_store.py [rows]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+
+from database import Database
+from feature_store import SessionStore
+
+ROWS = 1_000_000
+SINGLE_EXPORTS = 50
+TASK_TYPES = ["Coding", "Writing", "Studying", "Reading", "Meeting", "Other"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def session_rows(count, start=0):
+    rng = random.Random(start)
+    for i in range(start, start + count):
+        focus = rng.uniform(5, 50)
+        distraction = rng.uniform(0, 15)
+        yield (i % 50 + 1, f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}", DAYS[i % 7],
+               f"{rng.randint(6, 22):02d}:{rng.randint(0, 59):02d}:00", "23:00:00",
+               TASK_TYPES[i % len(TASK_TYPES)], rng.randint(0, 20), distraction, focus,
+               rng.randint(1, 10), focus / (focus + distraction) * 100)
+
+
+def insert(db, rows):
+    db.connect()
+    db.cursor.executemany(
+        """INSERT INTO focus_sessions
+           (user_id, date, day, start_time, end_time, task_type, app_switch_count,
+            distraction_duration, total_focus_duration, focus_score, productivity_percentage)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows
+    )
+    db.conn.commit()
+    db.close()
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        _, insert_s = timed(lambda: insert(db, session_rows(rows)))
+        print(f"{rows:,} sessions inserted into SQLite in {insert_s:.1f} s")
+
+        store = SessionStore(os.path.join(tmp, "store"))
+        exported, export_s = timed(lambda: store.export(db))
+        print(f"full export: {exported:,} rows in {export_s:.2f} s ({exported / export_s:,.0f} rows/s), "
+              f"{len(store.meta['chunks'])} chunks")
+
+        watermark = store.watermark
+        single = []
+        for i in range(SINGLE_EXPORTS):
+            insert(db, session_rows(1, rows + i))
+            single.append(timed(lambda: store.export(db))[1] * 1000)
+        print(f"one new session: median {statistics.median(single):.2f} ms per export, "
+              f"max {max(single):.2f} ms; {len(store.meta['chunks'])} chunks")
+
+        df, read_s = timed(lambda: store.read())
+        print(f"read everything: {len(df):,} rows in {read_s * 1000:.0f} ms ({len(df) / read_s:,.0f} rows/s)")
+        new, new_s = timed(lambda: store.read(after=watermark))
+        print(f"read after the watermark: {len(new):,} rows in {new_s * 1000:.2f} ms")
+        _, fresh_s = timed(lambda: SessionStore(store.directory).read(after=watermark))
+        print(f"  including opening the store: {fresh_s * 1000:.2f} ms")
+        sqlite_rows, sqlite_s = timed(lambda: db.get_all_completed_sessions_after(0, rows * 2))
+        print(f"re-reading everything from SQLite: {len(sqlite_rows):,} rows in {sqlite_s:.2f} s "
+              f"({len(sqlite_rows) / sqlite_s:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
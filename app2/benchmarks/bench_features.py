@@ -0,0 +1,118 @@
+"""Compare the vectorised feature pipeline with the row-by-row one it replaced.
+
+legacy_prepare is the old SuggestionsUI.prepare_data_for_models, kept here
+only as the baseline: a dict per row, .apply() for session lengths, recency
+weights and productivity labels, and LabelEncoders refitted on every call.
+
+Run from the app2 directory:
+    python benchmarks/bench_features.py [rows]
+"""
+import os
+import random
+import sys
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+from features import load_encoders, prepare_sessions
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+TASK_TYPES = ["Coding", "Reading", "Writing", "Studying", "Others"]
+
+
+def make_sessions(count):
+    """Session tuples shaped like Database.get_user_sessions rows."""
+    rng = random.Random(7)
+    sessions = []
+    for i in range(count):
+        focus = rng.uniform(5, 80)
+        sessions.append((
+            i, f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}", rng.choice(DAYS),
+            f"{rng.randint(6, 22):02d}:{rng.randint(0, 59):02d}:00", "23:00:00",
+            rng.choice(TASK_TYPES), rng.randint(0, 20), rng.uniform(0, 15), focus,
+            rng.randint(1, 10), rng.uniform(20, 100), 5
+        ))
+    return sessions
+
+
+def assign_weight(days):
+    if days <= 7:
+        return 1.0
+    elif days <= 14:
+        return 0.75
+    elif days <= 21:
+        return 0.5
+    else:
+        return 0.25
+
+
+def legacy_prepare(sessions):
+    data = []
+    for session in sessions:
+        session_id, date, day, start_time, end_time, task_type, app_switch_count, distraction_duration, total_focus_duration, focus_score, productivity_percentage, break_duration = session
+        if None in [date, day, start_time, total_focus_duration, focus_score, productivity_percentage]:
+            continue
+        data.append({
+            'Date': date,
+            'Day': day.lower() if isinstance(day, str) else 'monday',
+            'Start Time': start_time,
+            'End Time': end_time,
+            'Task Type': task_type.lower() if isinstance(task_type, str) else 'studying',
+            'App Switch Count': app_switch_count if app_switch_count is not None else 0,
+            'Distraction Duration (mins)': distraction_duration if distraction_duration is not None else 0,
+            'Total Focus Duration (mins)': total_focus_duration,
+            'Focus Score (0-10)': focus_score,
+            'Productivity %': productivity_percentage,
+        })
+    df = pd.DataFrame(data)
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['Hour'] = pd.to_datetime(df['Start Time'], format='%H:%M:%S').dt.hour
+    df['Session Duration (mins)'] = df['Total Focus Duration (mins)'] + df['Distraction Duration (mins)']
+    df['Session Length'] = df['Session Duration (mins)'].apply(lambda x: min(90, max(15, 15 * round(x/15))))
+    last_date = df['Date'].max()
+    df['Days Ago'] = (last_date - df['Date']).dt.days
+    df['Weight'] = df['Days Ago'].apply(assign_weight)
+    df['Weighted Focus Score'] = df['Focus Score (0-10)'] * df['Weight']
+    df['Weighted Productivity'] = df['Productivity %'] * df['Weight']
+    day_encoder = LabelEncoder()
+    task_encoder = LabelEncoder()
+    df['Day_encoded'] = day_encoder.fit_transform(df['Day'])
+    df['Task_Type_encoded'] = task_encoder.fit_transform(df['Task Type'])
+    df['combined_score'] = df['Focus Score (0-10)'] * df['Productivity %'] / 10
+    df['Productivity_Label'] = df['Productivity %'].apply(lambda x: 'High' if x >= 75 else ('Mid' if x >= 50 else 'Low'))
+    return df, day_encoder
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sessions = make_sessions(count)
+    encoders = load_encoders()
+
+    (old, _), old_seconds = timed(legacy_prepare, sessions)
+    (new, _), new_seconds = timed(prepare_sessions, sessions, encoders)
+
+    # Same features, apart from the encodings, which are now fixed
+    for column in ['Hour', 'Session Length', 'Days Ago', 'Weight', 'Weighted Focus Score',
+                   'Weighted Productivity', 'combined_score', 'Productivity_Label']:
+        assert np.array_equal(old[column].to_numpy(), new[column].to_numpy()), column
+
+    print(f"{count:,} sessions")
+    print(f"  row by row + apply   {old_seconds:7.2f} s  {count / old_seconds:12,.0f} rows/s")
+    print(f"  vectorised           {new_seconds:7.2f} s  {count / new_seconds:12,.0f} rows/s")
+    print(f"  speedup              {old_seconds / new_seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
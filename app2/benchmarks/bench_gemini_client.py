@@ -0,0 +1,215 @@
+"""Check the Suggestions chat against a local stub of the Gemini streaming API.
+
+The stub streams each reply as server-sent events, CHUNKS chunks
+CHUNK_DELAY seconds apart after FIRST_BYTE_DELAY, and counts the TCP
+connections it accepts. "blocking" is the old path: one requests.post per
+message on the Qt thread, with a new connection each time and the window
+frozen until the whole reply is in. "streamed" sends the same messages
+through SuggestionsUI. A 10 ms QTimer measures how long the Qt thread stalls.
+The script also checks retries after 503s, cancelling a reply by sending a
+new message, and the fallback to a local reply when the read times out.
+
+Run from the app2 directory:
+    python benchmarks/bench_gemini_client.py
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+MESSAGES = 5
+CHUNKS = 8
+FIRST_BYTE_DELAY = 0.3
+CHUNK_DELAY = 0.05
+
+
+class StubGemini(BaseHTTPRequestHandler):
+    """Answers every POST with a streamed reply, after server.failures 503s."""
+
+    protocol_version = "HTTP/1.1"  # Keep connections open, as the real API does
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests += 1
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            body = b'{"error": "overloaded"}'
+            self.send_response(503)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        time.sleep(self.server.first_byte_delay)
+        try:
+            for i in range(CHUNKS):
+                event = {"candidates": [{"content": {"parts": [{"text": f"word{i} "}]}}]}
+                self.write_chunk(f"data: {json.dumps(event)}\r\n\r\n".encode())
+                time.sleep(CHUNK_DELAY)
+            self.write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client cancelled
+
+    def write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGemini)
+    server.daemon_threads = True
+    server.connections = server.requests = server.failures = 0
+    server.first_byte_delay = FIRST_BYTE_DELAY
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class StallMeter:
+    """Longest gap between ticks of a 10 ms QTimer, i.e. the worst UI freeze."""
+
+    def __init__(self):
+        from PyQt5.QtCore import QTimer
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.last = None
+        self.worst = 0.0
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.worst = 0.0
+        self.timer.start(10)
+
+    def tick(self):
+        now = time.perf_counter()
+        self.worst = max(self.worst, now - self.last)
+        self.last = now
+
+    def stop(self):
+        self.tick()
+        self.timer.stop()
+        return self.worst * 1000
+
+
+def wait_until(app, condition, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    return condition()
+
+
+def main():
+    server = start_stub()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ["GEMINI_API_KEY"] = "stub"
+    os.environ["GEMINI_BASE_URL"] = base_url
+
+    import requests
+    from PyQt5.QtWidgets import QApplication
+    from database import Database
+    from suggestions_ui import SuggestionsUI
+
+    app = QApplication(sys.argv[:1])
+    meter = StallMeter()
+
+    # Old path: blocking post per message, new connection each time
+    server.connections = 0
+    meter.start()
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        requests.post(f"{base_url}/models/gemini-1.5-flash:generateContent",
+                      headers={"Content-Type": "application/json"}, data=json.dumps({"contents": []}))
+        app.processEvents()
+    blocking_ms = (time.perf_counter() - start) * 1000 / MESSAGES
+    blocking_stall = meter.stop()
+    blocking_connections = server.connections
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        db.register_user("bench", "bench")
+        server.connections = 0
+        widget = SuggestionsUI(db, 1)  # Streams the welcome message
+        assert wait_until(app, lambda: widget.pending_reply is None)
+
+        first_chunk, total = [], []
+        meter.start()
+        for i in range(MESSAGES):
+            start = time.perf_counter()
+            widget.message_input.setText(f"question {i}")
+            widget.send_message()
+            message = widget.pending_reply.message
+            wait_until(app, lambda: message.text != "…")
+            first_chunk.append((time.perf_counter() - start) * 1000)
+            wait_until(app, lambda: widget.pending_reply is None)
+            total.append((time.perf_counter() - start) * 1000)
+        streamed_stall = meter.stop()
+        streamed_connections = server.connections
+
+        print(f"{MESSAGES} messages, reply = {FIRST_BYTE_DELAY * 1000:.0f} ms to first chunk "
+              f"+ {CHUNKS} chunks every {CHUNK_DELAY * 1000:.0f} ms")
+        print(f"{'path':<10} {'first text':>11} {'full reply':>11} {'worst UI stall':>15} {'connections':>12}")
+        print(f"{'blocking':<10} {blocking_ms:8.0f} ms {blocking_ms:8.0f} ms {blocking_stall:12.0f} ms "
+              f"{blocking_connections:12}")
+        print(f"{'streamed':<10} {sum(first_chunk) / MESSAGES:8.0f} ms {sum(total) / MESSAGES:8.0f} ms "
+              f"{streamed_stall:12.0f} ms {streamed_connections:12} (incl. welcome)")
+
+        # Two 503s, then success on the third attempt
+        server.failures, server.requests = 2, 0
+        history = len(widget.gemini_conversation_history)
+        widget.message_input.setText("retry me")
+        widget.send_message()
+        wait_until(app, lambda: widget.pending_reply is None)
+        assert len(widget.gemini_conversation_history) == history + 1
+        print(f"retries:   reply arrived after {server.requests} requests")
+
+        # A new message cancels the one still streaming
+        widget.message_input.setText("first")
+        widget.send_message()
+        cancelled = widget.pending_reply.message
+        wait_until(app, lambda: cancelled.text != "…")
+        widget.message_input.setText("second")
+        widget.send_message()
+        wait_until(app, lambda: widget.pending_reply is None)
+        texts = [m.text for m in widget.chat_display.messages]
+        assert widget.gemini_conversation_history[-1]["user"] == "second"
+        assert all(e["user"] != "first" for e in widget.gemini_conversation_history)
+        print(f"cancel:    first reply stopped at {len(cancelled.text.split())}/{CHUNKS} words, "
+              f"second complete: {texts[-1].strip() == ' '.join(f'word{i}' for i in range(CHUNKS))}")
+
+        # A stalled API times out into the local reply without blocking the UI
+        server.first_byte_delay = 2.0
+        widget.gemini_client.timeout = (1.0, 0.5)
+        widget.gemini_client.max_retries = 0
+        meter.start()
+        start = time.perf_counter()
+        widget.message_input.setText("when should I focus?")
+        widget.send_message()
+        wait_until(app, lambda: widget.pending_reply is None)
+        print(f"timeout:   local reply after {(time.perf_counter() - start) * 1000:.0f} ms, "
+              f"worst UI stall {meter.stop():.0f} ms, from Focus AI: {not widget.chat_display.messages[-1].is_user}")
+
+    server.shutdown()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Import-time profile of the modules loaded before the login screen appears.
+
+Runs a fresh interpreter with ``python -X importtime`` and reports the
+slowest imports, then checks the total against IMPORT_BUDGET_MS and that
+none of the heavy libraries are pulled in before a tab that needs them is
+opened. Exits with status 1 if either check fails.
+
+app_tracker is left out: it needs pywin32, so it only imports on Windows.
+
+Run from the app2 directory:
+    python benchmarks/bench_imports.py [top_n]
+"""
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# What main.py imports before showing the login window
+STARTUP_MODULES = ["PyQt5.QtWidgets", "database", "login_ui", "todo_ui",
+                   "pomodoro_ui", "lazy_tab", "model_registry", "session_manager"]
+
+# Only imported once the Statistics or Suggestions tab is opened
+DEFERRED_MODULES = ["pandas", "sklearn", "matplotlib", "requests"]
+
+# Cold start budget for the imports above, sized for a modest laptop
+# (about twice what a current desktop needs)
+IMPORT_BUDGET_MS = 600
+
+
+def profile_imports(modules):
+    """Return (module, self_us, cumulative_us, depth) for every import made."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=APP_DIR, capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def main():
+    top_n = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    entries = profile_imports(STARTUP_MODULES)
+
+    # Top-level entries (depth 0 in the -X importtime tree) add up to the total
+    total_ms = sum(cumulative for _, _, cumulative, depth in entries if depth == 0) / 1000
+
+    print(f"{'module':<45} {'self':>9} {'cumulative':>11}")
+    for name, self_us, cumulative_us, depth in sorted(entries, key=lambda e: -e[2])[:top_n]:
+        print(f"{'  ' * depth + name:<45} {self_us / 1000:6.1f} ms {cumulative_us / 1000:8.1f} ms")
+
+    print(f"\nStartup imports: {len(entries)} modules, {total_ms:.1f} ms "
+          f"(budget {IMPORT_BUDGET_MS} ms)")
+
+    imported = {name.split(".")[0] for name, _, _, _ in entries}
+    eager = [name for name in DEFERRED_MODULES if name in imported]
+    if eager:
+        print(f"Imported before they are needed: {', '.join(eager)}")
+
+    if total_ms > IMPORT_BUDGET_MS or eager:
+        print("FAILED")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
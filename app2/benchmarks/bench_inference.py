@@ -0,0 +1,101 @@
+"""Compare the model-based recommendations with the old session-average heuristics.
+
+"heuristic" is the session-average path get_model_predictions takes when the
+models can't be loaded, read from the running aggregates; "batched" scores the full candidate
+grid with one call per model; "row by row" is the same grid scored one
+candidate at a time, for the throughput comparison.
+
+Run from the app2 directory (offline, or the Suggestions tab will call Gemini):
+    python benchmarks/bench_inference.py [repeats]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# A placeholder key keeps SuggestionsUI from opening its "no API key" dialog
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+import bench_stats_refresh
+from bench_gemini_client import wait_until
+from database import Database
+from recommendations import RecommendationEngine
+from suggestions_ui import SuggestionsUI
+
+ROW_BY_ROW_SAMPLE = 200
+
+
+def timed(function, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = QApplication(sys.argv[:1])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        db.register_user("bench", "bench")
+        bench_stats_refresh.SESSION_COUNT = 200
+        bench_stats_refresh.populate(db, 1)
+        widget = SuggestionsUI(db, 1)
+        # The tab starts fine-tuning the models on these sessions; let it finish before the database goes
+        wait_until(app, lambda: widget.personalizer.future is None, timeout=120)
+
+    aggregates = widget.aggregates
+    profile = widget.build_user_profile()
+    engine = RecommendationEngine()
+
+    def heuristic():
+        aggregates.best_day()
+        aggregates.best_hour()
+        aggregates.best_length()
+
+    # Same work as engine.score, one candidate per predict call
+    def row_by_row():
+        for i in range(ROW_BY_ROW_SAMPLE):
+            hour = engine.hours[engine.hour_index[i]]
+            length = engine.lengths[engine.length_index[i]]
+            switches = profile.app_switches_per_min * length
+            distraction = engine.distraction_model.predict(np.array([[
+                switches, engine.distraction_tasks[i], engine.distraction_days[i], hour, length]]))[0]
+            focus = length - distraction
+            engine.day_model.predict_proba(np.array([[
+                engine.day_index[i], switches, distraction, focus, profile.focus_score, profile.productivity]]))
+            engine.time_model.predict_proba(np.array([[
+                switches, hour, distraction, focus, profile.focus_score, profile.productivity]]))
+            engine.length_model.predict_proba(np.array([[
+                switches, distraction, profile.focus_score, profile.productivity, hour,
+                engine.length_tasks[i], engine.length_days[i]]]))
+
+    heuristic_ms = timed(heuristic, repeats)
+    batched_ms = timed(lambda: engine.recommend(profile), repeats)
+    row_ms = timed(row_by_row, 3) * len(engine) / ROW_BY_ROW_SAMPLE
+
+    print(f"Candidate grid: {len(engine)} rows {engine.shape} (day, hour, length, task type)")
+    print(f"{'path':<28} {'latency':>10} {'candidates/s':>14}")
+    print(f"{'heuristic (aggregates)':<28} {heuristic_ms:7.2f} ms {'-':>14}")
+    print(f"{'batched grid':<28} {batched_ms:7.2f} ms {len(engine) / batched_ms * 1000:14,.0f}")
+    print(f"{'row by row (extrapolated)':<28} {row_ms:7.0f} ms {len(engine) / row_ms * 1000:14,.0f}")
+
+    result = engine.recommend(profile)
+    print(f"\nModels recommend {result['best_day']} at {result['best_time']}, "
+          f"{result['best_length']} min sessions")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
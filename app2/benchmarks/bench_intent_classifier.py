@@ -0,0 +1,103 @@
+"""Accuracy and per-query latency of the chat intent classifier.
+
+legacy_classify is the old SuggestionsUI.classify_question_intent: keyword
+lists checked in order with substring tests, first match wins. Both
+classifiers run on two sets of labelled messages: intent_queries.json, the
+messages INTENT_KEYWORDS and its weights were tuned on, and
+intent_queries_heldout.json, written separately and never used for
+tuning, whose accuracy is the one to go by. Keep it that way: a keyword
+added for a held-out miss belongs in the tuning set too, with new held-out
+messages replacing it.
+
+Run from the app2 directory:
+    python benchmarks/bench_intent_classifier.py
+"""
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+
+from intent_classifier import IntentClassifier, classifier
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+QUERY_SETS = [("tuning", os.path.join(BENCH_DIR, "intent_queries.json")),
+              ("held out", os.path.join(BENCH_DIR, "intent_queries_heldout.json"))]
+REPEATS = 200
+
+
+def legacy_classify(user_text):
+    text = user_text.lower()
+    repetition_phrases = [
+        "same message", "same response", "same answer", "repetitive",
+        "again and again", "keeps repeating", "giving same", "keeps saying",
+        "keeps telling", "always say", "always tell", "redundant"
+    ]
+    for phrase in repetition_phrases:
+        if phrase in text:
+            return "complaint_repetition"
+    intent_keywords = {
+        "time_question": ["when", "time", "morning", "afternoon", "evening", "night", "day time", "hour", "o'clock"],
+        "day_question": ["day", "week", "monday", "tuesday", "wednesday", "thursday", "friday", "weekend", "weekday"],
+        "duration_question": ["how long", "minutes", "length", "duration", "session", "pomodoro", "timer"],
+        "distraction_question": ["distract", "focus", "concentrate", "attention", "app block", "notification", "alert"],
+        "app_usage_question": ["how to use", "features", "app", "function", "tracker", "how does", "work"],
+        "statistics_question": ["stats", "data", "progress", "improvement", "history", "tracking", "report"],
+        "task_question": ["task", "todo", "to-do", "list", "what should I", "what to do", "priority", "work on"],
+        "break_question": ["break", "rest", "pause", "interval", "stop", "between"],
+        "tech_question": ["problem", "error", "bug", "not working", "issue", "help", "fix", "broken"],
+        "personal_question": ["you", "your", "who are", "what are", "chatbot", "assistant"]
+    }
+    for intent, keywords in intent_keywords.items():
+        for keyword in keywords:
+            if keyword in text:
+                return intent
+    question_words = ["how", "what", "why", "where", "when", "who", "which", "can", "should", "could", "would"]
+    for word in question_words:
+        if text.startswith(word) or f" {word} " in text:
+            return "general_question"
+    return "general_statement"
+
+
+def accuracy(classify, queries):
+    correct = sum(classify(text) == label for text, label in queries)
+    return f"{correct}/{len(queries)} ({correct / len(queries):.0%})"
+
+
+def latency_us(classify, queries):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for text, _ in queries:
+            classify(text)
+    return (time.perf_counter() - start) / (REPEATS * len(queries)) * 1e6
+
+
+def main():
+    query_sets = []
+    for name, path in QUERY_SETS:
+        with open(path) as f:
+            query_sets.append((name, [tuple(query) for query in json.load(f)]))
+    every_query = [query for _, queries in query_sets for query in queries]
+
+    start = time.perf_counter()
+    IntentClassifier()
+    print(", ".join(f"{len(queries)} {name}" for name, queries in query_sets)
+          + f" labelled messages; building the classifier takes {(time.perf_counter() - start) * 1000:.1f} ms")
+    classifiers = [("keyword loops (legacy)", legacy_classify), ("one-pass matcher", classifier.classify)]
+    for label, classify in classifiers:
+        scores = "   ".join(f"{name} {accuracy(classify, queries)}" for name, queries in query_sets)
+        print(f"{label:<22} {scores}   {latency_us(classify, every_query):5.1f} us per query")
+
+    print("\nmisclassified held-out messages per true intent (legacy -> matcher)")
+    held_out = query_sets[-1][1]
+    misses = [Counter(label for text, label in held_out if classify(text) != label) for _, classify in classifiers]
+    for label in sorted(set(misses[0]) | set(misses[1])):
+        print(f"  {label:<22} {misses[0][label]:3} -> {misses[1][label]}")
+
+
+if __name__ == "__main__":
+    main()
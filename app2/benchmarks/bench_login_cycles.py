@@ -0,0 +1,101 @@
+"""Measure repeated login/logout cycles with the shared model registry.
+
+Each cycle builds the Suggestions tab the way a login followed by opening
+the tab does, then tears it down again as logout does. "per-login unpickle"
+is what every cycle used to cost on top of that: SuggestionsUI.load_models
+read and unpickled the three models again for every new widget. The user
+already has fine-tuned models saved, which every login loads.
+
+Run from the app2 directory (offline, or the Suggestions tab will call Gemini):
+    python benchmarks/bench_login_cycles.py [cycles]
+"""
+import os
+import pickle
+import statistics
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# A placeholder key keeps SuggestionsUI from opening its "no API key" dialog
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+import psutil
+from PyQt5.QtWidgets import QApplication
+
+import bench_stats_refresh
+from database import Database
+from model_registry import models, PREDICTORS
+
+LEGACY_FILES = ["finalised/Best_Time.pkl", "finalised/Best_Length.pkl", "finalised/Best_Day.pkl"]
+
+
+def unpickle_models():
+    """What SuggestionsUI.load_models did on every construction."""
+    loaded = []
+    for path in LEGACY_FILES:
+        with open(path, "rb") as f:
+            loaded.append(pickle.load(f))
+    return loaded
+
+
+def rss_mb():
+    return psutil.Process().memory_info().rss / 2 ** 20
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = QApplication(sys.argv[:1])
+
+    # Background load as started at login, timed until every model is ready
+    start = time.perf_counter()
+    models.load_in_background()
+    models.loader.join()
+    first_load = (time.perf_counter() - start) * 1000
+    if not all(models.is_loaded(name) for name in PREDICTORS):
+        print("Models failed to load:", models.errors)
+        sys.exit(1)
+
+    from personalization import personalize
+    from suggestions_ui import SuggestionsUI
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        db.register_user("bench", "bench")
+        bench_stats_refresh.SESSION_COUNT = 200
+        bench_stats_refresh.populate(db, 1)
+        personalize(db.db_name, 1)
+
+        unpickle = []
+        for _ in range(cycles):
+            start = time.perf_counter()
+            unpickle_models()
+            unpickle.append((time.perf_counter() - start) * 1000)
+
+        build = []
+        rss_before = rss_mb()
+        for _ in range(cycles):
+            start = time.perf_counter()
+            widget = SuggestionsUI(db, 1)
+            widget.show()
+            app.processEvents()
+            build.append((time.perf_counter() - start) * 1000)
+
+            # Logout
+            widget.deleteLater()
+            app.processEvents()
+        rss_growth = rss_mb() - rss_before
+
+    print(f"First background load of {len(PREDICTORS)} models: {first_load:8.1f} ms (once per process)")
+    print(f"{cycles} login/logout cycles (median per cycle)")
+    print(f"  per-login unpickle, before        {statistics.median(unpickle):8.1f} ms")
+    print(f"  Suggestions tab build, registry   {statistics.median(build):8.1f} ms")
+    print(f"  RSS growth over the cycles        {rss_growth:8.1f} MB")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Accuracy of per-user fine-tuned models, and what fitting them costs the UI.
+
+A synthetic user works best late in the evening and at weekends and keeps
+to hour-long sessions, unlike the students the shipped models learned from.
+The models are fitted on the first 75% of their sessions and scored on the
+rest: the day and time models on whether a session is in the user's top
+tercile ('High'), the length model on the session length.
+
+The second part times a Personalizer refresh in an open Suggestions tab
+against running personalize() on the Qt thread, as a tick every
+TICK_MS would see it: the longest gap between ticks is the longest the UI
+stood still.
+
+Run from the app2 directory:
+    python benchmarks/bench_personalization.py
+"""
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from bench_gemini_client import start_stub, wait_until
+
+SESSION_COUNTS = [80, 160, 400]
+SESSION_COUNT = 160  # In the Suggestions tab
+TRAIN_SHARE = 0.75
+TICK_MS = 5
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def populate(db, user_id, count):
+    """Insert count sessions of the evening, weekend, hour-long user."""
+    rng = random.Random(11)
+    rows = []
+    for i in range(count):
+        day = i // 2  # Two sessions a day from 2024-01-01, a Monday
+        weekday = day % 7
+        hour = rng.randint(7, 23)
+        quality = 1 - abs(hour - 21) / 14 + (0.3 if weekday >= 5 else 0) + rng.gauss(0, 0.15)
+        length = 60 if quality > 0.6 else rng.choice([30, 45])
+        distraction = max(0.0, length * (0.45 - 0.35 * quality) + rng.gauss(0, 2))
+        focus = max(1.0, length - distraction)
+        rows.append((
+            user_id, f"2024-{day // 28 + 1:02d}-{day % 28 + 1:02d}", DAY_NAMES[weekday],
+            f"{hour:02d}:{rng.randint(0, 59):02d}:00", "23:59:00", "Coding",
+            max(0, int(round(12 - 10 * quality + rng.gauss(0, 1)))), distraction, focus,
+            min(10, max(1, int(round(3 + 6 * quality + rng.gauss(0, 0.7))))),
+            focus / (focus + distraction) * 100, 5
+        ))
+    db.connect()
+    db.cursor.executemany(
+        """INSERT INTO focus_sessions
+           (user_id, date, day, start_time, end_time, task_type, app_switch_count,
+            distraction_duration, total_focus_duration, focus_score,
+            productivity_percentage, break_duration)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows
+    )
+    db.conn.commit()
+    db.close()
+
+
+def accuracy(tmp, count):
+    from database import Database
+    from features import add_features, load_encoders, sessions_frame
+    from model_registry import models, PREDICTORS
+    from personalization import personalize, user_focus_labels
+
+    db = Database(os.path.join(tmp, f"accuracy{count}.db"))
+    db.register_user("bench", "bench")
+    populate(db, 1, count)
+    sessions = db.get_completed_sessions_after(1, 0)
+    split = int(len(sessions) * TRAIN_SHARE)
+
+    # Labels from the whole history, so train and test agree on what 'High' means
+    df = add_features(sessions_frame(sessions), load_encoders(models))
+    df['Focus Level'] = user_focus_labels(df)
+    test = df.iloc[split:]
+
+    # Fit on the first sessions only
+    db.connect()
+    db.cursor.execute("DELETE FROM focus_sessions WHERE session_id > ?", (sessions[split - 1][0],))
+    db.conn.commit()
+    db.close()
+    start = time.perf_counter()
+    results = personalize(db.db_name, 1)
+    seconds = time.perf_counter() - start
+    personal = {name: PREDICTORS[name].from_artifact(pickle.loads(data), "personal")
+                for name, _, _, data in results}
+
+    print(f"{count} sessions, fitted on {split} in {seconds:.2f} s, scored on {len(test)}")
+    for name, label in [("best_day", "Focus Level"), ("best_time", "Focus Level"),
+                        ("best_length", "Session Length")]:
+        scores = []
+        for predictor in (models.get(name), personal[name]):
+            if name == "best_length":
+                X = test.assign(**{'Task Type': predictor.encode_task_types(test['Task Type']),
+                                   'Day': predictor.encode_days(test['Day'])})
+            else:
+                X = test.fillna(0)
+            predicted = predictor.predict(X[predictor.FEATURES].to_numpy())
+            scores.append((predicted == test[label].to_numpy()).mean())
+        print(f"  {name:12} shipped {scores[0]:6.1%}   personal {scores[1]:6.1%}")
+
+
+def stall(app, tick, work):
+    """Run work while a QTimer ticks; returns (seconds until done, longest gap between ticks in ms)."""
+    from PyQt5.QtCore import QTimer
+    ticks = []
+    timer = QTimer()
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+    timer.start(tick)
+    start = time.perf_counter()
+    ticks.append(start)
+    done = work()
+    wait_until(app, done, timeout=120)
+    elapsed = time.perf_counter() - start
+    timer.stop()
+    ticks.append(time.perf_counter())
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    return elapsed, max(gaps) * 1000
+
+
+def ui(tmp):
+    from PyQt5.QtWidgets import QApplication
+    from database import Database
+    from personalization import personalize
+    from suggestions_ui import SuggestionsUI
+
+    server = start_stub()
+    os.environ["GEMINI_API_KEY"] = "stub"
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    app = QApplication(sys.argv[:1])
+    db = Database(os.path.join(tmp, "ui.db"))
+    db.register_user("bench", "bench")
+    populate(db, 1, SESSION_COUNT)
+    print(f"Suggestions tab, {SESSION_COUNT} sessions, ticking every {TICK_MS} ms")
+    widget = None
+
+    def first():
+        nonlocal widget
+        widget = SuggestionsUI(db, 1)
+        widget.show()
+        return lambda: widget.personal_models is not None
+
+    elapsed, _ = stall(app, TICK_MS, first)
+    print(f"  first fit, spawning the worker: ready {elapsed:5.2f} s after opening the tab")
+    wait_until(app, lambda: widget.pending_reply is None)
+
+    def inline():
+        personalize(db.db_name, 1)
+        return lambda: True
+
+    def background():
+        widget.personal_models = None
+        widget.personalizer.last_session_id = 0  # Fit again though nothing changed
+        widget.personalizer.refresh()
+        return lambda: widget.personal_models is not None
+
+    for label, work in [("on the Qt thread", inline), ("Personalizer", background)]:
+        elapsed, longest = stall(app, TICK_MS, work)
+        print(f"  {label:17} done in {elapsed:5.2f} s, UI stalled at most {longest:7.1f} ms")
+
+    print(f"  swapped in version {widget.personal_models.get('best_day').version}")
+    app.quit()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in SESSION_COUNTS:
+            accuracy(tmp, count)
+        ui(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Request size per chat message, before and after PromptBuilder.
+
+legacy_contents is how generate_response used to assemble a request: the
+whole system prompt rebuilt with the free-text app context and sent as the
+first message, then the last 5 exchanges verbatim. Both are fed the same
+conversation of TURNS questions with replies of typical Gemini length. The
+script reports the JSON body size and the estimated tokens of each request.
+
+Run from the app2 directory:
+    python benchmarks/bench_prompt_builder.py
+"""
+import json
+import os
+import random
+import sys
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+
+from gemini_client import GENERATION_CONFIG
+from prompt_builder import PromptBuilder, estimate_tokens, TOKEN_BUDGET
+
+TURNS = 30
+
+FACTS = [
+    "analysis based on your focus sessions, recent ones counting most",
+    "optimal focus time: 10:00 AM",
+    "optimal session length: 45 minutes",
+    "most productive day: Wednesday",
+    "recent average focus score: 6.8/10",
+    "recent productivity: 72%",
+    "focus has been slightly improving",
+    "You tend to be most focused around 10:00",
+    "For 45-minute sessions, taking 8-minute breaks works best for you",
+    "You're most effective at coding tasks (81% success rate)",
+]
+
+QUESTIONS = [
+    "When should I schedule deep work this week?",
+    "How long should my Pomodoro sessions be?",
+    "I keep getting distracted by chat apps, any tips?",
+    "Why was my focus score low yesterday afternoon?",
+    "Should I take longer breaks?",
+]
+
+SENTENCES = [
+    "Based on your recent sessions, your focus peaks in the late morning.",
+    "Try blocking notifications for the first twenty minutes of each session.",
+    "Your productivity drops after about fifty minutes, so a short break helps.",
+    "Scheduling coding tasks on Wednesday mornings matches your strongest pattern.",
+    "A five minute walk between sessions can restore attention noticeably.",
+    "Consider batching messages into two fixed slots per day.",
+    "Your break lengths have been consistent, which is a good habit to keep.",
+]
+
+
+def legacy_contents(history, facts, user_text):
+    app_context = "Focus Enhancement App Context:\n"
+    app_context += "".join(f"- {fact}\n" for fact in facts)
+    system_prompt = f"""You are a helpful, friendly AI assistant named Focus AI integrated into a Focus Enhancement app.
+
+Your primary purpose is to help users improve their focus, productivity, and work habits based on their session data.
+
+{app_context}
+
+The Focus Enhancement app includes:
+        1. Pomodoro Timer with customizable session lengths and break durations
+        2. App tracking that monitors productive vs distracting applications
+        3. Focus sessions that record productivity metrics
+        4. Statistics dashboard showing focus patterns
+        5. Todo list for task management
+
+Use a conversational, helpful tone. Be concise but informative. Always maintain context from previous messages.
+Respond to the user's specific query while considering their focus patterns and app usage."""
+    contents = [
+        {"role": "user", "parts": [{"text": f"You are the Focus AI assistant. Follow these instructions for all your responses: {system_prompt}"}]},
+        {"role": "model", "parts": [{"text": "I understand. I'm Focus AI, your productivity and focus assistant. I'll help you improve your work habits based on your session data and app usage patterns."}]},
+    ]
+    for exchange in history[-5:]:
+        contents.append({"role": "user", "parts": [{"text": exchange['user']}]})
+        contents.append({"role": "model", "parts": [{"text": exchange['assistant']}]})
+    contents.append({"role": "user", "parts": [{"text": user_text}]})
+    return contents
+
+
+def request_size(contents):
+    body = json.dumps({"contents": contents, "generationConfig": GENERATION_CONFIG})
+    tokens = sum(estimate_tokens(part["text"]) for content in contents for part in content["parts"])
+    return len(body.encode()), tokens
+
+
+def main():
+    rng = random.Random(3)
+    builder = PromptBuilder()
+    history = []
+    rows, build_times = [], []
+    for turn in range(1, TURNS + 1):
+        question = rng.choice(QUESTIONS)
+        old = request_size(legacy_contents(history, FACTS, question))
+        start = time.perf_counter()
+        contents = builder.build(history, FACTS, question)
+        build_times.append((time.perf_counter() - start) * 1000)
+        new = request_size(contents)
+        rows.append((turn, old, new))
+        reply = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(8, 20)))
+        history.append({"user": question, "assistant": reply})
+
+    print(f"token budget {TOKEN_BUDGET}, replies of 8-20 sentences")
+    print(f"{'turn':>4} {'before bytes':>13} {'tokens':>7} {'after bytes':>12} {'tokens':>7}")
+    for turn, (old_bytes, old_tokens), (new_bytes, new_tokens) in rows:
+        if turn in (1, 2, 4, 6, 10, 20, 30):
+            print(f"{turn:4} {old_bytes:13,} {old_tokens:7,} {new_bytes:12,} {new_tokens:7,}")
+    old_total = sum(old[0] for _, old, _ in rows)
+    new_total = sum(new[0] for _, _, new in rows)
+    print(f"total over {TURNS} turns: {old_total:,} -> {new_total:,} bytes "
+          f"({1 - new_total / old_total:.0%} less), max tokens "
+          f"{max(old[1] for _, old, _ in rows):,} -> {max(new[1] for _, _, new in rows):,}")
+    print(f"build time: median {sorted(build_times)[len(build_times) // 2]:.2f} ms, "
+          f"max {max(build_times):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
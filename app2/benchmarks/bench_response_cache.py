@@ -0,0 +1,92 @@
+"""Measure the Gemini response cache on repeated Suggestions refreshes.
+
+Uses the stub API from bench_gemini_client. The user refreshes the
+Suggestions tab REFRESHES times, finishes a session, and refreshes again.
+The script counts the requests that reach the API and times each refresh
+until the welcome message is shown. It then checks expiry and
+least-recently-used eviction directly on ResponseCache.
+
+Run from the app2 directory:
+    python benchmarks/bench_response_cache.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import bench_aggregates
+import bench_stats_refresh
+from bench_gemini_client import start_stub, wait_until
+
+REFRESHES = 10
+
+
+def refresh(app, widget):
+    start = time.perf_counter()
+    widget.refresh_suggestions()
+    wait_until(app, lambda: widget.pending_reply is None)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    server = start_stub()
+    os.environ["GEMINI_API_KEY"] = "stub"
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    from PyQt5.QtWidgets import QApplication
+    from database import Database
+    from response_cache import ResponseCache
+    from suggestions_ui import SuggestionsUI
+
+    app = QApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        db.register_user("bench", "bench")
+        bench_stats_refresh.SESSION_COUNT = 30
+        bench_stats_refresh.populate(db, 1)
+
+        widget = SuggestionsUI(db, 1)  # First refresh: a miss
+        wait_until(app, lambda: not widget.welcome_pending and widget.pending_reply is None, timeout=60)
+        server.requests = 0
+        times = [refresh(app, widget) for _ in range(REFRESHES)]
+        cached_requests = server.requests
+
+        bench_aggregates.add_session(db, 1, 0)
+        widget.check_for_new_sessions()
+        after_session_ms = refresh(app, widget)
+        after_session_requests = server.requests - cached_requests
+        again_ms = refresh(app, widget)
+
+        cache = widget.response_cache
+        print(f"{REFRESHES} refreshes with no new sessions: {cached_requests} API requests "
+              f"(were {REFRESHES}), median {statistics.median(times):.1f} ms to the welcome message")
+        print(f"after a new session: {after_session_requests} API request, {after_session_ms:.0f} ms; "
+              f"next refresh {again_ms:.1f} ms")
+        print(f"hit rate {cache.hits}/{cache.hits + cache.misses} ({cache.hit_rate:.0%})")
+
+        # Least recently used replies go first once max_entries is reached
+        small = ResponseCache(db, 2, max_entries=3)
+        for i in range(3):
+            small.put(f"key{i}", f"reply {i}")
+        time.sleep(1.1)  # CURRENT_TIMESTAMP has one second resolution
+        small.get("key0")
+        small.put("key3", "reply 3")
+        kept = [key for key in ["key0", "key1", "key2", "key3"]
+                if db.get_cached_response(2, key, small.ttl_seconds) is not None]
+        assert kept == ["key0", "key2", "key3"], kept
+        expired = ResponseCache(db, 2, ttl_seconds=0)
+        assert expired.get("key3") is None
+        print(f"eviction: kept {kept} of 4 with max_entries=3 after using key0; ttl 0 -> miss")
+
+    server.shutdown()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
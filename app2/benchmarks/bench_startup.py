@@ -0,0 +1,130 @@
+"""Measure how long it takes after login until the Pomodoro tab is usable.
+
+Each measurement runs in a fresh interpreter, so module imports are cold.
+"eager" builds every tab up front, as on_login_successful used to;
+"lazy" builds Stats and Suggestions behind LazyTab placeholders and then
+also times opening each of those tabs for the first time.
+
+Run from the app2 directory (offline, or the Suggestions tab will call Gemini):
+    python benchmarks/bench_startup.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+START = time.perf_counter()
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# A placeholder key keeps SuggestionsUI from opening its "no API key" dialog
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+
+class ProcessListTracker:
+    """Stands in for AppTracker, whose window enumeration is Windows-only."""
+
+    def get_running_apps(self):
+        import psutil
+        return sorted({proc.info['name'] for proc in psutil.process_iter(['name']) if proc.info['name']})
+
+
+def elapsed():
+    return (time.perf_counter() - START) * 1000
+
+
+def wait_until(app, condition, timeout=30.0):
+    """Process events until condition() is true."""
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        app.processEvents()
+
+
+def child(mode, db_path):
+    """Log in as user 1 the way MainWindow does and print the timings as JSON."""
+    from PyQt5.QtWidgets import QApplication, QWidget, QHBoxLayout, QTabWidget
+
+    from database import Database
+    from todo_ui import TodoWidget
+    from pomodoro_ui import PomodoroWidget
+    from lazy_tab import LazyTab
+    from model_registry import models
+
+    app = QApplication(sys.argv[:1])
+    timings = {"imports": elapsed()}
+
+    db = Database(db_path)
+    window = QWidget()
+    layout = QHBoxLayout(window)
+    layout.addWidget(TodoWidget(db, 1), 1)
+    tabs = QTabWidget()
+    tabs.addTab(PomodoroWidget(db, 1, ProcessListTracker()), "Pomodoro Timer")
+
+    def create_stats():
+        from stats_ui import StatsWidget
+        return StatsWidget(db, 1)
+
+    def create_suggestions():
+        from suggestions_ui import SuggestionsUI
+        return SuggestionsUI(db, 1)
+
+    lazy_tabs = []
+    if mode == "eager":
+        tabs.addTab(create_stats(), "Statistics")
+        tabs.addTab(create_suggestions(), "Suggestions")
+    else:
+        lazy_tabs = [("stats_first_open", LazyTab(create_stats)),
+                     ("suggestions_first_open", LazyTab(create_suggestions))]
+        tabs.addTab(lazy_tabs[0][1], "Statistics")
+        tabs.addTab(lazy_tabs[1][1], "Suggestions")
+
+    layout.addWidget(tabs, 2)
+    window.resize(1000, 700)
+    window.show()
+    app.processEvents()
+    timings["pomodoro_interactive"] = elapsed()
+    models.load_in_background()
+
+    for name, tab in lazy_tabs:
+        start = time.perf_counter()
+        tabs.setCurrentWidget(tab)
+        wait_until(app, lambda: tab.content is not None)
+        app.processEvents()
+        timings[name] = (time.perf_counter() - start) * 1000
+    print(json.dumps(timings))
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    import bench_stats_refresh
+    from database import Database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        db = Database(db_path)
+        db.register_user("bench", "bench")
+        bench_stats_refresh.populate(db, 1)
+
+        for mode in ["eager", "lazy"]:
+            results = []
+            for _ in range(runs):
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", mode, db_path],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                results.append(json.loads(output.strip().splitlines()[-1]))
+            print(f"{mode} (median of {runs} cold starts)")
+            for key in results[0]:
+                print(f"  {key:<28} {statistics.median(r[key] for r in results):8.1f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,125 @@
+"""Count the database queries made by the Statistics tab.
+
+The widget is shown, so the history table paints its rows, and scrolled
+through; every read of focus_sessions counts, page reads included.
+
+Run from the app2 directory:
+    python benchmarks/bench_stats_refresh.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from database import Database
+from stats_ui import StatsWidget
+
+SESSION_COUNT = 5000
+
+
+class CountingDatabase(Database):
+    """Database that counts the statements it runs against focus_sessions."""
+
+    def __init__(self, db_name):
+        self.queries = 0
+        super().__init__(db_name)
+
+    def connect(self):
+        conn, cursor = super().connect()
+        conn.set_trace_callback(self.trace)
+        return conn, cursor
+
+    def trace(self, statement):
+        if statement.lstrip().upper().startswith("SELECT") and "focus_sessions" in statement:
+            self.queries += 1
+
+
+def populate(db, user_id):
+    """Insert SESSION_COUNT finished sessions for the user."""
+    rng = random.Random(7)
+    rows = []
+    for i in range(SESSION_COUNT):
+        focus = rng.uniform(5, 50)
+        distraction = rng.uniform(0, 15)
+        rows.append((
+            user_id, f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}", "Monday",
+            f"{rng.randint(6, 22):02d}:{rng.randint(0, 59):02d}:00", "23:00:00", "Coding",
+            rng.randint(0, 20), distraction, focus, rng.randint(1, 10),
+            focus / (focus + distraction) * 100, 5
+        ))
+    db.connect()
+    db.cursor.executemany(
+        """INSERT INTO focus_sessions
+           (user_id, date, day, start_time, end_time, task_type, app_switch_count,
+            distraction_duration, total_focus_duration, focus_score,
+            productivity_percentage, break_duration)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows
+    )
+    db.conn.commit()
+    db.close()
+
+
+def report(label, db, action):
+    """Run an action and print how many session queries it made."""
+    before = db.queries
+    start = time.perf_counter()
+    action()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<45} {db.queries - before:3d} queries   {elapsed:8.1f} ms")
+
+
+def main():
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = CountingDatabase(os.path.join(tmp, "bench.db"))
+        db.register_user("bench", "bench")
+        populate(db, 1)
+
+        widget = None
+
+        def build():
+            nonlocal widget
+            widget = StatsWidget(db, 1)
+
+        report("Build StatsWidget (table + chart)", db, build)
+
+        def show():
+            widget.resize(1000, 800)
+            widget.show()
+            app.processEvents()
+
+        def scroll():
+            table = widget.session_table
+            for value in range(0, table.verticalScrollBar().maximum() + 1, table.height()):
+                table.verticalScrollBar().setValue(value)
+                table.viewport().repaint()
+
+        report("Show the tab (table painted)", db, show)
+        report("Scroll the table top to bottom", db, scroll)
+        report("Refresh Data (no new sessions)", db, widget.load_data)
+        for index in range(widget.chart_type_combo.count()):
+            report(f"Chart: {widget.chart_type_combo.itemText(index)}", db,
+                   lambda: widget.chart_type_combo.setCurrentIndex(index))
+        widget.chart_type_combo.setCurrentIndex(0)
+        for index in range(widget.time_period_combo.count()):
+            report(f"Period: {widget.time_period_combo.itemText(index)}", db,
+                   lambda: widget.time_period_combo.setCurrentIndex(index))
+
+        success, message, session_id = db.start_focus_session(1, None, "Coding")
+        db.end_focus_session(session_id, 2, 1.5, 24.0, 8)
+        report("session_ended -> refresh", db, lambda: widget.on_session_ended(session_id))
+        report("Refresh Data after that", db, widget.load_data)
+        report("Scroll the table again", db, scroll)
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Count the database work the Suggestions tab does while the app sits idle.
+
+"polling" is the old refresh_timer: check_for_new_sessions every 60 seconds,
+each reading the sessions recorded since the last check. "events" is the tab
+as it is now, checking only when a session ends, when it is shown, or when
+Database.sessions_version has moved. The script simulates IDLE_MINUTES of an
+open app during which SESSIONS sessions end, and counts the connections
+opened by each. The user has enough sessions for fine-tuned models, so the
+Personalizer's checks are counted too; the fits it starts run in its worker
+process on their own connections and are let finish between sessions,
+outside the timings.
+
+Run from the app2 directory:
+    python benchmarks/bench_suggestion_refresh.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import bench_aggregates
+import bench_stats_refresh
+from bench_gemini_client import start_stub, wait_until
+
+IDLE_MINUTES = 8 * 60
+SESSIONS = 6
+
+
+def finish_fits(app, widget):
+    """Wait for the Personalizer's fit, if one is running; returns the seconds waited."""
+    start = time.perf_counter()
+    wait_until(app, lambda: widget.personalizer.future is None, timeout=120)
+    return time.perf_counter() - start
+
+
+def simulate(app, db, widget, on_minute, on_session):
+    """Run IDLE_MINUTES with SESSIONS sessions ending evenly; return (connections, ms)."""
+    ended = [IDLE_MINUTES * (i + 1) // (SESSIONS + 1) for i in range(SESSIONS)]
+    db.connections = 0
+    waited = 0
+    start = time.perf_counter()
+    for minute in range(IDLE_MINUTES):
+        if minute in ended:
+            bench_aggregates.add_session(db, 1, minute)
+            on_session(widget)
+        on_minute(widget)
+        if minute in ended:
+            waited += finish_fits(app, widget)
+    return db.connections, (time.perf_counter() - start - waited) * 1000
+
+
+def main():
+    server = start_stub()
+    os.environ["GEMINI_API_KEY"] = "stub"
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    from PyQt5.QtWidgets import QApplication
+    from database import Database
+    from suggestions_ui import SuggestionsUI
+
+    class CountingDatabase(Database):
+        connections = 0
+
+        def connect(self):
+            self.connections += 1
+            return super().connect()
+
+    app = QApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory() as tmp:
+        db = CountingDatabase(os.path.join(tmp, "bench.db"))
+        db.register_user("bench", "bench")
+        bench_stats_refresh.SESSION_COUNT = 200
+        bench_stats_refresh.populate(db, 1)
+        widget = SuggestionsUI(db, 1)
+        fits = []
+        widget.personalizer.models_ready.connect(fits.append)
+        wait_until(app, lambda: not widget.welcome_pending and widget.pending_reply is None, timeout=60)
+        finish_fits(app, widget)
+        widget.add_message = lambda *args: None  # Keep the comparison to database work
+
+        def poll(widget):
+            # The old timer tick: no version check before reading
+            widget.seen_sessions_version = None
+            widget.check_for_new_sessions()
+
+        fits.clear()
+        polling, polling_ms = simulate(app, db, widget, poll, lambda widget: None)
+        polling_fits = len(fits)
+        fits.clear()
+        events, events_ms = simulate(app, db, widget, lambda widget: None,
+                                     lambda widget: widget.check_for_new_sessions())
+        events_fits = len(fits)
+        widget.seen_sessions_version = db.sessions_version
+        db.connections = 0
+        widget.hide()
+        widget.show()
+        app.processEvents()
+        shown = db.connections
+
+    hours = IDLE_MINUTES / 60
+    print(f"{hours:.0f} h open with {SESSIONS} sessions ending")
+    print(f"  polling every minute  {polling:5} connections  {polling_ms:7.1f} ms  {polling_fits} model fits")
+    print(f"  session events        {events:5} connections  {events_ms:7.1f} ms  {events_fits} model fits")
+    print(f"  showing the tab with no new sessions: {shown} connections")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark task search for a user with a large task history.
+
+Run from the app2 directory:
+    python benchmarks/bench_task_search.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from database import Database
+
+TASK_COUNT = 50000
+COMMON_WORDS = ["write", "report", "read", "chapter", "fix", "bug", "review", "notes",
+                "study", "exam", "prepare", "slides", "meeting", "design", "refactor",
+                "module", "email", "client", "budget", "plan", "lecture", "lab", "essay"]
+SYLLABLES = ["ka", "lo", "mi", "ter", "san", "vo", "pre", "dex", "ul", "rin", "sta", "gor"]
+
+
+def populate(db, user_id):
+    """Insert TASK_COUNT tasks for the user in a single transaction."""
+    rng = random.Random(42)
+    # A few thousand rarer words alongside the common ones, like real task text
+    vocabulary = ["".join(rng.choice(SYLLABLES) for _ in range(3)) for _ in range(5000)]
+    rows = []
+    for i in range(TASK_COUNT):
+        words = [rng.choice(COMMON_WORDS)] + [rng.choice(vocabulary) for _ in range(2)]
+        title = " ".join(words) + f" {i}"
+        description = " ".join(rng.choice(vocabulary) for _ in range(12))
+        status = "active" if i % 10 == 0 else "completed"
+        rows.append((user_id, title, description, status))
+
+    db.connect()
+    db.cursor.executemany(
+        "INSERT INTO tasks (user_id, title, description, status) VALUES (?, ?, ?, ?)", rows
+    )
+    db.conn.commit()
+    db.close()
+
+
+def measure(label, fn, repeat=50):
+    """Print the median and worst latency of fn in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"{label:<40} median {timings[len(timings) // 2]:7.2f} ms   "
+          f"max {timings[-1]:7.2f} ms   rows {len(result)}")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        db.register_user("bench", "bench")
+
+        start = time.perf_counter()
+        populate(db, 1)
+        print(f"Inserted {TASK_COUNT} tasks (with FTS triggers) in "
+              f"{time.perf_counter() - start:.2f} s\n")
+
+        measure("get_tasks (active)", lambda: db.get_tasks(1))
+        # Simulate typing "prepare kalo" one keystroke at a time
+        for query in ["p", "pr", "pre", "prep", "prepare", "prepare k", "prepare ka", "prepare kal"]:
+            measure(f"search_tasks({query!r}, active)", lambda: db.search_tasks(1, query))
+        measure("search_tasks('bug', completed)",
+                lambda: db.search_tasks(1, "bug", status="completed"))
+
+        db.fts_enabled = False
+        for query in ["p", "prepare kal"]:
+            measure(f"LIKE fallback ({query!r})", lambda: db.search_tasks(1, query))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Time the training pipeline and check its artifacts load in the app.
+
+Trains every model twice into temporary model directories, once in a single
+process (as the notebooks did, one after another) and once with a worker
+per CPU core, and compares the artifact checksums of the two runs. The
+parallel run's models.json is then loaded through a ModelRegistry, which
+verifies checksums, features and encoders, and each model is asked for a
+prediction.
+
+Run from the app2 directory:
+    python benchmarks/bench_training.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+
+import train
+from model_registry import ModelRegistry, PREDICTORS
+
+
+def run(jobs):
+    model_dir = tempfile.mkdtemp()
+    start = time.perf_counter()
+    metadata = train.train(model_dir=model_dir, jobs=jobs, version="bench")
+    return model_dir, metadata, time.perf_counter() - start
+
+
+def main():
+    jobs = os.cpu_count() or 1
+    serial_dir, serial, serial_s = run(1)
+    parallel_dir, parallel, parallel_s = run(jobs)
+
+    print(f"\n{'':12} {'1 process':>10} {f'{jobs} processes':>12}")
+    for stage in serial["timings"]:
+        print(f"{stage:12} {serial['timings'][stage]:8.2f} s {parallel['timings'][stage]:10.2f} s")
+    print(f"{'total':12} {serial_s:8.2f} s {parallel_s:10.2f} s")
+
+    same = [name for name in PREDICTORS
+            if serial["models"][name]["sha256"] == parallel["models"][name]["sha256"]]
+    print(f"identical artifacts across runs: {len(same)}/{len(PREDICTORS)}")
+
+    registry = ModelRegistry(parallel_dir, os.path.join(parallel_dir, "models.json"))
+    for name in PREDICTORS:
+        predictor = registry.get(name)
+        row = [[0] * len(predictor.FEATURES)]
+        print(f"  {name:12} v{predictor.version} {type(predictor.model).__name__:22} "
+              f"{parallel['models'][name]['metrics']} -> predict {predictor.predict(row)[0]}")
+
+
+if __name__ == "__main__":
+    main()
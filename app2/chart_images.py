@@ -0,0 +1,168 @@
+import atexit
+import queue
+import threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QPainter
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from stats_charts import ChartRenderer
+
+# Matplotlib's font and text caches are shared by every figure and are not
+# thread-safe, so the worker's renders and every draw of a live figure take
+# this lock. Reentrant, since a live draw may start inside another one.
+RENDER_LOCK = threading.RLock()
+
+
+class ChartImageCache(QObject):
+    """Renders Statistics charts to images on a background thread and keeps them.
+
+    Images are keyed by (chart key, data generation, pixel size). One worker
+    thread per process serves every cache; it owns its own Agg figure and
+    ChartRenderer, so it never touches the figure on screen, and renders
+    under RENDER_LOCK. Finished images are handed back to the Qt thread
+    through a queued signal and stored there. pending is shared with the
+    worker, so it is only read or changed under the cache's lock.
+    """
+
+    # Emitted on the Qt thread once an image has been stored
+    image_ready = pyqtSignal(object)
+    rendered = pyqtSignal(object, QImage)
+
+    jobs = queue.Queue()
+    worker = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.images = {}
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.generation = None
+        self.rendered.connect(self.store)
+
+        if ChartImageCache.worker is None:
+            ChartImageCache.worker = threading.Thread(target=ChartImageCache.run, daemon=True)
+            ChartImageCache.worker.start()
+            # Let an in-flight render finish before Qt and the interpreter shut down
+            atexit.register(ChartImageCache.stop_worker)
+
+    def get(self, key):
+        """Return the cached image for a key, or None."""
+        return self.images.get(key)
+
+    def request(self, key, chart_type, period, sessions, size_inches, dpi):
+        """Queue a render unless the image is already cached or being rendered."""
+        chart_key, generation, size = key
+        if generation != self.generation:
+            # New session data makes every older image useless
+            self.clear()
+            self.generation = generation
+        with self.lock:
+            if key in self.images or key in self.pending:
+                return
+            self.pending.add(key)
+        self.jobs.put((self, key, chart_type, period, sessions, size_inches, dpi))
+
+    def clear(self):
+        """Forget every image; queued renders are skipped and the one in flight is dropped."""
+        self.images.clear()
+        with self.lock:
+            self.pending.clear()
+
+    def store(self, key, image):
+        """Keep a finished render if it was still wanted."""
+        with self.lock:
+            if key not in self.pending:
+                return
+            self.pending.discard(key)
+        self.images[key] = image
+        self.image_ready.emit(key)
+
+    @staticmethod
+    def run():
+        """Worker loop: render queued charts to QImages until stopped."""
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        renderer = ChartRenderer(figure)
+
+        while True:
+            job = ChartImageCache.jobs.get()
+            if job is None:
+                return
+            cache, key, chart_type, period, sessions, size_inches, dpi = job
+            with cache.lock:
+                wanted = key in cache.pending
+            if not wanted:
+                continue  # Superseded, e.g. by a resize, or the cache was cleared
+            try:
+                with RENDER_LOCK:
+                    figure.set_dpi(dpi)
+                    figure.set_size_inches(size_inches)
+                    renderer.render(chart_type, period, sessions)
+                    figure.canvas.draw()
+                    buffer = figure.canvas.buffer_rgba()
+                    image = QImage(bytes(buffer), buffer.shape[1], buffer.shape[0],
+                                   QImage.Format_RGBA8888)
+            except Exception as e:
+                print(f"Error rendering chart {key[0]}: {e}")
+                continue
+            try:
+                cache.rendered.emit(key, image)
+            except RuntimeError:
+                pass  # The cache was deleted (e.g. on logout) while rendering
+
+    @staticmethod
+    def stop_worker():
+        """Stop the worker thread, waiting briefly for the current render."""
+        ChartImageCache.jobs.put(None)
+        ChartImageCache.worker.join(timeout=2)
+
+
+class ImageFigureCanvas(FigureCanvas):
+    """Figure canvas that shows pre-rendered images until switched to its own figure.
+
+    The live figure is never drawn while an image is shown, not even when the
+    canvas is resized; the image is stretched to fit until a new one arrives.
+    Before the first image, the canvas is filled with the figure's background.
+    """
+
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.cached_image = None
+        self.live = False
+
+    def show_image(self, image):
+        """Paint image until show_live() is called."""
+        image.setDevicePixelRatio(self.device_pixel_ratio)
+        self.cached_image = image
+        self.live = False
+        self.update()
+
+    def show_live(self):
+        """Go back to painting the live figure."""
+        if not self.live:
+            self.cached_image = None
+            self.live = True
+            # Resizes while the image was shown left the Agg buffer out of date
+            self.draw_idle()
+
+    def draw_idle(self):
+        if self.live:
+            super().draw_idle()
+
+    def draw(self):
+        with RENDER_LOCK:
+            super().draw()
+
+    def paintEvent(self, event):
+        if self.live:
+            super().paintEvent(event)
+            return
+        painter = QPainter(self)
+        if self.cached_image is None:
+            painter.fillRect(self.rect(), QColor.fromRgbF(*self.figure.get_facecolor()))
+        else:
+            painter.drawImage(self.rect(), self.cached_image)
+        painter.end()
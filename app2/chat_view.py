@@ -0,0 +1,112 @@
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QTextEdit
+
+# Messages kept laid out in the document, and in memory at all
+MAX_RENDERED_MESSAGES = 100
+MAX_HISTORY = 1000
+
+# Earlier messages drawn again at a time when scrolling to the top
+EARLIER_BATCH = 50
+
+
+class ChatView(QTextEdit):
+    """Read-only chat transcript that is appended to and updated in place.
+
+    Each message is drawn into its own QTextFrame by its render() method, so
+    adding a message, or streaming text into one, only lays out that message
+    however long the chat is. At most max_rendered messages stay in the
+    document while the view follows the latest message; older ones are kept
+    in messages and drawn again, EARLIER_BATCH at a time, when the user
+    scrolls to the top. Beyond max_history the oldest are forgotten.
+    """
+
+    def __init__(self, max_rendered=MAX_RENDERED_MESSAGES, max_history=MAX_HISTORY, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.max_rendered = max_rendered
+        self.max_history = max_history
+        self.messages = []
+        self.frames = {}  # Rendered message -> its frame
+        self.first_rendered = 0  # Index in messages of the first rendered message
+        self.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+
+    def append_message(self, message):
+        follow = self.at_bottom()
+        self.messages.append(message)
+        self.insert(message, QTextCursor.End)
+
+        if len(self.messages) > self.max_history:
+            for old in self.messages[:-self.max_history]:
+                self.remove_frame(old)
+            self.first_rendered = max(0, self.first_rendered - (len(self.messages) - self.max_history))
+            del self.messages[:-self.max_history]
+        if follow:
+            # Only trimmed while following, so earlier messages being read stay put
+            while len(self.frames) > self.max_rendered:
+                self.remove_frame(self.messages[self.first_rendered])
+                self.first_rendered += 1
+            self.scroll_to_bottom()
+
+    def update_message(self, message):
+        """Redraw a message whose text has changed."""
+        frame = self.frames.get(message)
+        if frame is None:
+            return
+        follow = self.at_bottom()
+        cursor = frame.firstCursorPosition()
+        cursor.setPosition(frame.lastPosition(), QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        message.render(cursor)
+        if follow:
+            self.scroll_to_bottom()
+
+    def remove_message(self, message):
+        index = self.messages.index(message)
+        self.remove_frame(message)
+        del self.messages[index]
+        if index < self.first_rendered:
+            self.first_rendered -= 1
+
+    def clear_messages(self):
+        self.messages = []
+        self.frames = {}
+        self.first_rendered = 0
+        self.clear()
+
+    def insert(self, message, position):
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(position)
+        frame = cursor.insertFrame(message.frame_format())
+        message.render(cursor)
+        self.frames[message] = frame
+
+    def remove_frame(self, message):
+        frame = self.frames.pop(message, None)
+        if frame is None:
+            return
+        cursor = QTextCursor(self.document())
+        cursor.setPosition(frame.firstPosition() - 1)
+        cursor.setPosition(frame.lastPosition() + 1, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+
+    def show_earlier(self):
+        """Draw the batch of messages before the first rendered one, keeping the view still."""
+        scrollbar = self.verticalScrollBar()
+        old_maximum = scrollbar.maximum()
+        start = max(0, self.first_rendered - EARLIER_BATCH)
+        for message in reversed(self.messages[start:self.first_rendered]):
+            self.insert(message, QTextCursor.Start)
+        self.first_rendered = start
+        scrollbar.setValue(scrollbar.value() + scrollbar.maximum() - old_maximum)
+
+    def on_scrolled(self, value):
+        if value == self.verticalScrollBar().minimum() and self.first_rendered > 0:
+            self.show_earlier()
+
+    def at_bottom(self):
+        scrollbar = self.verticalScrollBar()
+        return scrollbar.value() >= scrollbar.maximum() - 4
+
+    def scroll_to_bottom(self):
+        scrollbar = self.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
@@ -1,10 +1,9 @@
 import sqlite3
 import bcrypt
 import os
+import re
 from datetime import datetime, timedelta
 import uuid
-import pickle
-import pandas as pd
 
 
 
@@ -16,6 +15,8 @@ class Database:
         self.db_name = db_name
         self.conn = None
         self.cursor = None
+        # Bumped on every write to focus_sessions so views can tell when cached data is stale
+        self.sessions_version = 0
         self.initialize_database()
 
     def connect(self):
@@ -102,10 +103,131 @@ class Database:
             FOREIGN KEY (user_id) REFERENCES users (user_id)
         )
         ''')
-        
+
+        # Running suggestion aggregates per user, so they survive restarts
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_aggregates (
+            user_id INTEGER PRIMARY KEY,
+            state TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+        ''')
+
+        # Models fine-tuned on a user's own sessions, pickled, with the
+        # shipped model version and the last session they were trained on
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_models (
+            user_id INTEGER NOT NULL,
+            model_name TEXT NOT NULL,
+            base_version TEXT NOT NULL,
+            last_session_id INTEGER NOT NULL,
+            artifact BLOB NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, model_name),
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+        ''')
+
+        # Gemini replies saved per user, keyed by a hash of the request
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS llm_response_cache (
+            cache_key TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            response TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_used TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+        ''')
+
+        # Index for evicting a user's least recently used replies
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_llm_response_cache_user_used
+        ON llm_response_cache (user_id, last_used)
+        ''')
+
+        # Index for listing a user's tasks by status
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_user_status
+        ON tasks (user_id, status, created_at)
+        ''')
+
+        # Index for reading a user's session history in date order
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_focus_sessions_user_date
+        ON focus_sessions (user_id, date, start_time)
+        ''')
+
+        # Covering index for per-task focus totals, so the aggregate never reads the table
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_focus_sessions_task
+        ON focus_sessions (task_id, end_time, total_focus_duration, focus_score)
+        ''')
+
+        # Full-text index over task titles and descriptions
+        self.fts_enabled = self.initialize_task_search()
+
         self.conn.commit()
         self.close()
 
+    def initialize_task_search(self):
+        """Create the FTS5 shadow index for tasks and the triggers that keep it in sync.
+
+        Returns:
+            True if the index is available, False if SQLite was built without FTS5
+        """
+        try:
+            self.cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+            )
+            index_exists = self.cursor.fetchone() is not None
+
+            self.cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                title,
+                description,
+                content='tasks',
+                content_rowid='task_id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='1 2 3'
+            )
+            ''')
+
+            self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.task_id, new.title, new.description);
+            END
+            ''')
+
+            self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                VALUES ('delete', old.task_id, old.title, old.description);
+            END
+            ''')
+
+            # Only re-index when the searchable text changes, not on status updates
+            self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+            AFTER UPDATE OF title, description ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                VALUES ('delete', old.task_id, old.title, old.description);
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.task_id, new.title, new.description);
+            END
+            ''')
+
+            # Index tasks that were created before the search index existed
+            if not index_exists:
+                self.cursor.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"Task search index unavailable, falling back to LIKE queries: {str(e)}")
+            return False
+
     def register_user(self, username, password):
         """Register a new user."""
         try:
@@ -192,6 +314,62 @@ class Database:
             self.close()
             return []
 
+    def search_tasks(self, user_id, query, limit=50, status="active"):
+        """Search a user's tasks by title and description.
+
+        Every word in the query is matched as a prefix, so "rep wri" finds
+        "Write report". Title matches rank above description matches.
+
+        Args:
+            user_id: The user ID
+            query: The text typed by the user
+            limit: Maximum number of tasks to return
+            status: Only return tasks with this status
+
+        Returns:
+            A list of (task_id, title, description, created_at) tuples, best match first
+        """
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return self.get_tasks(user_id, status)[:limit]
+
+        try:
+            self.connect()
+            if self.fts_enabled:
+                # Quote each term so FTS5 operators typed by the user are treated as text
+                match_expr = " ".join(f'"{term}"*' for term in terms)
+                self.cursor.execute(
+                    """SELECT t.task_id, t.title, t.description, t.created_at
+                       FROM tasks_fts
+                       JOIN tasks t ON t.task_id = tasks_fts.rowid
+                       WHERE tasks_fts MATCH ? AND t.user_id = ? AND t.status = ?
+                       ORDER BY bm25(tasks_fts, 10.0, 1.0), t.created_at DESC
+                       LIMIT ?""",
+                    (match_expr, user_id, status, limit)
+                )
+            else:
+                conditions = " AND ".join(
+                    "(LOWER(title) LIKE ? OR LOWER(IFNULL(description, '')) LIKE ?)" for _ in terms
+                )
+                params = [user_id, status]
+                for term in terms:
+                    params.extend([f"%{term}%", f"%{term}%"])
+                params.append(limit)
+                self.cursor.execute(
+                    f"""SELECT task_id, title, description, created_at FROM tasks
+                        WHERE user_id = ? AND status = ? AND {conditions}
+                        ORDER BY created_at DESC
+                        LIMIT ?""",
+                    params
+                )
+            tasks = self.cursor.fetchall()
+            self.close()
+            return tasks
+        except Exception as e:
+            self.close()
+            print(f"Error searching tasks: {str(e)}")
+            return []
+
     def update_task_status(self, task_id, status):
         """Update the status of a task."""
         try:
@@ -245,6 +423,7 @@ class Database:
             )
             session_id = self.cursor.lastrowid
             self.conn.commit()
+            self.sessions_version += 1
             self.close()
             return True, "Focus session started", session_id
         except Exception as e:
@@ -309,14 +488,21 @@ class Database:
                  total_focus_duration, focus_score, productivity, break_duration, session_id)
             )
             self.conn.commit()
+            self.sessions_version += 1
             self.close()
             return True, "Focus session ended successfully"
         except Exception as e:
             self.close()
             return False, f"Error ending focus session: {str(e)}"
 
-    def get_user_sessions(self, user_id, limit=10):
-        """Get the most recent focus sessions for a user."""
+    def get_user_sessions(self, user_id, limit=10, offset=0):
+        """Get the most recent focus sessions for a user.
+        
+        Args:
+            user_id: The user ID
+            limit: Maximum number of sessions to return
+            offset: Number of newer sessions to skip, for reading history page by page
+        """
         try:
             self.connect()
             self.cursor.execute(
@@ -326,8 +512,79 @@ class Database:
                    FROM focus_sessions 
                    WHERE user_id = ? 
                    ORDER BY date DESC, start_time DESC 
+                   LIMIT ? OFFSET ?""",
+                (user_id, limit, offset)
+            )
+            sessions = self.cursor.fetchall()
+            self.close()
+            return sessions
+        except Exception as e:
+            self.close()
+            return []
+
+    def get_completed_sessions_after(self, user_id, session_id):
+        """Get a user's finished focus sessions with IDs above session_id, oldest first.
+        
+        Columns are the same as get_user_sessions. Sessions that were started
+        but never ended are left out. NOT INDEXED keeps SQLite on the primary
+        key range; through the user_id index it would read every session the
+        user has.
+        """
+        try:
+            self.connect()
+            self.cursor.execute(
+                """SELECT session_id, date, day, start_time, end_time, task_type, 
+                   app_switch_count, distraction_duration, total_focus_duration, 
+                   focus_score, productivity_percentage, break_duration
+                   FROM focus_sessions NOT INDEXED
+                   WHERE user_id = ? AND session_id > ? 
+                   AND end_time IS NOT NULL AND focus_score IS NOT NULL
+                   ORDER BY session_id""",
+                (user_id, session_id)
+            )
+            sessions = self.cursor.fetchall()
+            self.close()
+            return sessions
+        except Exception as e:
+            self.close()
+            return []
+
+    def count_completed_sessions_after(self, user_id, session_id):
+        """Count the sessions get_completed_sessions_after would return, without reading them."""
+        try:
+            self.connect()
+            self.cursor.execute(
+                """SELECT COUNT(*) FROM focus_sessions NOT INDEXED
+                   WHERE user_id = ? AND session_id > ?
+                   AND end_time IS NOT NULL AND focus_score IS NOT NULL""",
+                (user_id, session_id)
+            )
+            count = self.cursor.fetchone()[0]
+            self.close()
+            return count
+        except Exception as e:
+            self.close()
+            return 0
+
+    def get_all_completed_sessions_after(self, session_id, limit=100000):
+        """Get finished focus sessions of every user with IDs above session_id, oldest first.
+
+        Columns are session_id, user_id and then the same as get_user_sessions
+        without break_duration. Reads at most limit sessions, so callers can
+        page through the table by passing the last ID they got back.
+        """
+        try:
+            self.connect()
+            self.cursor.execute(
+                """SELECT session_id, user_id, date, day, start_time, end_time, task_type,
+                   app_switch_count, distraction_duration, total_focus_duration,
+                   focus_score, productivity_percentage
+                   FROM focus_sessions
+                   WHERE session_id > ?
+                   AND end_time IS NOT NULL AND focus_score IS NOT NULL
+                   ORDER BY session_id
                    LIMIT ?""",
-                (user_id, limit)
+                (session_id, limit)
             )
             sessions = self.cursor.fetchall()
             self.close()
@@ -336,6 +593,71 @@ class Database:
             self.close()
             return []
 
+    def get_session_metrics(self, user_id):
+        """Get the columns used by the statistics charts for all of a user's sessions.
+        
+        Returns:
+            A list of (date, start_time, focus_score, total_focus_duration,
+            distraction_duration) tuples, oldest first
+        """
+        try:
+            self.connect()
+            self.cursor.execute(
+                """SELECT date, start_time, focus_score, total_focus_duration, distraction_duration
+                   FROM focus_sessions 
+                   WHERE user_id = ? 
+                   ORDER BY date ASC, start_time ASC""",
+                (user_id,)
+            )
+            rows = self.cursor.fetchall()
+            self.close()
+            return rows
+        except Exception as e:
+            self.close()
+            print(f"Error getting session metrics: {str(e)}")
+            return []
+
+    def get_task_focus_stats(self, user_id, status="active"):
+        """Get focus totals for each of a user's tasks in a single query.
+
+        Only finished sessions (with an end time) are counted.
+
+        Args:
+            user_id: The user ID
+            status: Only include tasks with this status, or None for all tasks
+
+        Returns:
+            A dict mapping task_id to (session_count, total_focus_minutes, avg_focus_score).
+            avg_focus_score is None for tasks without any rated sessions.
+        """
+        try:
+            self.connect()
+            query = """SELECT t.task_id, COUNT(fs.task_id),
+                      COALESCE(SUM(fs.total_focus_duration), 0), AVG(fs.focus_score)
+                      FROM tasks t
+                      LEFT JOIN focus_sessions fs
+                      ON fs.task_id = t.task_id AND fs.end_time IS NOT NULL
+                      WHERE t.user_id = ?"""
+            params = [user_id]
+
+            if status is not None:
+                query += " AND t.status = ?"
+                params.append(status)
+
+            query += " GROUP BY t.task_id"
+
+            self.cursor.execute(query, params)
+            stats = {
+                task_id: (session_count, total_focus, avg_score)
+                for task_id, session_count, total_focus, avg_score in self.cursor.fetchall()
+            }
+            self.close()
+            return stats
+        except Exception as e:
+            self.close()
+            print(f"Error getting task focus stats: {str(e)}")
+            return {}
+
     def get_user_sessions_by_period(self, user_id, period="all"):
         """Get focus sessions for a user within a specific time period.
         
@@ -518,6 +840,173 @@ class Database:
             self.close()
             return False, f"Error deleting sessions: {str(e)}"
     
+    def get_user_aggregates(self, user_id):
+        """Get a user's saved suggestion aggregates as a JSON string, or None."""
+        try:
+            self.connect()
+            self.cursor.execute(
+                "SELECT state FROM user_aggregates WHERE user_id = ?",
+                (user_id,)
+            )
+            row = self.cursor.fetchone()
+            self.close()
+            return row[0] if row else None
+        except Exception as e:
+            print(f"Error reading cached response: {str(e)}")
+            self.close()
+            return None
+
+    def save_user_aggregates(self, user_id, state):
+        """Save a user's suggestion aggregates.
+        
+        Args:
+            user_id: The user ID
+            state: The aggregates as a JSON string
+            
+        Returns:
+            A tuple (success, message)
+        """
+        try:
+            self.connect()
+            self.cursor.execute(
+                """INSERT INTO user_aggregates (user_id, state, updated_at)
+                   VALUES (?, ?, CURRENT_TIMESTAMP)
+                   ON CONFLICT (user_id) DO UPDATE SET
+                   state = excluded.state, updated_at = excluded.updated_at""",
+                (user_id, state)
+            )
+            self.conn.commit()
+            self.close()
+            return True, "Aggregates saved successfully"
+        except Exception as e:
+            self.close()
+            return False, f"Error saving aggregates: {str(e)}"
+
+    def get_user_models(self, user_id):
+        """Get a user's fine-tuned models as (model_name, base_version, last_session_id, artifact) tuples."""
+        try:
+            self.connect()
+            self.cursor.execute(
+                """SELECT model_name, base_version, last_session_id, artifact
+                   FROM user_models WHERE user_id = ?""",
+                (user_id,)
+            )
+            models = self.cursor.fetchall()
+            self.close()
+            return models
+        except Exception as e:
+            self.close()
+            return []
+
+    def save_user_models(self, user_id, models):
+        """Save a user's fine-tuned models, replacing older ones of the same names.
+        
+        Args:
+            user_id: The user ID
+            models: (model_name, base_version, last_session_id, artifact) tuples,
+                the artifact as pickled bytes
+            
+        Returns:
+            A tuple (success, message)
+        """
+        try:
+            self.connect()
+            self.cursor.executemany(
+                """INSERT INTO user_models
+                   (user_id, model_name, base_version, last_session_id, artifact, updated_at)
+                   VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                   ON CONFLICT (user_id, model_name) DO UPDATE SET
+                   base_version = excluded.base_version, last_session_id = excluded.last_session_id,
+                   artifact = excluded.artifact, updated_at = excluded.updated_at""",
+                [(user_id, name, base_version, last_session_id, artifact)
+                 for name, base_version, last_session_id, artifact in models]
+            )
+            self.conn.commit()
+            self.close()
+            return True, "Models saved successfully"
+        except Exception as e:
+            self.close()
+            return False, f"Error saving models: {str(e)}"
+
+    def get_cached_response(self, user_id, cache_key, max_age_seconds):
+        """Get a saved Gemini reply no older than max_age_seconds, or None.
+        
+        A hit is marked as used, for least-recently-used eviction.
+        """
+        try:
+            self.connect()
+            self.cursor.execute(
+                """SELECT response FROM llm_response_cache
+                   WHERE cache_key = ? AND user_id = ? AND created_at > datetime('now', ?)""",
+                (cache_key, user_id, f"-{int(max_age_seconds)} seconds")
+            )
+            row = self.cursor.fetchone()
+            if row:
+                self.cursor.execute(
+                    "UPDATE llm_response_cache SET last_used = CURRENT_TIMESTAMP WHERE cache_key = ?",
+                    (cache_key,)
+                )
+                self.conn.commit()
+            self.close()
+            return row[0] if row else None
+        except Exception as e:
+            print(f"Error reading cached response: {str(e)}")
+            self.close()
+            return None
+
+    def save_cached_response(self, user_id, cache_key, response, max_entries, max_age_seconds):
+        """Save a Gemini reply, evicting expired and least recently used ones.
+        
+        Args:
+            user_id: The user ID
+            cache_key: Hash of the request
+            response: The reply text
+            max_entries: Replies to keep for the user
+            max_age_seconds: Replies older than this are removed
+            
+        Returns:
+            A tuple (success, message)
+        """
+        try:
+            self.connect()
+            self.cursor.execute(
+                """INSERT OR REPLACE INTO llm_response_cache (cache_key, user_id, response)
+                   VALUES (?, ?, ?)""",
+                (cache_key, user_id, response)
+            )
+            self.cursor.execute(
+                """DELETE FROM llm_response_cache
+                   WHERE user_id = ? AND (created_at <= datetime('now', ?) OR cache_key NOT IN (
+                       SELECT cache_key FROM llm_response_cache WHERE user_id = ?
+                       ORDER BY last_used DESC, rowid DESC LIMIT ?))""",
+                (user_id, f"-{int(max_age_seconds)} seconds", user_id, max_entries)
+            )
+            self.conn.commit()
+            self.close()
+            return True, "Response cached successfully"
+        except Exception as e:
+            self.close()
+            return False, f"Error caching response: {str(e)}"
+
+    def clear_cached_responses(self, user_id):
+        """Delete all saved Gemini replies for a user.
+        
+        Returns:
+            A tuple (success, message)
+        """
+        try:
+            self.connect()
+            self.cursor.execute(
+                "DELETE FROM llm_response_cache WHERE user_id = ?",
+                (user_id,)
+            )
+            self.conn.commit()
+            self.close()
+            return True, "Cached responses cleared successfully"
+        except Exception as e:
+            self.close()
+            return False, f"Error clearing cached responses: {str(e)}"
+
     def update_break_duration(self, session_id, actual_break_duration):
         """Update the break duration with the actual time the break ran for.
         
@@ -538,6 +1027,7 @@ class Database:
                 (actual_break_duration, session_id)
             )
             self.conn.commit()
+            self.sessions_version += 1
             self.close()
             return True, "Break duration updated successfully"
         except Exception as e:
@@ -0,0 +1,144 @@
+"""Columnar cache of the training datasets in finalised/dataset.
+
+Parsing the CSV and XLSX sources with pandas (XLSX especially) costs far
+more than the data is worth at these sizes. Each source is converted once
+into a directory under dataset/cache holding its typed columns as one
+structured array in columns.npy, and a meta.json recording the source
+file's SHA-256. Later loads memory-map that file once and hand the
+DataFrame views of its fields, so numeric and date columns are neither
+read up front nor copied. Text columns are stored as integer codes with
+their distinct values in meta.json and come back as categoricals. A cache
+whose hash no longer matches its source is rebuilt on the next load.
+
+Build or refresh the cache for every dataset, from the app2 directory:
+    python dataset_cache.py
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from model_registry import MODEL_DIR
+
+DATASET_DIR = os.path.join(MODEL_DIR, "dataset")
+
+# Caches go in this directory next to their sources
+CACHE_DIRNAME = "cache"
+
+# Layout of the cache directories this code writes and reads
+CACHE_FORMAT = 1
+
+SOURCE_EXTENSIONS = (".csv", ".xlsx")
+
+
+def read_source(path):
+    """Parse a dataset file with pandas; CSV dates are day-month-year."""
+    if path.endswith(".xlsx"):
+        df = pd.read_excel(path, index_col=0)
+        df['Date'] = pd.to_datetime(df['Date'])
+    else:
+        df = pd.read_csv(path, index_col=0)
+        df['Date'] = pd.to_datetime(df['Date'], format="%d-%m-%Y")
+    return df.reset_index(drop=True)
+
+
+def source_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def cache_path(path):
+    return os.path.join(os.path.dirname(path), CACHE_DIRNAME, os.path.basename(path))
+
+
+def write_cache(df, directory, sha256):
+    """Save a dataset's columns to columns.npy, writing meta.json last."""
+    os.makedirs(directory, exist_ok=True)
+    columns = []
+    fields = []
+    for i, (name, column) in enumerate(df.items()):
+        entry = {"name": name, "field": f"f{i}"}
+        if pd.api.types.is_datetime64_any_dtype(column):
+            entry["kind"] = "date"
+            values = column.to_numpy(dtype="datetime64[ns]")
+        elif pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+            entry["kind"] = "number"
+            values = column.to_numpy()
+        else:
+            # Codes index the distinct values; -1 marks a missing value
+            entry["kind"] = "text"
+            codes, uniques = pd.factorize(column.to_numpy(dtype=object))
+            entry["categories"] = [str(value) for value in uniques]
+            values = codes.astype(np.int32)
+        columns.append(entry)
+        fields.append(values)
+
+    table = np.empty(len(df), dtype=[(entry["field"], values.dtype) for entry, values in zip(columns, fields)])
+    for entry, values in zip(columns, fields):
+        table[entry["field"]] = values
+    np.save(os.path.join(directory, "columns.npy"), table)
+
+    meta = {"format": CACHE_FORMAT, "source_sha256": sha256, "rows": len(df), "columns": columns}
+    tmp_path = os.path.join(directory, "meta.json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, "meta.json"))
+
+
+def read_cache(directory, sha256):
+    """Load a cached dataset, or None if it is missing or was built from other data."""
+    try:
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("format") != CACHE_FORMAT or meta.get("source_sha256") != sha256:
+        return None
+
+    table = np.load(os.path.join(directory, "columns.npy"), mmap_mode="r")
+    columns = {}
+    for entry in meta["columns"]:
+        values = table[entry["field"]]
+        if entry["kind"] == "text":
+            # The codes were written from these categories, so skip re-checking them
+            dtype = pd.CategoricalDtype(entry["categories"])
+            columns[entry["name"]] = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        else:
+            columns[entry["name"]] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def load_dataset(path):
+    """Load a dataset from its cache, converting the source first if the cache is stale."""
+    sha256 = source_sha256(path)
+    directory = cache_path(path)
+    df = read_cache(directory, sha256)
+    if df is None:
+        write_cache(read_source(path), directory, sha256)
+        df = read_cache(directory, sha256)
+    return df
+
+
+def build_cache(dataset_dir=DATASET_DIR):
+    """Convert every dataset whose cache is missing or stale.
+
+    Returns {file name: True if it was converted, False if already up to date}.
+    """
+    built = {}
+    for name in sorted(os.listdir(dataset_dir)):
+        if not name.endswith(SOURCE_EXTENSIONS):
+            continue
+        path = os.path.join(dataset_dir, name)
+        sha256 = source_sha256(path)
+        directory = cache_path(path)
+        built[name] = read_cache(directory, sha256) is None
+        if built[name]:
+            write_cache(read_source(path), directory, sha256)
+    return built
+
+
+if __name__ == "__main__":
+    for name, converted in build_cache().items():
+        print(f"{name}: {'converted' if converted else 'up to date'}")
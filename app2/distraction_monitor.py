@@ -0,0 +1,102 @@
+import time
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from model_registry import models, ModelLoadError
+
+# Too little of the session has been seen before this for the model to judge it
+WARMUP_MINS = 5.0
+
+# Distraction above the prediction by this much counts as an anomaly:
+# at least MIN_EXCESS_MINS and at least EXCESS_RATIO of the prediction
+MIN_EXCESS_MINS = 2.0
+EXCESS_RATIO = 0.5
+
+# Work allowed per tick; the model runs at most once per tick and its
+# forward pass takes a few microseconds, so this is only exceeded if the
+# machine is badly overloaded
+TICK_BUDGET_MS = 1.0
+
+
+class DistractionMonitor(QObject):
+    """Compares a running session's distraction time with what the anomaly model expects.
+
+    Fed the tracker's running counters on every app check, it predicts the
+    distraction minutes expected for a session of that length with that many
+    app switches, and emits anomaly_detected when the observed minutes exceed
+    the prediction by the margin above. It fires once per excursion and rearms
+    when distraction drops back under the prediction.
+    """
+
+    # observed minutes, expected minutes
+    anomaly_detected = pyqtSignal(float, float)
+
+    def __init__(self, registry=models, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.predictor = None
+        self.features = None
+        self.encoded = None
+        self.alerted = False
+        self.expected = None
+        self.last_tick_ms = 0.0
+
+    def start(self, task_type, start_time):
+        """Begin watching a session of a task type started at start_time."""
+        self.features = (task_type or "others", start_time.strftime("%A"), start_time.hour)
+        self.predictor = None
+        self.alerted = False
+        self.expected = None
+        # Model loading is never waited for on the Qt thread
+        self.registry.load_in_background()
+
+    def stop(self):
+        self.features = None
+        self.predictor = None
+
+    def get_predictor(self):
+        """The model with the session's fixed inputs encoded, or None while it is loading."""
+        if self.predictor is None and self.registry.is_loaded("anomaly"):
+            try:
+                predictor = self.registry.get("anomaly")
+            except ModelLoadError:
+                self.features = None
+                return None
+            task_type, day, hour = self.features
+            task_code = predictor.task_type_codes.get(task_type.lower(), predictor.task_type_codes["others"])
+            self.encoded = (task_code, predictor.day_codes[day.lower()], hour)
+            self.predictor = predictor
+        return self.predictor
+
+    def update(self, app_switch_count, distraction_mins, focus_mins):
+        """Score the session so far from the tracker's counters.
+
+        Returns the expected distraction minutes, or None if the session
+        can't be scored yet.
+        """
+        if self.features is None:
+            return None
+        start = time.perf_counter()
+        try:
+            elapsed = distraction_mins + focus_mins
+            if elapsed < WARMUP_MINS or self.get_predictor() is None:
+                return None
+
+            task_type, day, hour = self.encoded
+            expected = max(0.0, self.predictor.predict_one(
+                [app_switch_count, task_type, day, hour, elapsed]))
+            self.expected = expected
+
+            excess = distraction_mins - expected
+            if excess > max(MIN_EXCESS_MINS, EXCESS_RATIO * expected):
+                if not self.alerted:
+                    self.alerted = True
+                    self.anomaly_detected.emit(distraction_mins, expected)
+            elif excess <= 0:
+                self.alerted = False
+            return expected
+        finally:
+            self.last_tick_ms = (time.perf_counter() - start) * 1000
+            if self.last_tick_ms > TICK_BUDGET_MS:
+                print(f"Distraction check took {self.last_tick_ms:.2f} ms "
+                      f"(budget {TICK_BUDGET_MS} ms)")
@@ -0,0 +1,201 @@
+"""Append-only columnar store of the finished focus sessions in the app database.
+
+Sessions are exported with the columns of finalised/dataset/focus_data.csv
+plus user_id, so training and personalization can use real users'
+sessions next to the bundled datasets. The store remembers a watermark,
+the highest session_id it holds, and each export only reads the sessions
+above it. Like the aggregates in session_aggregates, a session that is
+still running when a later one is exported is never picked up.
+
+Rows are kept in .npy chunks of one structured array each, listed in
+meta.json with the ID range they cover. Readers memory-map the chunks and
+can ask for only the sessions after a watermark of their own. Text columns
+are stored as codes into category lists in meta.json that only ever grow,
+so a code means the same thing in every chunk.
+
+Export the sessions recorded since the last run, from the app2 directory:
+    python feature_store.py [database]
+"""
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from dataset_cache import DATASET_DIR
+from session_stats import parse_dates, days_from_civil, to_float_column
+
+STORE_DIR = os.path.join(DATASET_DIR, "sessions")
+
+# Layout of meta.json and the chunks this code writes and reads
+STORE_FORMAT = 1
+
+# Small exports are merged into the last chunk while it stays under this many rows
+CHUNK_ROWS = 65536
+
+# Sessions read from the database per query during an export
+EXPORT_BATCH = 100000
+
+# Columns in the order of Database.get_all_completed_sessions_after
+COLUMNS = [
+    ("session_id", "id"),
+    ("user_id", "id"),
+    ("Date", "date"),
+    ("Day", "text"),
+    ("Start Time", "text"),
+    ("End Time", "text"),
+    ("Task Type", "text"),
+    ("App Switch Count", "number"),
+    ("Distraction Duration (mins)", "number"),
+    ("Total Focus Duration (mins)", "number"),
+    ("Focus Score (0-10)", "number"),
+    ("Productivity %", "number"),
+]
+TEXT_COLUMNS = [name for name, kind in COLUMNS if kind == "text"]
+
+FIELD_TYPES = {"id": np.int64, "date": "datetime64[ns]", "text": np.int32, "number": np.float64}
+ROW_DTYPE = np.dtype([(name, FIELD_TYPES[kind]) for name, kind in COLUMNS])
+
+
+class SessionStore:
+    """The exported sessions in a directory of chunks (see the module docstring)."""
+
+    def __init__(self, directory=STORE_DIR):
+        self.directory = directory
+        self.meta = self.load_meta()
+        # Text value -> code, per text column
+        self.codes = {name: {value: code for code, value in enumerate(self.meta["categories"][name])}
+                      for name in TEXT_COLUMNS}
+
+    def load_meta(self):
+        try:
+            with open(os.path.join(self.directory, "meta.json")) as f:
+                meta = json.load(f)
+            if meta.get("format") == STORE_FORMAT:
+                return meta
+            print(f"Session store format {meta.get('format')} is not supported; exporting again")
+        except (OSError, ValueError):
+            pass
+        return {"format": STORE_FORMAT, "watermark": 0, "rows": 0, "chunks": [],
+                "categories": {name: [] for name in TEXT_COLUMNS}}
+
+    def save_meta(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = os.path.join(self.directory, "meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, os.path.join(self.directory, "meta.json"))
+
+    @property
+    def watermark(self):
+        return self.meta["watermark"]
+
+    @property
+    def rows(self):
+        return self.meta["rows"]
+
+    def chunk_path(self, chunk):
+        return os.path.join(self.directory, chunk["file"])
+
+    def to_table(self, sessions):
+        """Turn database session tuples into a structured array, adding any new text values."""
+        table = np.empty(len(sessions), dtype=ROW_DTYPE)
+        for (name, kind), values in zip(COLUMNS, zip(*sessions)):
+            if kind == "id":
+                table[name] = values
+            elif kind == "date":
+                year, month, day = parse_dates(list(values))
+                dates = days_from_civil(year, month, day).astype("datetime64[D]").astype("datetime64[ns]")
+                dates[year < 0] = np.datetime64("NaT")
+                table[name] = dates
+            elif kind == "text":
+                local_codes, uniques = pd.factorize(np.array(values, dtype=object))
+                codes, categories = self.codes[name], self.meta["categories"][name]
+                for value in uniques:
+                    if value not in codes:
+                        codes[value] = len(categories)
+                        categories.append(value)
+                # Missing values (local code -1) pick the trailing -1
+                lookup = np.array([codes[value] for value in uniques] + [-1], dtype=np.int32)
+                table[name] = lookup[local_codes]
+            else:
+                table[name] = to_float_column(values)
+        return table
+
+    def append(self, sessions):
+        """Add database session tuples, which must come after the watermark in ID order."""
+        if not sessions:
+            return
+        table = self.to_table(sessions)
+        chunks = self.meta["chunks"]
+        if chunks and chunks[-1]["rows"] + len(table) <= CHUNK_ROWS:
+            table = np.concatenate([np.load(self.chunk_path(chunks.pop())), table])
+
+        first_id, last_id = int(table["session_id"][0]), int(table["session_id"][-1])
+        chunk = {"file": f"{first_id}-{last_id}.npy", "first_id": first_id, "last_id": last_id,
+                 "rows": len(table)}
+        os.makedirs(self.directory, exist_ok=True)
+        np.save(self.chunk_path(chunk), table)
+        chunks.append(chunk)
+        self.meta["watermark"] = last_id
+        self.meta["rows"] += len(sessions)
+        # The chunk is only part of the store once meta.json lists it
+        self.save_meta()
+        self.remove_unlisted_chunks()
+
+    def remove_unlisted_chunks(self):
+        """Delete chunk files meta.json no longer lists, such as ones merged into a bigger chunk."""
+        listed = {chunk["file"] for chunk in self.meta["chunks"]}
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy") and name not in listed:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass  # Still mapped by a reader; removed on a later append
+
+    def export(self, db, batch_size=EXPORT_BATCH):
+        """Append the database's finished sessions above the watermark; returns how many."""
+        exported = 0
+        while True:
+            sessions = db.get_all_completed_sessions_after(self.watermark, batch_size)
+            if not sessions:
+                return exported
+            self.append(sessions)
+            exported += len(sessions)
+
+    def read(self, after=0):
+        """DataFrame of the stored sessions with session_id above after, in ID order.
+
+        A single chunk is returned as views of its memory-mapped file;
+        sessions from several chunks are copied into one array.
+        """
+        tables = []
+        for chunk in self.meta["chunks"]:
+            if chunk["last_id"] <= after:
+                continue
+            table = np.load(self.chunk_path(chunk), mmap_mode="r")
+            if chunk["first_id"] <= after:
+                table = table[np.searchsorted(table["session_id"], after, side="right"):]
+            tables.append(table)
+        if not tables:
+            table = np.empty(0, dtype=ROW_DTYPE)
+        else:
+            table = tables[0] if len(tables) == 1 else np.concatenate(tables)
+
+        columns = {}
+        for name, kind in COLUMNS:
+            if kind == "text":
+                dtype = pd.CategoricalDtype(self.meta["categories"][name])
+                columns[name] = pd.Categorical.from_codes(table[name], dtype=dtype, validate=False)
+            else:
+                columns[name] = table[name]
+        return pd.DataFrame(columns, copy=False)
+
+
+if __name__ == "__main__":
+    from database import Database
+
+    store = SessionStore()
+    exported = store.export(Database(*sys.argv[1:2]))
+    print(f"Exported {exported} sessions; the store holds {store.rows} up to session {store.watermark}")
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+from model_registry import models
+from session_stats import parse_dates, parse_hours, days_from_civil, to_float_column
+
+# Column names for the tuples returned by Database.get_user_sessions,
+# matching the names used in the training datasets
+SESSION_COLUMNS = ['Session ID', 'Date', 'Day', 'Start Time', 'End Time', 'Task Type',
+                   'App Switch Count', 'Distraction Duration (mins)',
+                   'Total Focus Duration (mins)', 'Focus Score (0-10)', 'Productivity %',
+                   'Break Duration']
+
+# Columns held as text; every other session column is numeric
+TEXT_COLUMNS = ['Date', 'Day', 'Start Time', 'End Time', 'Task Type']
+
+# Sessions missing any of these are skipped
+REQUIRED_COLUMNS = ['Date', 'Day', 'Start Time', 'Total Focus Duration (mins)',
+                    'Focus Score (0-10)', 'Productivity %']
+
+# Fewer valid sessions than this are not enough to base suggestions on
+MIN_SESSIONS = 3
+
+# Used when a session's start time can't be read
+DEFAULT_HOUR = 9
+
+
+class FixedEncoder:
+    """Maps labels to the integer codes a model was trained with.
+
+    Unlike a LabelEncoder refitted on each batch, the codes never depend on
+    which labels happen to be present. Matching is case-insensitive; unknown
+    labels get the code of default, or -1 if there is no default.
+    """
+
+    def __init__(self, classes, default=None):
+        self.classes = list(classes)
+        self.default_code = self.classes.index(default) if default is not None else -1
+
+    def encode(self, labels):
+        # Look up each distinct label once instead of every row
+        label_codes, uniques = pd.factorize(np.asarray(labels, dtype=object))
+        lookup = {label: code for code, label in enumerate(self.classes)}
+        unique_codes = np.array([lookup.get(str(label).lower(), self.default_code) for label in uniques]
+                                + [self.default_code], dtype=np.int64)
+        return unique_codes[label_codes]  # -1 (missing) picks the trailing default
+
+    def decode(self, codes):
+        return np.asarray(self.classes, dtype=object)[codes]
+
+
+def load_encoders(registry=models):
+    """The day and task type encoders saved with the models in models.json.
+
+    'day' gives the weekday codes (Monday = 0) the day model was trained with;
+    'task_type' gives the alphabetical codes of the task type LabelEncoders
+    pickled with the length and distraction models.
+    """
+    encoders = registry.load_manifest()["encoders"]
+    return {
+        'day': FixedEncoder(encoders['day']),
+        'task_type': FixedEncoder(encoders['task_type'], default='others'),
+    }
+
+
+def recency_weights(days_ago):
+    """Weight sessions by age: 1.0 within a week, then 0.75, 0.5 and 0.25."""
+    days_ago = np.asarray(days_ago)
+    return np.select([days_ago <= 7, days_ago <= 14, days_ago <= 21], [1.0, 0.75, 0.5], 0.25)
+
+
+def session_lengths(duration):
+    """Round session durations to multiples of 15 minutes within 15-90."""
+    return np.clip(15 * np.round(np.asarray(duration, dtype=np.float64) / 15), 15, 90)
+
+
+def productivity_labels(productivity):
+    """'High' from 75%, 'Mid' from 50%, otherwise 'Low'."""
+    productivity = np.asarray(productivity)
+    return np.select([productivity >= 75, productivity >= 50], ['High', 'Mid'], 'Low')
+
+
+def day_numbers(dates):
+    """Days since 1970-01-01 for a date column (datetimes or "YYYY-MM-DD" strings); -1 if invalid."""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        numbers = dates.values.astype('datetime64[D]').astype(np.int64)
+        numbers[dates.isna().values] = -1
+        return numbers
+    year, month, day = parse_dates(dates.to_numpy(dtype=object).tolist())
+    return np.where(year >= 0, days_from_civil(year, month, day), -1)
+
+
+def lowercase_labels(column, default):
+    """Lowercase a text column, replacing missing and non-text values with default."""
+    codes, uniques = pd.factorize(column.to_numpy(dtype=object))
+    lowered = np.array([label.lower() if isinstance(label, str) else default for label in uniques]
+                       + [default], dtype=object)
+    return lowered[codes]
+
+
+def sessions_frame(sessions):
+    """DataFrame of database session tuples with missing values cleaned up."""
+    # One typed array per column; letting pandas infer types from the tuples is slower
+    columns = {}
+    for i, name in enumerate(SESSION_COLUMNS):
+        values = [session[i] for session in sessions]
+        columns[name] = (np.array(values, dtype=object) if name in TEXT_COLUMNS
+                         else to_float_column(values))
+    df = pd.DataFrame(columns)
+    df = df[df[REQUIRED_COLUMNS].notna().all(axis=1)].reset_index(drop=True)
+
+    df['Day'] = lowercase_labels(df['Day'], 'monday')
+    df['Task Type'] = lowercase_labels(df['Task Type'], 'studying')
+    df['App Switch Count'] = df['App Switch Count'].fillna(0)
+    df['Distraction Duration (mins)'] = df['Distraction Duration (mins)'].fillna(0)
+    return df
+
+
+def add_features(df, encoders):
+    """Add the model input columns to a frame of sessions.
+
+    Works on any frame with the raw session columns, from the database or
+    from the training datasets. Dates may be datetimes or "YYYY-MM-DD"
+    strings and start times "HH:MM[:SS]" strings.
+    """
+    days = day_numbers(df['Date'])
+    valid_days = days >= 0
+    last_day = days[valid_days].max() if valid_days.any() else 0
+    df['Date'] = np.where(valid_days, days, last_day).astype('datetime64[D]')
+    df['Days Ago'] = np.where(valid_days, last_day - days, 0)
+
+    hours = parse_hours([str(time) for time in df['Start Time'].to_numpy(dtype=object)])
+    df['Hour'] = np.where(hours >= 0, hours, DEFAULT_HOUR)
+
+    df['Session Duration (mins)'] = df['Total Focus Duration (mins)'] + df['Distraction Duration (mins)']
+    df['Session Length'] = session_lengths(df['Session Duration (mins)'])
+
+    df['Weight'] = recency_weights(df['Days Ago'])
+    df['Weighted Focus Score'] = df['Focus Score (0-10)'] * df['Weight']
+    df['Weighted Productivity'] = df['Productivity %'] * df['Weight']
+
+    # Fall back to the weekday of the date for unrecognised day names
+    day_codes = encoders['day'].encode(df['Day'])
+    weekdays = (days + 3) % 7  # 1970-01-01 was a Thursday
+    df['Day_encoded'] = np.where(day_codes >= 0, day_codes, np.where(valid_days, weekdays, 0))
+    df['Task_Type_encoded'] = encoders['task_type'].encode(df['Task Type'])
+
+    df['combined_score'] = df['Focus Score (0-10)'] * df['Productivity %'] / 10
+    df['Productivity_Label'] = productivity_labels(df['Productivity %'])
+    return df
+
+
+def prepare_sessions(sessions, encoders):
+    """Build the model input frame from database session tuples.
+
+    Returns:
+        (DataFrame, day encoder), or (None, None) if fewer than
+        MIN_SESSIONS sessions are usable.
+    """
+    if not sessions:
+        print("No session data available for model preparation")
+        return None, None
+
+    df = sessions_frame(sessions)
+    if len(df) < MIN_SESSIONS:
+        print("Not enough valid sessions for model preparation")
+        return None, None
+
+    return add_features(df, encoders), encoders['day']
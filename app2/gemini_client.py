@@ -0,0 +1,184 @@
+import itertools
+import json
+import threading
+import time
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1"
+GEMINI_MODEL = "gemini-1.5-flash"
+
+# Seconds to wait for a connection, and for each chunk of the reply once connected
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+
+# Failed attempts are retried after BACKOFF_SECONDS, doubling each time;
+# only connection errors, timeouts and these statuses are worth retrying
+MAX_RETRIES = 2
+BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "topK": 40,
+    "topP": 0.95,
+    "maxOutputTokens": 1024,
+}
+
+
+class GeminiError(Exception):
+    """The API could not be reached or returned an error."""
+
+
+class RequestCancelled(Exception):
+    """The request was cancelled before it finished."""
+
+
+class GeminiClient:
+    """Gemini API client that keeps one pooled HTTP session for every request.
+
+    Reusing the session saves a TCP and TLS handshake per message. Calls
+    block, so they belong on a worker thread (see GeminiReplies). Each takes
+    an optional threading.Event; setting it cancels the request at the next
+    chunk or retry.
+    """
+
+    def __init__(self, api_key, base_url=GEMINI_BASE_URL, model=GEMINI_MODEL,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_retries=MAX_RETRIES, backoff_seconds=BACKOFF_SECONDS):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.session = None
+        self.lock = threading.Lock()
+
+    def get_session(self):
+        """The shared requests.Session, created on the first call."""
+        with self.lock:
+            if self.session is None:
+                # requests is only imported once the first message is sent
+                import requests
+                self.session = requests.Session()
+                self.session.headers.update({
+                    "Content-Type": "application/json",
+                    "x-goog-api-key": self.api_key,
+                })
+            return self.session
+
+    def stream(self, contents, cancelled=None):
+        """Yield the reply in chunks as streamGenerateContent sends them."""
+        response = self.post(contents, cancelled)
+        with response:
+            # The API sends UTF-8; without a charset in the Content-Type,
+            # requests would decode text/event-stream as ISO-8859-1
+            response.encoding = "utf-8"
+            for line in response.iter_lines(decode_unicode=True):
+                if cancelled is not None and cancelled.is_set():
+                    raise RequestCancelled()
+                # Server-sent events: one "data: {json}" line per chunk
+                if not line or not line.startswith("data:"):
+                    continue
+                try:
+                    chunk = json.loads(line[len("data:"):])
+                    parts = chunk["candidates"][0]["content"]["parts"]
+                except (ValueError, KeyError, IndexError) as e:
+                    raise GeminiError(f"Unexpected response chunk: {line[:200]}") from e
+                text = "".join(part.get("text", "") for part in parts)
+                if text:
+                    yield text
+
+    def post(self, contents, cancelled=None):
+        """Send a request, retrying with backoff, and return the streaming response."""
+        import requests
+
+        url = f"{self.base_url}/models/{self.model}:streamGenerateContent?alt=sse"
+        body = json.dumps({"contents": contents, "generationConfig": GENERATION_CONFIG})
+        for attempt in itertools.count():
+            if cancelled is not None and cancelled.is_set():
+                raise RequestCancelled()
+            try:
+                response = self.get_session().post(url, data=body, timeout=self.timeout, stream=True)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = GeminiError(f"Gemini API unreachable: {e}")
+            else:
+                if response.status_code == 200:
+                    return response
+                error = GeminiError(f"Gemini API error: {response.status_code} - {response.text[:500]}")
+                response.close()
+                if response.status_code not in RETRY_STATUSES:
+                    raise error
+
+            if attempt >= self.max_retries:
+                raise error
+            delay = self.backoff_seconds * 2 ** attempt
+            # Waiting on the event lets a cancel cut the backoff short
+            if cancelled is not None and cancelled.wait(delay):
+                raise RequestCancelled()
+            elif cancelled is None:
+                time.sleep(delay)
+
+    def close(self):
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+
+
+class GeminiReplies(QObject):
+    """Runs Gemini requests off the Qt thread and streams replies back through signals.
+
+    Only one reply is in flight at a time: request() cancels the previous
+    one. Signals carry the request ID returned by request(), are delivered
+    on the Qt thread, and are not emitted for cancelled requests.
+    """
+
+    # request ID, text received so far
+    chunk_received = pyqtSignal(int, str)
+    # request ID, full reply
+    finished = pyqtSignal(int, str)
+    # request ID, error message
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, client, parent=None):
+        super().__init__(parent)
+        self.client = client
+        self.request_ids = itertools.count(1)
+        self.cancelled = None
+
+    def request(self, contents):
+        """Start streaming a reply to contents; returns the request ID."""
+        self.cancel()
+        request_id = next(self.request_ids)
+        self.cancelled = threading.Event()
+        threading.Thread(target=self.run, args=(request_id, contents, self.cancelled),
+                         daemon=True).start()
+        return request_id
+
+    def cancel(self):
+        """Cancel the reply in flight, if any."""
+        if self.cancelled is not None:
+            self.cancelled.set()
+            self.cancelled = None
+
+    def run(self, request_id, contents, cancelled):
+        text = ""
+        try:
+            for chunk in self.client.stream(contents, cancelled):
+                text += chunk
+                self.send(cancelled, self.chunk_received, request_id, text)
+            self.send(cancelled, self.finished, request_id, text)
+        except RequestCancelled:
+            pass
+        except Exception as e:
+            self.send(cancelled, self.failed, request_id, str(e))
+
+    def send(self, cancelled, signal, *args):
+        if cancelled.is_set():
+            return
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass  # The widget was deleted (e.g. on logout) while the reply streamed
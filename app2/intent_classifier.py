@@ -0,0 +1,153 @@
+import re
+
+# Keywords per intent with their weights. Phrases match whole words; a
+# trailing * on a single word also matches any ending (distract* ->
+# distracted, distraction). The intent with the highest total wins, earlier
+# intents winning ties, so specific phrases carry more weight than common
+# words.
+INTENT_KEYWORDS = {
+    "complaint_repetition": {
+        "same message": 5, "same response": 5, "same answer": 5, "same thing": 4, "repetitive": 5,
+        "again and again": 5, "keeps repeating": 5, "keep repeating": 5, "giving same": 5,
+        "keeps saying": 5, "keeps telling": 5, "always say": 5, "always tell": 5, "redundant": 5,
+    },
+    "time_question": {
+        "when": 1, "time": 1.5, "what time": 3, "best time": 3, "time of day": 3,
+        "morning*": 2, "afternoon*": 2, "evening*": 2, "night*": 2, "hour*": 1.5,
+        "o'clock": 2, "am": 1, "pm": 1,
+    },
+    "day_question": {
+        "day": 1.5, "days": 1.5, "which day": 3, "what day": 3, "week": 1.5, "weekly": 1,
+        "monday*": 2.5, "tuesday*": 2.5, "wednesday*": 2.5, "thursday*": 2.5, "friday*": 2.5,
+        "saturday*": 2.5, "sunday*": 2.5, "weekend*": 2.5, "weekday*": 2.5,
+    },
+    "duration_question": {
+        "how long": 3, "minute*": 1.5, "length": 2, "duration": 2, "session*": 1,
+        "pomodoro*": 1.5, "timer": 1, "longer": 1, "shorter": 1,
+    },
+    "distraction_question": {
+        "distract*": 3, "focus": 1, "concentrat*": 2.5, "attention": 2,
+        "app block": 2, "app blocker": 2, "app blocking": 2,
+        "notification*": 2, "alert*": 1.5, "procrastinat*": 2.5, "phone": 1.5,
+        "social media": 2, "lose focus": 2, "stay focused": 2,
+    },
+    "app_usage_question": {
+        "how to use": 3, "how do i use": 3, "feature*": 2, "app": 1, "function*": 1,
+        "tracker": 1.5, "how does": 1.5, "button": 1.5, "settings": 1.5,
+    },
+    "statistics_question": {
+        "stats": 2.5, "statistic*": 2.5, "data": 1.5, "progress": 2, "improvement": 1,
+        "history": 1.5, "tracking": 1, "report*": 2, "trend*": 2, "score*": 1.5,
+        "productivity": 1, "chart*": 2, "dashboard": 2,
+    },
+    "task_question": {
+        "task*": 2, "todo": 2, "to-do": 2, "to do list": 2, "list": 1,
+        "what should i work on": 4, "what should i": 1.5, "what to do": 2, "priorit*": 2,
+        "work on": 2,
+    },
+    "break_question": {
+        "break*": 2.5, "rest": 2, "pause": 2, "interval*": 1.5, "between sessions": 2,
+    },
+    "tech_question": {
+        "problem": 2, "error*": 3, "bug*": 3, "not working": 3, "doesn't work": 3,
+        "issue*": 3, "fix": 2, "broken": 3, "crash*": 3, "freez*": 2, "stuck": 1.5,
+    },
+    "personal_question": {
+        "who are you": 4, "what are you": 4, "your name": 3, "chatbot": 3, "assistant": 2,
+        "are you": 1.5, "yourself": 2,
+    },
+}
+
+QUESTION_WORDS = ["how", "what", "why", "where", "when", "who", "which", "can", "should", "could", "would"]
+
+
+# Words, keeping apostrophes and hyphens ("o'clock", "to-do")
+WORD_PATTERN = re.compile(r"[\w'-]+")
+WORD = r"[\w'-]"
+
+
+def trie_pattern(node):
+    """Regex matching the keywords in a character trie, preferring the longest.
+
+    A node maps characters to child nodes; "" marks a keyword ending there
+    and "*" a stem. A space stands for anything between two words.
+    """
+    alternatives = []
+    for char, child in sorted(node.items()):
+        if char in ("", "*"):
+            continue
+        step = rf"[^\w'-]+" if char == " " else re.escape(char)
+        alternatives.append(step + trie_pattern(child))
+    if "*" in node:
+        alternatives.append(WORD + "*")  # Last, so longer keywords are tried first
+    if not alternatives:
+        return ""
+    pattern = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    if "" in node and "*" not in node:
+        pattern = f"(?:{pattern})?"
+    return pattern
+
+
+class IntentClassifier:
+    """Classifies chat messages by intent in one pass over their text.
+
+    The keywords are compiled into one regex shaped like a trie, so each
+    message is scanned once and overlapping keywords ("how long" vs "long")
+    resolve to the longest. Each match is looked up among the phrases, then
+    by its prefixes among the stems, and adds its weight to its intent.
+    Messages that match nothing fall back to "general_question" if they
+    look like a question and "general_statement" otherwise.
+    """
+
+    def __init__(self, intent_keywords=INTENT_KEYWORDS, question_words=QUESTION_WORDS):
+        self.intents = list(intent_keywords)
+        self.phrases = {}  # words joined by single spaces -> (intent index, weight)
+        self.stems = {}  # word prefix -> (intent index, weight)
+        trie = {}
+        for intent, keywords in intent_keywords.items():
+            for keyword, weight in keywords.items():
+                if keyword.endswith("*"):
+                    self.stems[keyword[:-1]] = (self.intents.index(intent), weight)
+                else:
+                    self.phrases[keyword] = (self.intents.index(intent), weight)
+                node = trie
+                for char in keyword.rstrip("*"):
+                    node = node.setdefault(char, {})
+                node["*" if keyword.endswith("*") else ""] = True
+        self.stem_lengths = sorted({len(stem) for stem in self.stems}, reverse=True)
+        self.pattern = re.compile(rf"(?<!{WORD}){trie_pattern(trie)}(?!{WORD})")
+        self.question_words = set(question_words)
+
+    def keyword(self, match):
+        """(intent index, weight) of a matched keyword."""
+        found = self.phrases.get(match)
+        if found is None and " " not in match:
+            for length in self.stem_lengths:
+                found = self.stems.get(match[:length])
+                if found:
+                    break
+        if found is None:
+            # Words of a phrase separated by more than one space
+            found = self.phrases.get(" ".join(WORD_PATTERN.findall(match)))
+        return found
+
+    def scores(self, text):
+        """Total keyword weight per intent index for a lowercase message."""
+        scores = [0.0] * len(self.intents)
+        for match in self.pattern.findall(text):
+            intent, weight = self.keyword(match)
+            scores[intent] += weight
+        return scores
+
+    def classify(self, text):
+        text = text.lower()
+        scores = self.scores(text)
+        best = max(scores)
+        if best > 0:
+            return self.intents[scores.index(best)]
+        if text.rstrip().endswith("?") or self.question_words.intersection(WORD_PATTERN.findall(text)):
+            return "general_question"
+        return "general_statement"
+
+
+classifier = IntentClassifier()
@@ -0,0 +1,40 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+
+
+class LazyTab(QWidget):
+    """Tab page that shows a placeholder until it is first opened.
+
+    The real widget is created by calling factory() the first time the tab
+    becomes visible, after the placeholder has had a chance to paint, so
+    expensive tabs add nothing to login time if they are never opened.
+    """
+
+    def __init__(self, factory, placeholder_text="Loading..."):
+        super().__init__()
+        self.factory = factory
+        self.content = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.placeholder = QLabel(placeholder_text)
+        self.placeholder.setFont(QFont("Arial", 12))
+        self.placeholder.setAlignment(Qt.AlignCenter)
+        self.placeholder.setStyleSheet("color: #888888;")
+        layout.addWidget(self.placeholder)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.content is None:
+            QTimer.singleShot(0, self.ensure_built)
+
+    def ensure_built(self):
+        """Create the real widget if it doesn't exist yet and return it."""
+        if self.content is None:
+            self.content = self.factory()
+            self.layout().removeWidget(self.placeholder)
+            self.placeholder.deleteLater()
+            self.layout().addWidget(self.content)
+        return self.content
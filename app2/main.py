@@ -1,10 +1,4 @@
 import sys
-import threading
-import pygetwindow as gw
-import pickle
-import pandas as pd
-
-
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QStackedWidget, QTabWidget, 
@@ -16,8 +10,8 @@ from database import Database
 from login_ui import LoginWidget
 from todo_ui import TodoWidget
 from pomodoro_ui import PomodoroWidget
-from stats_ui import StatsWidget
-from suggestions_ui import SuggestionsUI
+from lazy_tab import LazyTab
+from model_registry import models
 from app_tracker import AppTracker
 from session_manager import SessionManager
 
@@ -130,20 +124,15 @@ class MainWindow(QMainWindow):
         # Create pomodoro widget
         self.pomodoro_widget = PomodoroWidget(self.db, self.user_id, self.app_tracker)
         
-        # Create stats widget
-        self.stats_widget = StatsWidget(self.db, self.user_id)
-        
-        # Create suggestions widget
-        self.suggestions_widget = SuggestionsUI(self.db, self.user_id)
+        # Stats and suggestions are only built when their tab is first opened
+        self.stats_widget = None
+        self.suggestions_widget = None
         
         # Create tab widget for pomodoro, stats, and suggestions
         tab_widget = QTabWidget()
         tab_widget.addTab(self.pomodoro_widget, "Pomodoro Timer")
-        tab_widget.addTab(self.stats_widget, "Statistics")
-        tab_widget.addTab(self.suggestions_widget, "Suggestions")
-        
-        # Connect Pomodoro widget to Suggestions UI
-        self.suggestions_widget.connect_to_pomodoro(self.pomodoro_widget)
+        tab_widget.addTab(LazyTab(self.create_stats_widget, "Loading statistics..."), "Statistics")
+        tab_widget.addTab(LazyTab(self.create_suggestions_widget, "Loading suggestions..."), "Suggestions")
         
         # Add widgets to content layout
         content_layout.addWidget(self.todo_widget, 1)  # 1/3 of width
@@ -156,6 +145,31 @@ class MainWindow(QMainWindow):
         
         # Switch to main app
         self.stacked_widget.setCurrentIndex(1)
+        
+        # Load the suggestion models in the background once the window has painted
+        QTimer.singleShot(0, models.load_in_background)
+    
+    def create_stats_widget(self):
+        """Build the Statistics tab the first time it is opened."""
+        # Imported here so Matplotlib is only loaded if the tab is used
+        from stats_ui import StatsWidget
+        
+        self.stats_widget = StatsWidget(self.db, self.user_id)
+        
+        # Refresh statistics whenever a session is recorded
+        self.pomodoro_widget.session_ended.connect(self.stats_widget.on_session_ended)
+        return self.stats_widget
+    
+    def create_suggestions_widget(self):
+        """Build the Suggestions tab the first time it is opened."""
+        # Imported here so pandas is only loaded if the tab is used
+        from suggestions_ui import SuggestionsUI
+        
+        self.suggestions_widget = SuggestionsUI(self.db, self.user_id)
+        
+        # Connect Pomodoro widget to Suggestions UI
+        self.suggestions_widget.connect_to_pomodoro(self.pomodoro_widget)
+        return self.suggestions_widget
     
     def logout(self):
         """Log out the current user."""
@@ -346,13 +360,4 @@ if __name__ == "__main__":
     """)
     
     window = MainWindow()
-    sys.exit(app.exec_()) 
-from app_tracker import AppTracker
-
-# Create an instance of the AppTracker
-app_tracker = AppTracker()
-
-# Run the app tracker in a separate thread to avoid blocking the main application
-app_tracker_thread = threading.Thread(target=app_tracker.track_app_usage)
-app_tracker_thread.daemon = True  # This makes the thread stop when the main program stops
-app_tracker_thread.start()
\ No newline at end of file
+    sys.exit(app.exec_())
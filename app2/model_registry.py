@@ -0,0 +1,296 @@
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "finalised")
+MANIFEST_PATH = os.path.join(MODEL_DIR, "models.json")
+
+# Layout of models.json this code understands
+MANIFEST_FORMAT = 1
+
+
+def hidden_activation(name):
+    """In-place function for an MLP's hidden layer activation, by its activation parameter."""
+    import numpy as np
+
+    def logistic(values):
+        np.negative(values, out=values)
+        np.exp(values, out=values)
+        values += 1
+        np.reciprocal(values, out=values)
+
+    return {
+        "identity": lambda values: None,
+        "logistic": logistic,
+        "tanh": lambda values: np.tanh(values, out=values),
+        "relu": lambda values: np.maximum(values, 0, out=values),
+    }[name]
+
+
+class ModelLoadError(Exception):
+    """A model artifact is missing, altered, or doesn't match its manifest entry."""
+
+
+class Predictor:
+    """A trained model together with the feature columns it expects, in order."""
+
+    FEATURES = []
+
+    def __init__(self, model, version):
+        self.model = model
+        self.version = version
+        # What predictions go through: the model, or a copy without its feature names
+        self.estimator = model
+
+        fitted_features = getattr(model, "feature_names_in_", None)
+        if fitted_features is not None:
+            if list(fitted_features) != self.FEATURES:
+                raise ModelLoadError(f"{type(self).__name__} expects features {self.FEATURES}, "
+                                     f"model was fitted on {list(fitted_features)}")
+            # Columns are checked here once, so callers can pass plain arrays
+            # without scikit-learn warning about missing feature names. The
+            # shallow copy shares the fitted arrays; the model itself keeps
+            # its names for anyone else using it
+            self.estimator = copy.copy(model)
+            del self.estimator.feature_names_in_
+
+    @classmethod
+    def from_artifact(cls, artifact, version):
+        """Build the predictor from the unpickled artifact."""
+        return cls(artifact, version)
+
+    def predict(self, rows):
+        """Predict for a 2-D array whose columns follow FEATURES."""
+        return self.estimator.predict(rows)
+
+    def check_encoders(self, encoders):
+        """Check the artifact against the encoder classes listed in models.json."""
+
+
+class FocusLevelPredictor(Predictor):
+    """Classifies sessions as 'High', 'Mid' or 'Low' focus."""
+
+    @property
+    def classes(self):
+        return list(self.model.classes_)
+
+    def predict_proba(self, rows):
+        """Class probabilities, one column per entry in classes."""
+        return self.estimator.predict_proba(rows)
+
+
+class BestDayPredictor(FocusLevelPredictor):
+    FEATURES = ["Day_encoded", "App Switch Count", "Distraction Duration (mins)",
+                "Total Focus Duration (mins)", "Weighted Focus Score", "Weighted Productivity"]
+
+
+class BestTimePredictor(FocusLevelPredictor):
+    FEATURES = ["App Switch Count", "Hour", "Distraction Duration (mins)",
+                "Total Focus Duration (mins)", "Weighted Focus Score", "Weighted Productivity"]
+
+
+class EncodedPredictor(Predictor):
+    """Predictor whose Task Type and Day columns are label encoded.
+
+    The encoders are pickled next to the model and hold lowercase labels.
+    """
+
+    ENCODER_KEYS = ("task_type", "day")
+
+    def __init__(self, model, version, task_type_encoder, day_encoder):
+        super().__init__(model, version)
+        self.task_type_encoder = task_type_encoder
+        self.day_encoder = day_encoder
+        # Label -> code, for encoding single values without a transform() call
+        self.task_type_codes = {label: code for code, label in enumerate(task_type_encoder.classes_)}
+        self.day_codes = {label: code for code, label in enumerate(day_encoder.classes_)}
+
+    @classmethod
+    def from_artifact(cls, artifact, version):
+        task_type_key, day_key = cls.ENCODER_KEYS
+        return cls(artifact["model"], version, artifact[task_type_key], artifact[day_key])
+
+    @property
+    def task_types(self):
+        return list(self.task_type_encoder.classes_)
+
+    @property
+    def days(self):
+        return list(self.day_encoder.classes_)
+
+    def check_encoders(self, encoders):
+        if self.task_types != encoders["task_type"] or self.days != sorted(encoders["day"]):
+            raise ModelLoadError(f"{type(self).__name__} encoders don't match models.json")
+
+    def encode_task_types(self, task_types):
+        return self.task_type_encoder.transform([t.lower() for t in task_types])
+
+    def encode_days(self, days):
+        return self.day_encoder.transform([d.lower() for d in days])
+
+
+class SessionLengthPredictor(EncodedPredictor):
+    """Recommends a session length in minutes (15 to 90)."""
+
+    FEATURES = ["App Switch Count", "Distraction Duration (mins)", "Focus Score (0-10)",
+                "Productivity %", "Hour", "Task Type", "Day"]
+    ENCODER_KEYS = ("tt_en", "d_en")
+
+    @property
+    def lengths(self):
+        return [int(length) for length in self.model.classes_]
+
+    def predict_proba(self, rows):
+        """Probabilities, one column per entry in lengths."""
+        return self.estimator.predict_proba(rows)
+
+
+class DistractionPredictor(EncodedPredictor):
+    """Predicts the distraction minutes expected for a session."""
+
+    FEATURES = ["App Switch Count", "Task Type", "Day", "Hour", "Session Duration (mins)"]
+    ENCODER_KEYS = ("tt_encoder", "d_encoder")
+
+    def __init__(self, model, version, task_type_encoder, day_encoder):
+        super().__init__(model, version, task_type_encoder, day_encoder)
+        self.activation = hidden_activation(model.activation)
+
+    def predict_one(self, row):
+        """Predict for a single row by running the network's forward pass directly.
+
+        Skips scikit-learn's per-call input validation, which costs far more
+        than the network itself for one row, so the cost is a fixed few
+        microseconds.
+        """
+        import numpy as np
+        values = np.asarray(row, dtype=np.float64)
+        last_layer = len(self.model.coefs_) - 1
+        for i, (weights, bias) in enumerate(zip(self.model.coefs_, self.model.intercepts_)):
+            values = values @ weights + bias
+            if i < last_layer:
+                self.activation(values)  # In place
+        return float(values[0])
+
+
+PREDICTORS = {
+    "best_day": BestDayPredictor,
+    "best_time": BestTimePredictor,
+    "best_length": SessionLengthPredictor,
+    "anomaly": DistractionPredictor,
+}
+
+
+class ModelRegistry:
+    """Loads each model artifact at most once per process and hands out predictors.
+
+    Artifacts are listed in finalised/models.json with their SHA-256 and
+    version. A file that doesn't match its entry is refused rather than
+    unpickled. Loading can be started on a background thread with
+    load_in_background(); get() waits for a model that is still loading,
+    and when_loaded() calls back once the background load is over.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR, manifest_path=MANIFEST_PATH):
+        self.model_dir = model_dir
+        self.manifest_path = manifest_path
+        self.manifest = None
+        self.predictors = {}
+        self.errors = {}
+        self.lock = threading.Lock()
+        self.model_locks = {name: threading.Lock() for name in PREDICTORS}
+        self.loader = None
+        self.loaded = False  # The background load is over, each model loaded or failed
+        self.callbacks = []
+
+    def load_manifest(self):
+        with self.lock:
+            if self.manifest is None:
+                with open(self.manifest_path) as f:
+                    manifest = json.load(f)
+                if manifest.get("format") != MANIFEST_FORMAT:
+                    raise ModelLoadError(f"Unsupported model manifest format: {manifest.get('format')}")
+                self.manifest = manifest
+            return self.manifest
+
+    def get(self, name):
+        """Return the predictor for a model, loading it on first use.
+
+        Raises ModelLoadError if the model can't be loaded; the failure is
+        remembered so later calls fail fast instead of retrying.
+        """
+        with self.model_locks[name]:
+            if name in self.predictors:
+                return self.predictors[name]
+            if name in self.errors:
+                raise self.errors[name]
+            try:
+                predictor = self.load(name)
+            except Exception as e:
+                error = e if isinstance(e, ModelLoadError) else ModelLoadError(f"Failed to load {name}: {e}")
+                self.errors[name] = error
+                print(f"Error loading model {name}: {error}")
+                raise error
+            self.predictors[name] = predictor
+            return predictor
+
+    def load(self, name):
+        """Verify and unpickle one artifact."""
+        manifest = self.load_manifest()
+        entry = manifest["models"][name]
+        path = os.path.join(self.model_dir, entry["file"])
+
+        with open(path, "rb") as f:
+            data = f.read()
+        checksum = hashlib.sha256(data).hexdigest()
+        if checksum != entry["sha256"]:
+            raise ModelLoadError(f"{entry['file']} does not match its checksum in models.json")
+
+        # Pickled estimators only load reliably into the version that trained them
+        import sklearn
+        trained_with = manifest["sklearn_version"]
+        if sklearn.__version__ != trained_with:
+            raise ModelLoadError(f"{entry['file']} was trained with scikit-learn {trained_with}, "
+                                 f"found {sklearn.__version__}")
+
+        predictor = PREDICTORS[name].from_artifact(pickle.loads(data), entry["version"])
+        predictor.check_encoders(manifest["encoders"])
+        return predictor
+
+    def is_loaded(self, name):
+        return name in self.predictors
+
+    def load_in_background(self, names=None):
+        """Start loading models on a daemon thread, if not already started."""
+        with self.lock:
+            if self.loader is not None:
+                return
+            self.loader = threading.Thread(target=self.load_all, args=(names,), daemon=True)
+            self.loader.start()
+
+    def load_all(self, names=None):
+        for name in names or PREDICTORS:
+            try:
+                self.get(name)
+            except ModelLoadError:
+                pass  # Already logged; get() raises it again for the caller
+        if self.loader is threading.current_thread():
+            with self.lock:
+                self.loaded = True
+                callbacks, self.callbacks = self.callbacks, []
+            for callback in callbacks:
+                callback()
+
+    def when_loaded(self, callback):
+        """Call callback() once the background load is over: from the loading thread, or now if it already is."""
+        with self.lock:
+            if not self.loaded:
+                self.callbacks.append(callback)
+                return
+        callback()
+
+
+# The registry shared by the whole process
+models = ModelRegistry()
@@ -0,0 +1,265 @@
+"""Fine-tuning the Suggestions models on one user's sessions, in the background.
+
+The shipped models are trained on other students' data. Once a user has
+PERSONALIZE_MIN_SESSIONS finished sessions, copies of the day, time and
+length models are fitted to that user's whole history in a worker process:
+
+- the day and time models (MLPClassifiers) are warm-started from the
+  shipped weights for a few epochs, labelled Low/Mid/High by tercile of the
+  user's own sessions, so 'High' means a good session for them;
+- the length model is a decision tree, which can't be updated in place, so
+  it is retrained on the training datasets plus the user's sessions, each
+  of those counting USER_WEIGHT times.
+
+The distraction model stays shared. Fine-tuned models are saved in the
+user_models table with the version of the shipped model they started from
+and the last session they saw, and handed to the Qt thread, which swaps
+them in. They are refitted after every RETRAIN_AFTER_SESSIONS new sessions,
+and thrown away once the shipped models they came from are replaced.
+"""
+import copy
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QCoreApplication, QObject, pyqtSignal
+
+import train
+from database import Database
+from dataset_cache import DATASET_DIR
+from features import FixedEncoder, add_features, load_encoders, sessions_frame
+from model_registry import models, ModelLoadError, PREDICTORS
+
+# The models fitted per user
+PERSONALIZED = ["best_day", "best_time", "best_length"]
+
+# Finished sessions needed before a user gets models of their own
+PERSONALIZE_MIN_SESSIONS = 20
+
+# New sessions after which a user's models are fitted again
+RETRAIN_AFTER_SESSIONS = 5
+
+# Epochs over the user's sessions when warm-starting a network, and its
+# learning rate, a tenth of the shipped one so a few dozen sessions adjust
+# the weights rather than replace them
+FINE_TUNE_EPOCHS = 20
+FINE_TUNE_LEARNING_RATE = 1e-4
+
+# How many training dataset rows each of the user's sessions counts as in the length model
+USER_WEIGHT = 10.0
+
+# Dataset tag of the user's rows among the training datasets
+USER_DATASET = "user"
+
+
+def version_stamp(base_version, user_id, last_session_id):
+    """Version of a fine-tuned model, e.g. '2024.05.01+user3.128'."""
+    return f"{base_version}+user{user_id}.{last_session_id}"
+
+
+def user_focus_labels(df):
+    """'Low', 'Mid' or 'High' by tercile of the user's own averaged focus score and productivity."""
+    combined = 0.5 * df['Focus Score (0-10)'] + 0.5 * df['Productivity %']
+    # Ranking first keeps the terciles apart when sessions tie
+    return pd.qcut(combined.rank(method='first'), q=3, labels=['Low', 'Mid', 'High']).astype(str)
+
+
+def fine_tune(predictor, df):
+    """A copy of a day or time network trained further on the user's sessions."""
+    # fit() with warm_start keeps the weights but starts a fresh optimizer
+    # at the lower rate; n_iter_no_change keeps the loss of the original
+    # training from stopping it early
+    model = copy.deepcopy(predictor.model).set_params(
+        warm_start=True, learning_rate_init=FINE_TUNE_LEARNING_RATE,
+        max_iter=FINE_TUNE_EPOCHS, n_iter_no_change=FINE_TUNE_EPOCHS)
+    return model.fit(df[predictor.FEATURES].fillna(0), user_focus_labels(df))
+
+
+def retrain_length(predictor, df, encoders):
+    """A length tree fitted on the training datasets and the user's sessions, weighted up."""
+    datasets = [add_features(dataset, encoders)
+                for dataset in train.load_datasets(DATASET_DIR, train.DATASETS, 1)]
+    df = pd.concat(datasets + [df.assign(Dataset=USER_DATASET)], ignore_index=True)
+    # Codes of the shipped model's LabelEncoders, so it keeps its encoders
+    df['Task Type Code'] = FixedEncoder(predictor.task_types, default='others').encode(df['Task Type'])
+    df['Day Code'] = FixedEncoder(predictor.days).encode(df['Day'])
+
+    X, y = train.training_data("best_length", df)
+    weights = np.where(df.loc[X.index, 'Dataset'] == USER_DATASET, USER_WEIGHT, 1.0)
+    return train.build_estimator("best_length").fit(X, y, sample_weight=weights)
+
+
+def lower_priority():
+    """Let the app's own process come first for the CPU; runs as the worker process starts."""
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+
+def personalize(db_name, user_id):
+    """Fit a user's models and save them; runs in the worker process.
+
+    Returns the saved (model name, base version, last session ID, pickled
+    artifact) tuples, or None if the user has fewer than
+    PERSONALIZE_MIN_SESSIONS usable sessions.
+    """
+    import warnings
+    from sklearn.exceptions import ConvergenceWarning
+
+    db = Database(db_name)
+    sessions = db.get_completed_sessions_after(user_id, 0)
+    df = sessions_frame(sessions)
+    if len(df) < PERSONALIZE_MIN_SESSIONS:
+        return None
+    encoders = load_encoders(models)
+    df = add_features(df, encoders)
+    last_session_id = sessions[-1][0]
+
+    results = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        for name in PERSONALIZED:
+            predictor = models.get(name)
+            if name == "best_length":
+                model = retrain_length(predictor, df, encoders)
+            else:
+                model = fine_tune(predictor, df)
+            artifact = train.artifact(name, model, getattr(predictor, "task_type_encoder", None),
+                                      getattr(predictor, "day_encoder", None))
+            results.append((name, predictor.version, last_session_id, pickle.dumps(artifact)))
+
+    success, message = db.save_user_models(user_id, results)
+    if not success:
+        print(message)
+    return results
+
+
+class PersonalModels:
+    """Registry stand-in that hands out a user's fine-tuned predictors and the shared ones for the rest."""
+
+    def __init__(self, predictors, registry=models):
+        self.predictors = predictors
+        self.registry = registry
+
+    def get(self, name):
+        if name in self.predictors:
+            return self.predictors[name]
+        return self.registry.get(name)
+
+
+class Personalizer(QObject):
+    """Keeps a user's fine-tuned models up to date without blocking the Qt thread.
+
+    refresh(), on the Qt thread, loads the user's saved models the first
+    time the shipped ones are loaded, then counts the sessions finished since they were fitted and, if
+    there are enough, has the worker process fit new ones. A refresh()
+    while a fit runs makes it check once more when done. Fitting happens in
+    one worker process per app, spawned on first use, so it never holds the
+    GIL the UI needs; shutdown() stops it when the app quits.
+    """
+
+    # {model name: Predictor}, delivered on the Qt thread
+    models_ready = pyqtSignal(object)
+    # Emitted on the Qt thread once a fit is over, whether or not it succeeded
+    fit_finished = pyqtSignal()
+
+    pool = None
+
+    def __init__(self, db, user_id, registry=models, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.user_id = user_id
+        self.registry = registry
+        self.future = None  # The fit running in the worker process
+        self.again = False
+        # Last session the current models were fitted on; None until the saved ones are read
+        self.last_session_id = None
+        self.fit_finished.connect(self.on_fit_finished)
+
+        if Personalizer.pool is None:
+            # Spawned rather than forked: forking copies the Qt and loader threads' state
+            Personalizer.pool = ProcessPoolExecutor(max_workers=1,
+                                                    mp_context=multiprocessing.get_context("spawn"),
+                                                    initializer=lower_priority)
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(Personalizer.shutdown)
+
+    @staticmethod
+    def shutdown():
+        """Drop queued fits and stop the worker process, so quitting doesn't wait for a fit."""
+        if Personalizer.pool is not None:
+            Personalizer.pool.shutdown(wait=False, cancel_futures=True)
+            Personalizer.pool = None
+            # The worker is the app's only multiprocessing child; a fit cut
+            # short leaves the saved models as they were
+            for process in multiprocessing.active_children():
+                process.terminate()
+
+    def refresh(self):
+        """Load the saved models the first time, then start a fit if enough sessions were finished since."""
+        if self.last_session_id is None:
+            if not all(self.registry.is_loaded(name) for name in PERSONALIZED):
+                return  # Never wait for the shipped models here; called again once they are loaded
+            self.last_session_id = 0
+            predictors = self.to_predictors(self.db.get_user_models(self.user_id))
+            if predictors:
+                self.models_ready.emit(predictors)
+
+        if self.future is not None:
+            self.again = True
+            return
+        if Personalizer.pool is None:
+            return  # The app is quitting
+        needed = RETRAIN_AFTER_SESSIONS if self.last_session_id else PERSONALIZE_MIN_SESSIONS
+        if self.db.count_completed_sessions_after(self.user_id, self.last_session_id) < needed:
+            return
+        self.future = Personalizer.pool.submit(personalize, self.db.db_name, self.user_id)
+        self.future.add_done_callback(self.fitted)
+
+    def fitted(self, future):
+        # Runs on the pool's thread
+        try:
+            predictors = self.to_predictors(future.result() or [])
+            if predictors:
+                self.send("models_ready", predictors)
+        except CancelledError:
+            pass
+        except Exception as e:
+            if Personalizer.pool is not None:  # Rather than stopped by shutdown()
+                print(f"Error personalizing models: {str(e)}")
+        self.send("fit_finished")
+
+    def on_fit_finished(self):
+        self.future = None
+        if self.again:
+            self.again = False
+            self.refresh()
+
+    def to_predictors(self, rows):
+        """Predictors from (model name, base version, last session ID, artifact) tuples.
+
+        Returns None unless every model in PERSONALIZED is there and was
+        fitted from the shipped version loaded now.
+        """
+        predictors = {}
+        for name, base_version, last_session_id, data in rows:
+            try:
+                if name not in PERSONALIZED or self.registry.get(name).version != base_version:
+                    return None
+            except ModelLoadError:
+                return None  # The shared models are used
+            version = version_stamp(base_version, self.user_id, last_session_id)
+            predictors[name] = PREDICTORS[name].from_artifact(pickle.loads(data), version)
+        if set(predictors) != set(PERSONALIZED):
+            return None
+        self.last_session_id = last_session_id
+        return predictors
+
+    def send(self, signal, *args):
+        try:
+            getattr(self, signal).emit(*args)
+        except RuntimeError:
+            pass  # The widget was deleted (e.g. on logout) while the models were fitted
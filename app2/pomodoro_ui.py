@@ -7,16 +7,8 @@ from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
 import time
 from datetime import datetime, timedelta
-import pandas as pd
-import pickle
-with open('finalised/Best_Day.pkl', 'rb') as f:
-    best_day_model = pickle.load(f)
 
-with open('finalised/Best_Length.pkl', 'rb') as f:
-    best_length_model = pickle.load(f)
-
-with open('finalised/Best_Time.pkl', 'rb') as f:
-    best_time_model = pickle.load(f)
+from distraction_monitor import DistractionMonitor
 
 
 class PomodoroWidget(QWidget):
@@ -35,6 +27,12 @@ class PomodoroWidget(QWidget):
         self.remaining_seconds = 0
         self.total_seconds = 0
         self.start_time = None
+        
+        # Warns when distraction runs well above what the model expects
+        self.distraction_monitor = DistractionMonitor(parent=self)
+        self.distraction_monitor.anomaly_detected.connect(self.on_distraction_anomaly)
+        self.distraction_alert = None
+        
         self.init_ui()
         
         # Load initial data
@@ -59,6 +57,20 @@ class PomodoroWidget(QWidget):
         
         # Task selection dropdown
         task_selection_layout = QFormLayout()  # Use FormLayout for better alignment
+        
+        # Search bar for tasks
+        self.task_search_bar = QLineEdit()
+        self.task_search_bar.setPlaceholderText("Search tasks...")
+        self.task_search_bar.setClearButtonEnabled(True)
+        self.task_search_bar.textChanged.connect(self.on_task_search_changed)
+        task_selection_layout.addRow("Find Task:", self.task_search_bar)
+        
+        # Wait for a short pause in typing before querying the database
+        self.task_search_timer = QTimer(self)
+        self.task_search_timer.setSingleShot(True)
+        self.task_search_timer.setInterval(150)
+        self.task_search_timer.timeout.connect(self.filter_tasks)
+        
         self.task_combo = QComboBox()
         self.task_combo.setMinimumWidth(250)
         self.task_combo.currentIndexChanged.connect(self.on_task_selected)
@@ -283,14 +295,40 @@ class PomodoroWidget(QWidget):
                 self.app_list.addItem(app)
     
     def load_tasks(self):
-        """Load active tasks from the database."""
+        """Load active tasks from the database, filtered by the task search bar."""
+        selected_task_id = self.task_id
+        
+        self.task_combo.blockSignals(True)
         self.task_combo.clear()
         self.task_combo.addItem("Select a task...", None)  # Default option
         
-        tasks = self.db.get_tasks(self.user_id, status="active")
+        query = self.task_search_bar.text().strip()
+        if query:
+            tasks = self.db.search_tasks(self.user_id, query, limit=50)
+        else:
+            tasks = self.db.get_tasks(self.user_id, status="active")
         
         for task_id, title, description, created_at in tasks:
             self.task_combo.addItem(title, task_id)
+        
+        # Keep the current task selected if it is still in the list
+        index = self.task_combo.findData(selected_task_id) if selected_task_id else -1
+        if index < 0 and query and self.task_combo.count() > 1:
+            index = 1  # Select the best match while searching
+        self.task_combo.setCurrentIndex(max(index, 0))
+        self.task_combo.blockSignals(False)
+        self.on_task_selected(self.task_combo.currentIndex())
+    
+    def on_task_search_changed(self, text):
+        """Restart the search delay whenever the query changes."""
+        self.task_search_timer.start()
+    
+    def filter_tasks(self):
+        """Reload the task dropdown for the current search query."""
+        # Don't swap the task out from under a running (or paused) session or break
+        if self.pause_button.isEnabled():
+            return
+        self.load_tasks()
     
     def on_task_selected(self, index):
         """Handle task selection from dropdown."""
@@ -379,6 +417,7 @@ class PomodoroWidget(QWidget):
             # Start app tracking
             self.app_tracker.set_allowed_apps(selected_apps)
             self.app_tracker.start_tracking()
+            self.distraction_monitor.start(self.task_type, self.start_time)
             
             # Create session in database
             success, message, session_id = self.db.start_focus_session(
@@ -466,6 +505,7 @@ class PomodoroWidget(QWidget):
                 return
             
             # Stop app tracking
+            self.distraction_monitor.stop()
             try:
                 app_switch_count, distraction_time, focus_time = self.app_tracker.stop_tracking()
             except Exception as e:
@@ -529,6 +569,11 @@ class PomodoroWidget(QWidget):
                     # Only process the result if it's not None
                     if result is not None:
                         current_app, is_allowed = result
+                        self.distraction_monitor.update(
+                            self.app_tracker.app_switch_count,
+                            self.app_tracker.distraction_time,
+                            self.app_tracker.focus_time
+                        )
             else:
                 # Timer finished
                 self.timer.stop()
@@ -612,6 +657,15 @@ class PomodoroWidget(QWidget):
                         if success:
                             # Store the session ID for updating with actual break duration later
                             self.last_session_id = self.session_id
+                            
+                            # Let the stats and suggestions tabs know there is new data
+                            self.session_ended.emit(
+                                self.session_id,
+                                int(self.session_data["app_switch_count"]),
+                                float(self.session_data["distraction_time"]),
+                                float(self.session_data["focus_time"]),
+                                focus_score
+                            )
                         else:
                             msg_box = QMessageBox()
                             msg_box.setWindowFlags(msg_box.windowFlags() | Qt.WindowStaysOnTopHint)
@@ -679,6 +733,7 @@ class PomodoroWidget(QWidget):
             
             # Ensure app tracker is not tracking during break
             self.app_tracker.stop_tracking()
+            self.distraction_monitor.stop()
         except Exception as e:
             print(f"Error starting break: {str(e)}")
             # Reset UI
@@ -792,6 +847,23 @@ class PomodoroWidget(QWidget):
             for app in other_apps:
                 self.app_list.addItem(app)
 
+    def on_distraction_anomaly(self, observed_mins, expected_mins):
+        """Warn that this session is far more distracted than usual."""
+        # Non-modal, so the timer and tracking keep running while it is open
+        if self.distraction_alert is not None:
+            self.distraction_alert.close()
+        self.distraction_alert = QMessageBox(self)
+        self.distraction_alert.setWindowFlags(self.distraction_alert.windowFlags() | Qt.WindowStaysOnTopHint)
+        self.distraction_alert.setIcon(QMessageBox.Warning)
+        self.distraction_alert.setWindowTitle("Distraction Alert")
+        self.distraction_alert.setText(
+            f"You've been distracted for {observed_mins:.0f} minutes this session, "
+            f"about {observed_mins - expected_mins:.0f} minutes more than expected. "
+            "Try closing the apps that are pulling you away."
+        )
+        self.distraction_alert.setModal(False)
+        self.distraction_alert.show()
+    
     def update_current_app(self, current_app, is_allowed):
         """Update the UI with information about the currently active app.
         
@@ -0,0 +1,128 @@
+import math
+import re
+
+# The instructions every chat request starts with. They never change, so the
+# start of each request is identical and the per-user data all goes in the
+# last message.
+SYSTEM_PROMPT = """You are Focus AI, a helpful, friendly assistant integrated into a Focus Enhancement app.
+
+Your primary purpose is to help users improve their focus, productivity, and work habits based on their session data.
+
+The Focus Enhancement app includes:
+1. Pomodoro Timer with customizable session lengths and break durations
+2. App tracking that monitors productive vs distracting applications
+3. Focus sessions that record productivity metrics
+4. Statistics dashboard showing focus patterns
+5. Todo list for task management
+
+Each user message starts with the user's current focus data and a summary of the conversation so far.
+Use a conversational, helpful tone. Be concise but informative. Always maintain context from previous messages.
+Respond to the user's specific query while considering their focus patterns and app usage."""
+
+ACKNOWLEDGEMENT = ("I understand. I'm Focus AI, your productivity and focus assistant. I'll help you "
+                   "improve your work habits based on your session data and app usage patterns.")
+
+# Tokens allowed per request, and how many of the latest exchanges are sent
+# in full while they fit; older ones are only kept in the summary
+TOKEN_BUDGET = 1500
+RECENT_EXCHANGES = 3
+
+# Characters kept from each side of an exchange in the summary
+SUMMARY_USER_CHARS = 100
+SUMMARY_REPLY_CHARS = 120
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text):
+    """Rough token count: one per punctuation mark, one per 4 characters of each word."""
+    return sum(math.ceil(len(piece) / 4) for piece in TOKEN_PATTERN.findall(text))
+
+
+def shorten(text, limit):
+    """First sentence of text, cut to at most limit characters."""
+    text = " ".join(text.replace("*", "").split())
+    sentence = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+    return sentence if len(sentence) <= limit else sentence[:limit - 1].rstrip() + "…"
+
+
+class PromptBuilder:
+    """Assembles Gemini chat requests within a token budget.
+
+    Requests start with the fixed SYSTEM_PROMPT, followed by up to
+    RECENT_EXCHANGES of the latest exchanges in full. The final user message
+    holds the user's data as short "key: value" facts, a one-line-per-exchange
+    summary of everything older, and the question. Each exchange is
+    summarized once, when it first drops out of the recent ones. Recent
+    exchanges move into the summary, and then the oldest summary lines are
+    dropped, until the request fits token_budget.
+    """
+
+    def __init__(self, token_budget=TOKEN_BUDGET, recent_exchanges=RECENT_EXCHANGES):
+        self.token_budget = token_budget
+        self.recent_exchanges = recent_exchanges
+        self.prefix = [
+            {"role": "user", "parts": [{"text": SYSTEM_PROMPT}]},
+            {"role": "model", "parts": [{"text": ACKNOWLEDGEMENT}]},
+        ]
+        self.prefix_tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(ACKNOWLEDGEMENT)
+        self.reset()
+
+    def reset(self):
+        """Forget the summary, for a new conversation."""
+        self.summary = []
+        self.summarized = 0
+
+    def summarize(self, history, count):
+        """Make sure the first count exchanges of history are in the summary."""
+        for exchange in history[self.summarized:count]:
+            self.summary.append(f"- User: {shorten(exchange['user'], SUMMARY_USER_CHARS)} "
+                                f"/ You: {shorten(exchange['assistant'], SUMMARY_REPLY_CHARS)}")
+        self.summarized = max(self.summarized, count)
+
+    def build(self, history, facts, user_text):
+        """Return the contents of a request.
+
+        Args:
+            history: Past exchanges, oldest first, as {"user", "assistant"} dicts
+            facts: Short strings describing the user's current data
+            user_text: The new message
+        """
+        if len(history) < self.summarized:
+            self.reset()  # The history was cleared
+        # Exchanges already in the summary are never sent in full again
+        recent = min(self.recent_exchanges, len(history) - self.summarized)
+        self.summarize(history, len(history) - recent)
+        summary = list(self.summary)
+
+        while True:
+            exchanges = history[len(history) - recent:]
+            message = self.final_message(facts, summary, user_text)
+            tokens = (self.prefix_tokens + estimate_tokens(message)
+                      + sum(estimate_tokens(e['user']) + estimate_tokens(e['assistant']) for e in exchanges))
+            if tokens <= self.token_budget:
+                break
+            if recent > 0:
+                recent -= 1
+                self.summarize(history, len(history) - recent)
+                summary = list(self.summary)
+            elif summary:
+                summary.pop(0)
+            else:
+                break  # Only the facts and the question are left
+
+        contents = list(self.prefix)
+        for exchange in exchanges:
+            contents.append({"role": "user", "parts": [{"text": exchange['user']}]})
+            contents.append({"role": "model", "parts": [{"text": exchange['assistant']}]})
+        contents.append({"role": "user", "parts": [{"text": message}]})
+        return contents
+
+    def final_message(self, facts, summary, user_text):
+        parts = []
+        if facts:
+            parts.append("User data: " + "; ".join(facts))
+        if summary:
+            parts.append("Earlier in this conversation:\n" + "\n".join(summary))
+        parts.append(f"User: {user_text}")
+        return "\n\n".join(parts)
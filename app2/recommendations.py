@@ -0,0 +1,127 @@
+from collections import namedtuple
+
+import numpy as np
+
+from model_registry import models
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Start hours worth recommending; the models would happily suggest 3 AM
+HOURS = np.arange(6, 24)
+
+# How the user has been working lately, the part of each candidate that isn't varied
+UserProfile = namedtuple("UserProfile", ["app_switches_per_min", "focus_score", "productivity"])
+
+Recommendation = namedtuple("Recommendation", ["day", "hour", "length", "task_type", "score"])
+
+
+def format_hour(hour):
+    """Format an hour of the day as e.g. '9:00 AM'."""
+    if hour == 0:
+        return "12:00 AM"
+    elif hour < 12:
+        return f"{hour}:00 AM"
+    elif hour == 12:
+        return "12:00 PM"
+    return f"{hour - 12}:00 PM"
+
+
+class RecommendationEngine:
+    """Ranks every (day, hour, session length, task type) candidate with the trained models.
+
+    The candidates form one grid, built once as a matrix with a row per
+    combination. Each model scores the whole grid with a single
+    predict/predict_proba call:
+
+    - the distraction model fills in the expected distraction minutes,
+    - the day and time models give the probability of a 'High' focus session,
+    - the length model gives the probability that the candidate's length is
+      the one it would recommend.
+
+    A candidate's score is the product of those three probabilities.
+    """
+
+    def __init__(self, registry=models, hours=HOURS):
+        self.day_model = registry.get("best_day")
+        self.time_model = registry.get("best_time")
+        self.length_model = registry.get("best_length")
+        self.distraction_model = registry.get("anomaly")
+
+        self.days = np.arange(len(DAYS))
+        self.hours = np.asarray(hours)
+        self.lengths = np.array(self.length_model.lengths)
+        self.task_types = self.length_model.task_types
+        self.shape = (len(self.days), len(self.hours), len(self.lengths), len(self.task_types))
+
+        # Grid columns: index into days, hours, lengths and task_types
+        grid = np.indices(self.shape).reshape(len(self.shape), -1)
+        self.day_index, self.hour_index, self.length_index, self.task_index = grid
+
+        # Encoded day and task type columns for the models trained on label-encoded data
+        day_names = [name.lower() for name in DAYS]
+        self.length_days = self.length_model.encode_days(day_names)[self.day_index]
+        self.length_tasks = self.length_model.encode_task_types(self.task_types)[self.task_index]
+        self.distraction_days = self.distraction_model.encode_days(day_names)[self.day_index]
+        self.distraction_tasks = self.distraction_model.encode_task_types(self.task_types)[self.task_index]
+
+    def __len__(self):
+        return self.day_index.size
+
+    def score(self, profile):
+        """Score every candidate for a user profile; returns one value per grid row."""
+        hour = self.hours[self.hour_index]
+        length = self.lengths[self.length_index]
+        app_switches = profile.app_switches_per_min * length
+
+        distraction = self.distraction_model.predict(np.column_stack([
+            app_switches, self.distraction_tasks, self.distraction_days, hour, length
+        ]))
+        distraction = np.clip(distraction, 0, length)
+        focus = length - distraction
+        # A session starting now carries full recency weight (1.0)
+        focus_score = np.full(len(self), profile.focus_score)
+        productivity = np.full(len(self), profile.productivity)
+
+        high_day = self.day_model.predict_proba(np.column_stack([
+            self.day_index, app_switches, distraction, focus, focus_score, productivity
+        ]))[:, self.day_model.classes.index("High")]
+
+        high_time = self.time_model.predict_proba(np.column_stack([
+            app_switches, hour, distraction, focus, focus_score, productivity
+        ]))[:, self.time_model.classes.index("High")]
+
+        length_probabilities = self.length_model.predict_proba(np.column_stack([
+            app_switches, distraction, focus_score, productivity, hour,
+            self.length_tasks, self.length_days
+        ]))
+        length_fit = length_probabilities[np.arange(len(self)), self.length_index]
+
+        return high_day * high_time * length_fit
+
+    def recommend(self, profile, top_n=5):
+        """Rank the candidates for a user profile.
+
+        Returns:
+            A dict with the best day, time and session length (each averaged
+            over the other dimensions) in the format get_model_predictions
+            uses, plus the top_n individual candidates as Recommendations.
+        """
+        scores = self.score(profile)
+        grid = scores.reshape(self.shape)
+
+        best_day = DAYS[int(np.argmax(grid.mean(axis=(1, 2, 3))))]
+        best_hour = int(self.hours[np.argmax(grid.mean(axis=(0, 2, 3)))])
+        best_length = int(self.lengths[np.argmax(grid.mean(axis=(0, 1, 3)))])
+
+        top = np.argsort(scores)[::-1][:top_n]
+        ranked = [Recommendation(DAYS[self.day_index[i]], int(self.hours[self.hour_index[i]]),
+                                 int(self.lengths[self.length_index[i]]),
+                                 self.task_types[self.task_index[i]], float(scores[i]))
+                  for i in top]
+
+        return {
+            'best_time': format_hour(best_hour),
+            'best_length': best_length,
+            'best_day': best_day,
+            'ranked': ranked
+        }
@@ -0,0 +1,74 @@
+import hashlib
+import json
+
+# Saved replies are reused for this long, and at most this many are kept per user
+CACHE_TTL_SECONDS = 24 * 60 * 60
+CACHE_MAX_ENTRIES = 200
+
+
+def normalize(text):
+    """Collapse runs of whitespace, so re-indented prompts hash the same."""
+    return " ".join(text.split())
+
+
+class ResponseCache:
+    """Gemini replies saved in the database, so an unchanged request isn't sent twice.
+
+    Keys hash everything that shapes a reply: the model, the request
+    contents with whitespace normalized (prompt template, predictions and
+    statistics included), the generation settings and the caller's state,
+    e.g. the latest session. Entries expire after ttl_seconds; beyond
+    max_entries the least recently used are evicted. invalidate() drops
+    them all, for when a new session makes them stale.
+    """
+
+    def __init__(self, db, user_id, ttl_seconds=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES):
+        self.db = db
+        self.user_id = user_id
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, model, contents, generation_config, state):
+        request = {
+            "model": model,
+            "contents": [
+                {"role": content.get("role"),
+                 "parts": [normalize(part.get("text", "")) for part in content["parts"]]}
+                for content in contents
+            ],
+            "generation_config": generation_config,
+            "state": state,
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key):
+        """Return the saved reply for a key, or None."""
+        response = self.db.get_cached_response(self.user_id, key, self.ttl_seconds)
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    def put(self, key, response):
+        success, message = self.db.save_cached_response(self.user_id, key, response,
+                                                        self.max_entries, self.ttl_seconds)
+        if not success:
+            print(message)
+
+    def invalidate(self):
+        """Drop every saved reply, logging how often they were reused until now."""
+        lookups = self.hits + self.misses
+        if lookups:
+            print(f"Response cache: {self.hits}/{lookups} lookups hit ({self.hit_rate:.0%})")
+        success, message = self.db.clear_cached_responses(self.user_id)
+        if not success:
+            print(message)
+
+    @property
+    def hit_rate(self):
+        """Share of get() calls that found a saved reply."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,297 @@
+import json
+
+import numpy as np
+
+from session_stats import days_from_civil
+
+# A session's weight halves every HALF_LIFE_DAYS
+HALF_LIFE_DAYS = 14.0
+
+# Session lengths are grouped like the length model's classes
+SESSION_LENGTHS = [15, 30, 45, 60, 75, 90]
+
+# The task types offered in the task and Pomodoro forms; anything else counts as "other"
+TASK_TYPES = ["coding", "writing", "studying", "reading", "meeting", "other"]
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Number of groups per dimension; "all" has a single group for overall figures
+DIMENSIONS = {
+    "all": 1,
+    "hour": 24,
+    "day": 7,
+    "length": len(SESSION_LENGTHS),
+    "task_type": len(TASK_TYPES),
+}
+
+# What each group of a dimension stands for
+GROUP_LABELS = {
+    "all": [None],
+    "hour": list(range(24)),
+    "day": DAYS,
+    "length": SESSION_LENGTHS,
+    "task_type": TASK_TYPES,
+}
+
+METRICS = ["focus_score", "productivity", "break_duration", "productive",
+           "app_switches", "duration", "distraction"]
+BREAK = METRICS.index("break_duration")
+
+# A session counts as productive from this productivity %
+PRODUCTIVE_FROM = 75
+
+# Stored weights are relative to a reference day; once they grow past
+# 2 ** MAX_SCALE_EXPONENT every group is rescaled to a newer reference
+MAX_SCALE_EXPONENT = 64
+
+STATE_VERSION = 2
+
+
+def length_group(minutes):
+    """Round a session duration to the nearest of SESSION_LENGTHS."""
+    return min(90, max(15, 15 * round(minutes / 15)))
+
+
+class SessionAggregates:
+    """Recency-weighted running totals of a user's sessions, grouped by hour, day, length and task.
+
+    Each group keeps a weighted count, sum and sum of squares per metric, so
+    means and spreads can be read at any time and a new session is folded in
+    with a constant amount of work. Older sessions count for less: a
+    session's weight halves every HALF_LIFE_DAYS.
+
+    Rather than decaying every total on each update, new sessions are added
+    with a weight that grows over time (2 ** (days since the reference day /
+    half-life)). Means are ratios, so the common factor cancels out;
+    weighted_counts() applies it when actual weights are needed.
+    """
+
+    def __init__(self, half_life_days=HALF_LIFE_DAYS):
+        self.half_life_days = half_life_days
+        self.reference_day = None
+        self.latest_day = None
+        self.last_session_id = 0
+        self.session_count = 0
+        # The latest session's ID, folded-in break duration, weight and group
+        # keys: its break is only recorded once the break is over
+        self.latest_break = None
+        self.counts = {name: np.zeros(size) for name, size in DIMENSIONS.items()}
+        self.sums = {name: np.zeros((size, len(METRICS))) for name, size in DIMENSIONS.items()}
+        self.squares = {name: np.zeros((size, len(METRICS))) for name, size in DIMENSIONS.items()}
+
+    def __len__(self):
+        return self.session_count
+
+    def add(self, session):
+        """Fold in one completed session tuple (as returned by Database.get_user_sessions).
+
+        Returns:
+            True if the session was used, False if it was incomplete
+        """
+        (session_id, date, day, start_time, end_time, task_type, app_switch_count,
+         distraction_duration, total_focus_duration, focus_score, productivity_percentage,
+         break_duration) = session
+        self.last_session_id = max(self.last_session_id, session_id)
+        self.latest_break = None
+
+        try:
+            year, month, day_of_month = (int(part) for part in date.split("-"))
+            hour = int(start_time.split(":")[0]) % 24
+        except (AttributeError, ValueError):
+            return False
+        if None in (total_focus_duration, focus_score, productivity_percentage):
+            return False
+
+        day_number = int(days_from_civil(year, month, day_of_month))
+        distraction = distraction_duration or 0
+        duration = total_focus_duration + distraction
+        length = length_group(duration)
+        task_type = task_type.lower() if isinstance(task_type, str) else "other"
+
+        keys = {
+            "all": 0,
+            "hour": hour,
+            "day": (day_number + 3) % 7,  # 1970-01-01 was a Thursday
+            "length": SESSION_LENGTHS.index(length),
+            "task_type": TASK_TYPES.index(task_type) if task_type in TASK_TYPES else TASK_TYPES.index("other"),
+        }
+        values = np.array([
+            focus_score, productivity_percentage, break_duration or 0,
+            productivity_percentage >= PRODUCTIVE_FROM, app_switch_count or 0, duration, distraction
+        ], dtype=np.float64)
+
+        weight = self.weight(day_number + hour / 24)
+        for name, key in keys.items():
+            self.counts[name][key] += weight
+            self.sums[name][key] += weight * values
+            self.squares[name][key] += weight * values * values
+
+        self.latest_day = day_number if self.latest_day is None else max(self.latest_day, day_number)
+        self.session_count += 1
+        self.latest_break = [session_id, float(values[BREAK]), weight, keys]
+        return True
+
+    def correct_break(self, break_duration):
+        """Replace the latest session's break duration with the one recorded after the break.
+
+        Returns:
+            True if it changed
+        """
+        session_id, folded, weight, keys = self.latest_break
+        break_duration = float(break_duration or 0)
+        if break_duration == folded:
+            return False
+        for name, key in keys.items():
+            self.sums[name][key, BREAK] += weight * (break_duration - folded)
+            self.squares[name][key, BREAK] += weight * (break_duration ** 2 - folded ** 2)
+        self.latest_break[1] = break_duration
+        return True
+
+    def weight(self, day):
+        """Stored weight of a session on a (fractional) day number."""
+        if self.reference_day is None:
+            self.reference_day = np.floor(day)
+        exponent = (day - self.reference_day) / self.half_life_days
+        if exponent > MAX_SCALE_EXPONENT:
+            self.rebase(np.floor(day))
+            exponent = (day - self.reference_day) / self.half_life_days
+        return 2.0 ** exponent
+
+    def rebase(self, reference_day):
+        """Rescale every total to a new reference day."""
+        factor = 2.0 ** -((reference_day - self.reference_day) / self.half_life_days)
+        for name in DIMENSIONS:
+            self.counts[name] *= factor
+            self.sums[name] *= factor
+            self.squares[name] *= factor
+        if self.latest_break is not None:
+            self.latest_break[2] *= factor
+        self.reference_day = reference_day
+
+    def weighted_counts(self, dimension, day=None):
+        """Decayed number of sessions per group as of a day number (default: the latest session)."""
+        if self.reference_day is None:
+            return np.zeros(DIMENSIONS[dimension])
+        day = self.latest_day if day is None else day
+        return self.counts[dimension] * 2.0 ** -((day - self.reference_day) / self.half_life_days)
+
+    def mean(self, dimension, metric):
+        """Recency-weighted mean of a metric per group (NaN for groups without sessions)."""
+        column = METRICS.index(metric)
+        counts = self.counts[dimension]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, self.sums[dimension][:, column] / counts, np.nan)
+
+    def std(self, dimension, metric):
+        """Recency-weighted standard deviation of a metric per group."""
+        column = METRICS.index(metric)
+        counts = self.counts[dimension]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_square = np.where(counts > 0, self.squares[dimension][:, column] / counts, np.nan)
+        return np.sqrt(np.maximum(mean_square - self.mean(dimension, metric) ** 2, 0))
+
+    def overall(self, metric):
+        """Recency-weighted mean of a metric over all sessions."""
+        return float(self.mean("all", metric)[0])
+
+    def highest(self, dimension, metric, min_count=0):
+        """(group label, mean) of the group with the highest mean of a metric, or None.
+
+        Groups whose decayed session count is below min_count are left out.
+        """
+        return self.top_group(dimension, self.mean(dimension, metric), min_count)
+
+    def best_group(self, dimension):
+        """Label of the group with the highest mean focus score x productivity, or None."""
+        scores = self.mean(dimension, "focus_score") * self.mean(dimension, "productivity")
+        best = self.top_group(dimension, scores)
+        return best[0] if best else None
+
+    def top_group(self, dimension, values, min_count=0):
+        values = np.where(self.weighted_counts(dimension) >= min_count, values, np.nan)
+        if np.all(np.isnan(values)):
+            return None
+        index = int(np.nanargmax(values))
+        return GROUP_LABELS[dimension][index], float(values[index])
+
+    def best_day(self):
+        return self.best_group("day")
+
+    def best_hour(self):
+        return self.best_group("hour")
+
+    def best_length(self):
+        return self.best_group("length")
+
+    def app_switches_per_min(self):
+        """Recency-weighted app switches per minute of session time."""
+        duration = self.sums["all"][0, METRICS.index("duration")]
+        if duration <= 0:
+            return 0.0
+        return float(self.sums["all"][0, METRICS.index("app_switches")] / duration)
+
+    def catch_up(self, db, user_id):
+        """Fold in every session finished since the last one seen.
+
+        The latest session is read again as well, to pick up the break
+        duration recorded once its break ended.
+
+        Returns:
+            The new sessions, oldest first, and whether the latest session's break changed
+        """
+        after = self.last_session_id
+        if self.latest_break is not None:
+            after = min(after, self.latest_break[0] - 1)
+        sessions = db.get_completed_sessions_after(user_id, after)
+        if sessions and self.latest_break is not None and sessions[0][0] == self.latest_break[0]:
+            break_changed = self.correct_break(sessions[0][11])
+            sessions = sessions[1:]
+        else:
+            break_changed = False
+        for session in sessions:
+            self.add(session)
+        return sessions, break_changed
+
+    def to_json(self):
+        return json.dumps({
+            "version": STATE_VERSION,
+            "half_life_days": self.half_life_days,
+            "reference_day": self.reference_day,
+            "latest_day": self.latest_day,
+            "last_session_id": self.last_session_id,
+            "session_count": self.session_count,
+            "latest_break": self.latest_break,
+            "counts": {name: values.tolist() for name, values in self.counts.items()},
+            "sums": {name: values.tolist() for name, values in self.sums.items()},
+            "squares": {name: values.tolist() for name, values in self.squares.items()},
+        })
+
+    @classmethod
+    def from_json(cls, text):
+        """Restore saved aggregates; returns None if they were saved in another layout."""
+        state = json.loads(text)
+        if state.get("version") != STATE_VERSION:
+            return None
+        aggregates = cls(state["half_life_days"])
+        aggregates.reference_day = state["reference_day"]
+        aggregates.latest_day = state["latest_day"]
+        aggregates.last_session_id = state["last_session_id"]
+        aggregates.session_count = state["session_count"]
+        aggregates.latest_break = state["latest_break"]
+        for name, size in DIMENSIONS.items():
+            aggregates.counts[name] = np.array(state["counts"][name])
+            aggregates.sums[name] = np.array(state["sums"][name]).reshape(size, len(METRICS))
+            aggregates.squares[name] = np.array(state["squares"][name]).reshape(size, len(METRICS))
+        return aggregates
+
+
+def load_user_aggregates(db, user_id):
+    """A user's saved aggregates, brought up to date with any sessions finished since."""
+    state = db.get_user_aggregates(user_id)
+    aggregates = SessionAggregates.from_json(state) if state else None
+    if aggregates is None:
+        aggregates = SessionAggregates()
+    sessions, break_changed = aggregates.catch_up(db, user_id)
+    if sessions or break_changed:
+        db.save_user_aggregates(user_id, aggregates.to_json())
+    return aggregates
@@ -0,0 +1,239 @@
+from collections import namedtuple
+
+import numpy as np
+
+TrendLevel = namedtuple("TrendLevel", ["x", "mean", "low", "high"])
+
+
+class SessionColumns:
+    """Focus session data held as typed NumPy columns for chart aggregations.
+
+    Dates and start times are parsed once, when the columns are built, and every
+    chart grouping is then a single np.bincount over an integer key column.
+    Missing or unparseable values are stored as -1 (integer keys) or NaN (numbers).
+    """
+
+    def __init__(self, year, month, day, hour, focus_score, focus_duration, distraction_duration):
+        self.year = year
+        self.month = month
+        self.day = day
+        self.hour = hour
+        self.focus_score = focus_score
+        self.focus_duration = focus_duration
+        self.distraction_duration = distraction_duration
+
+    def __len__(self):
+        return len(self.focus_score)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build the columns from (date, start_time, focus_score, focus_duration,
+        distraction_duration) tuples, as returned by Database.get_session_metrics."""
+        if not rows:
+            empty_int = np.empty(0, dtype=np.int16)
+            empty_float = np.empty(0, dtype=np.float64)
+            return cls(empty_int, empty_int, empty_int, empty_int,
+                       empty_float, empty_float, empty_float)
+
+        # One pass per column; zip(*rows) is several times slower for large snapshots
+        dates = [row[0] for row in rows]
+        start_times = [row[1] for row in rows]
+        scores = [row[2] for row in rows]
+        focus = [row[3] for row in rows]
+        distraction = [row[4] for row in rows]
+
+        year, month, day = parse_dates(dates)
+        hour = parse_hours(start_times)
+
+        return cls(
+            year, month, day, hour,
+            to_float_column(scores),
+            to_float_column(focus),
+            to_float_column(distraction)
+        )
+
+    def mean_score_by(self, key, size):
+        """Average focus score grouped by an integer key column.
+
+        Args:
+            key: Integer array with values in [0, size), or -1 to skip the row
+            size: Number of possible key values
+
+        Returns:
+            A tuple (keys, means) for the buckets that have at least one session
+        """
+        valid = (key >= 0) & ~np.isnan(self.focus_score)
+        keys = key[valid]
+        counts = np.bincount(keys, minlength=size)
+        totals = np.bincount(keys, weights=self.focus_score[valid], minlength=size)
+        present = np.flatnonzero(counts)
+        return present, totals[present] / counts[present]
+
+    def mean_score_by_hour(self):
+        """Average focus score for each hour of the day (0-23)."""
+        return self.mean_score_by(self.hour, 24)
+
+    def mean_score_by_day_of_month(self):
+        """Average focus score for each day of the month (1-31)."""
+        return self.mean_score_by(self.day, 32)
+
+    def mean_score_by_month(self):
+        """Average focus score for each month of the year (1-12)."""
+        return self.mean_score_by(self.month, 13)
+
+    def mean_score_by_weekday(self):
+        """Average focus score for each day of the week (0 = Monday)."""
+        days = self.day_numbers()
+        weekday = np.where(self.year >= 0, (days + 3) % 7, -1)
+        return self.mean_score_by(weekday, 7)
+
+    def mean_score_by_date(self):
+        """Average focus score for each calendar date.
+
+        Returns:
+            A tuple (dates, means) with dates as sorted "YYYY-MM-DD" strings
+        """
+        date_key = self.date_keys()
+        valid = (date_key >= 0) & ~np.isnan(self.focus_score)
+        if not valid.any():
+            return [], np.empty(0)
+
+        # YYYYMMDD keys span at most ~10,000 values per year, so bincount
+        # over the offset from the earliest date beats sorting with np.unique
+        keys = date_key[valid]
+        first = keys.min()
+        counts = np.bincount(keys - first)
+        totals = np.bincount(keys - first, weights=self.focus_score[valid])
+        present = np.flatnonzero(counts)
+        labels = [f"{d // 10000:04d}-{d // 100 % 100:02d}-{d % 100:02d}" for d in (present + first).tolist()]
+        return labels, totals[present] / counts[present]
+
+    def date_keys(self):
+        """Dates as sortable YYYYMMDD integers, or -1 where the date is missing."""
+        keys = (self.year.astype(np.int32) * 10000
+                + self.month.astype(np.int32) * 100
+                + self.day.astype(np.int32))
+        keys[self.year < 0] = -1
+        return keys
+
+    def day_numbers(self):
+        """Days since 1970-01-01 for each session (only meaningful where year >= 0)."""
+        return days_from_civil(self.year, self.month, self.day)
+
+    def score_trend(self):
+        """Focus score per date, week and month for the trend chart.
+
+        Returns:
+            A dict mapping "daily", "weekly" and "monthly" to TrendLevel tuples.
+            x holds day numbers (the middle of the week or month for coarser
+            levels); low and high are the lowest and highest daily averages.
+        """
+        valid = (self.year >= 0) & ~np.isnan(self.focus_score)
+        days = self.day_numbers()[valid]
+        if not len(days):
+            empty = TrendLevel(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0), np.empty(0))
+            return {"daily": empty, "weekly": empty, "monthly": empty}
+
+        first = days.min()
+        counts = np.bincount(days - first)
+        totals = np.bincount(days - first, weights=self.focus_score[valid])
+        present = np.flatnonzero(counts)
+        month_of_day = np.zeros(len(counts), dtype=np.int64)
+        month_of_day[days - first] = self.year[valid].astype(np.int64) * 12 + self.month[valid] - 1
+
+        x = present + first
+        counts, totals = counts[present], totals[present]
+        means = totals / counts
+
+        # Weeks start on Monday; day 0 (1970-01-01) was a Thursday
+        week = (x + 3) // 7
+        month = month_of_day[present]
+        return {
+            "daily": TrendLevel(x, means, means, means),
+            "weekly": reduce_trend(week, week * 7, counts, totals, means),
+            "monthly": reduce_trend(month, days_from_civil(month // 12, month % 12 + 1, 15),
+                                    counts, totals, means),
+        }
+
+    def total_focus_and_distraction(self):
+        """Total focus and distraction minutes over all sessions."""
+        return float(np.nansum(self.focus_duration)), float(np.nansum(self.distraction_duration))
+
+    def has_focus_and_distraction(self):
+        """True if at least one session recorded each duration."""
+        return bool((~np.isnan(self.focus_duration)).any() and (~np.isnan(self.distraction_duration)).any())
+
+
+def days_from_civil(year, month, day):
+    """Vectorised proleptic Gregorian date to days since 1970-01-01."""
+    year = np.asarray(year, dtype=np.int64) - (np.asarray(month) <= 2)
+    month = np.asarray(month, dtype=np.int64)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + np.asarray(day, dtype=np.int64) - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def reduce_trend(group, x, counts, totals, means):
+    """Merge consecutive daily values that share a group key into one TrendLevel point."""
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(group)) + 1))
+    return TrendLevel(
+        x[starts],
+        np.add.reduceat(totals, starts) / np.add.reduceat(counts, starts),
+        np.minimum.reduceat(means, starts),
+        np.maximum.reduceat(means, starts),
+    )
+
+
+def to_float_column(values):
+    """Convert a sequence of numbers (with None for missing) to a float64 array."""
+    return np.array(values, dtype=np.float64)
+
+
+def digits(chars, start, count):
+    """Read count ASCII digits starting at column start of a uint8 character matrix.
+
+    Returns the parsed integers, with -1 where any character is not a digit.
+    """
+    values = chars[:, start:start + count].astype(np.int16) - ord('0')
+    bad = ((values < 0) | (values > 9)).any(axis=1)
+    result = np.zeros(len(chars), dtype=np.int16)
+    for i in range(count):
+        result = result * 10 + values[:, i]
+    result[bad] = -1
+    return result
+
+
+def char_matrix(strings, width):
+    """Pack strings into an (n, width) uint8 matrix, padding short values with zeros."""
+    # None becomes b"None", which fails the digit checks like any other bad value
+    packed = np.array(strings, dtype=f"S{width}")
+    return packed.view(np.uint8).reshape(len(packed), width)
+
+
+def parse_dates(dates):
+    """Parse "YYYY-MM-DD" strings into year, month and day arrays (-1 if invalid)."""
+    chars = char_matrix(dates, 10)
+    year = digits(chars, 0, 4)
+    month = digits(chars, 5, 2)
+    day = digits(chars, 8, 2)
+
+    invalid = ((year < 0) | (month < 1) | (month > 12) | (day < 1) | (day > 31)
+               | (chars[:, 4] != ord('-')) | (chars[:, 7] != ord('-')))
+    year[invalid] = -1
+    month[invalid] = -1
+    day[invalid] = -1
+    return year, month, day
+
+
+def parse_hours(times):
+    """Parse the hour from "HH:MM[:SS]" or "H:MM" strings (-1 if invalid)."""
+    chars = char_matrix(times, 3)
+    two_digit = digits(chars, 0, 2)
+    one_digit = digits(chars, 0, 1)
+
+    hour = np.where(chars[:, 2] == ord(':'), two_digit, -1)
+    hour = np.where(chars[:, 1] == ord(':'), one_digit, hour).astype(np.int16)
+    hour[hour > 23] = -1
+    return hour
@@ -0,0 +1,320 @@
+import matplotlib.dates as mdates
+import numpy as np
+from session_stats import SessionColumns
+
+# Dark theme colors shared by every chart
+BACKGROUND_COLOR = '#2d2d2d'
+TEXT_COLOR = 'white'
+GRID_COLOR = '#888888'
+BAR_COLOR = '#3daee9'
+
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+               "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def style_axes(ax):
+    """Apply the dark theme to a set of axes."""
+    ax.set_facecolor(BACKGROUND_COLOR)
+    ax.tick_params(colors=TEXT_COLOR, which='both')
+    ax.xaxis.label.set_color(TEXT_COLOR)
+    ax.yaxis.label.set_color(TEXT_COLOR)
+    ax.title.set_color(TEXT_COLOR)
+    ax.grid(True, linestyle='--', alpha=0.3, color=GRID_COLOR)
+
+
+class Chart:
+    """A chart on its own axes, built once and then updated in place."""
+
+    def __init__(self, figure, name, title, xlabel="", ylabel="", empty_text="No data available"):
+        self.ax = figure.add_subplot(111, label=name)
+        self.empty_text = empty_text
+        style_axes(self.ax)
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.message = self.ax.text(0.5, 0.5, "", horizontalalignment='center',
+                                    verticalalignment='center', transform=self.ax.transAxes,
+                                    color=TEXT_COLOR, fontsize=14, visible=False)
+
+    @property
+    def artists(self):
+        """Data artists that move when the chart is panned or zoomed."""
+        return []
+
+    def view_changed(self):
+        """Called after the visible range or the size of the axes changes."""
+
+    def show_message(self, text):
+        """Hide the data and show a message in the middle of the axes."""
+        for artist in self.artists:
+            artist.set_visible(False)
+        self.message.set_text(text)
+        self.message.set_visible(True)
+
+    def update(self, sessions):
+        """Update the chart from a SessionColumns snapshot."""
+        raise NotImplementedError
+
+
+class BarChart(Chart):
+    """Average focus score per bucket, with one bar and value label per possible bucket."""
+
+    def __init__(self, figure, name, title, xlabel, ylabel, empty_text,
+                 buckets, aggregate, tick_label=None):
+        super().__init__(figure, name, title, xlabel, ylabel, empty_text)
+        self.buckets = np.asarray(buckets)
+        self.aggregate = aggregate
+        self.tick_label = tick_label
+        self.bars = list(self.ax.bar(self.buckets, np.zeros(len(self.buckets)), color=BAR_COLOR, width=0.7))
+        self.labels = [self.ax.text(x, 0, "", ha='center', va='bottom', color=TEXT_COLOR, clip_on=True)
+                       for x in self.buckets]
+
+    @property
+    def artists(self):
+        return self.bars + self.labels
+
+    def update(self, sessions):
+        keys, means = self.aggregate(sessions)
+        if not len(keys):
+            self.show_message(self.empty_text)
+            return
+        self.message.set_visible(False)
+
+        slots = np.searchsorted(self.buckets, keys)
+        heights = np.zeros(len(self.buckets))
+        heights[slots] = means
+        shown = np.zeros(len(self.buckets), dtype=bool)
+        shown[slots] = True
+
+        for bar, label, height, visible in zip(self.bars, self.labels, heights.tolist(), shown.tolist()):
+            bar.set_height(height)
+            bar.set_visible(visible)
+            label.set_position((bar.get_x() + bar.get_width() / 2., height + 0.1))
+            label.set_text(f'{height:.1f}')
+            label.set_visible(visible)
+
+        self.ax.set_xticks(keys)
+        if self.tick_label:
+            self.ax.set_xticklabels([self.tick_label(k) for k in keys.tolist()])
+        self.ax.set_xlim(keys[0] - 0.6, keys[-1] + 0.6)
+        self.ax.set_ylim(0, means.max() * 1.1 + 0.5)
+
+
+class PieChart(Chart):
+    """Total focus time against total distraction time."""
+
+    def __init__(self, figure, name):
+        super().__init__(figure, name, 'Focus vs. Distraction Time Distribution',
+                         empty_text="No data available for pie chart")
+        self.pie_artists = []
+
+    @property
+    def artists(self):
+        return self.pie_artists
+
+    def update(self, sessions):
+        # A pie only has two wedges, so it is cheaper to rebuild them than to reshape them
+        for artist in self.pie_artists:
+            artist.remove()
+        self.pie_artists = []
+
+        if not sessions.has_focus_and_distraction():
+            self.show_message(self.empty_text)
+            return
+        self.message.set_visible(False)
+
+        wedges, texts, autotexts = self.ax.pie(
+            list(sessions.total_focus_and_distraction()),
+            labels=['Focus Time', 'Distraction Time'], colors=['#66b3ff', '#ff9999'],
+            autopct='%1.1f%%', shadow=False, startangle=90
+        )
+        for text in texts + autotexts:
+            text.set_color(TEXT_COLOR)
+            text.set_fontweight('bold')
+        self.ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+        self.pie_artists = list(wedges) + texts + autotexts
+
+
+class TrendChart(Chart):
+    """Focus score over time, drawn at a level of detail that fits the visible range.
+
+    Daily, weekly and monthly averages are computed once per snapshot. Each
+    time the view changes, the finest level with at most one point per
+    PIXELS_PER_POINT pixels in the visible range is used, and min/max
+    decimation caps the point count if even monthly data is too dense. The
+    number of points drawn therefore depends on the chart width, not on the
+    length of the history.
+    """
+
+    TITLE = 'Focus Score Trend Over Days'
+    LEVELS = ["daily", "weekly", "monthly"]
+    PIXELS_PER_POINT = 3
+    # Markers and value labels are only drawn when the points are far enough apart
+    PIXELS_PER_MARKER = 12
+    MAX_POINT_LABELS = 60
+
+    def __init__(self, figure, name):
+        super().__init__(figure, name, self.TITLE, 'Date', 'Average Focus Score (0-10)',
+                         "No data available for focus score trend")
+        self.line, = self.ax.plot([], [], 'o-', color=BAR_COLOR, linewidth=2, markersize=8)
+        self.labels = []
+        self.sessions = None
+        self.levels = None
+
+        locator = mdates.AutoDateLocator()
+        self.ax.xaxis.set_major_locator(locator)
+        self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        self.ax.xaxis.get_offset_text().set_color(TEXT_COLOR)
+
+    @property
+    def artists(self):
+        return [self.line] + self.labels
+
+    def update(self, sessions):
+        if sessions is not self.sessions:
+            # Day numbers become Matplotlib date numbers once, when the snapshot changes
+            epoch = mdates.date2num(np.datetime64('1970-01-01'))
+            self.levels = {name: level._replace(x=level.x + epoch)
+                           for name, level in sessions.score_trend().items()}
+            self.sessions = sessions
+
+        daily = self.levels["daily"]
+        if not len(daily.x):
+            self.show_message(self.empty_text)
+            return
+        self.message.set_visible(False)
+        self.line.set_visible(True)
+
+        padding = max(1.0, (daily.x[-1] - daily.x[0]) * 0.02)
+        self.ax.set_xlim(daily.x[0] - padding, daily.x[-1] + padding)
+        self.ax.set_ylim(daily.mean.min() - 0.5, daily.mean.max() + 0.5)
+        self.view_changed()
+
+    def view_changed(self):
+        if self.levels is None or not len(self.levels["daily"].x):
+            return
+        x_min, x_max = self.ax.get_xlim()
+        width = max(self.ax.bbox.width, 1)
+        max_points = max(2, int(width / self.PIXELS_PER_POINT))
+
+        for name in self.LEVELS:
+            level = self.levels[name]
+            # Keep one point beyond each edge so the line runs off the axes
+            first = max(np.searchsorted(level.x, x_min) - 1, 0)
+            last = np.searchsorted(level.x, x_max, side='right') + 1
+            if last - first <= max_points:
+                break
+        x, y = minmax_decimate(level.x[first:last], level.mean[first:last], max_points)
+
+        self.line.set_data(x, y)
+        sparse = len(x) <= width / self.PIXELS_PER_MARKER
+        self.line.set_marker('o' if sparse else '')
+        self.set_point_labels(x, y if sparse and len(x) <= self.MAX_POINT_LABELS else [])
+        self.ax.set_title(self.TITLE if name == "daily" else f"{self.TITLE} ({name} averages)")
+
+    def set_point_labels(self, x, scores):
+        """Reuse the pooled value labels, adding or hiding labels as needed."""
+        while len(self.labels) < len(scores):
+            self.labels.append(self.ax.text(0, 0, "", ha='center', va='bottom', color=TEXT_COLOR,
+                                            clip_on=True, animated=self.line.get_animated()))
+        for i, label in enumerate(self.labels):
+            if i < len(scores):
+                label.set_position((x[i], scores[i] + 0.1))
+                label.set_text(f'{scores[i]:.1f}')
+                label.set_visible(True)
+            else:
+                label.set_visible(False)
+
+
+def minmax_decimate(x, y, max_points):
+    """Reduce a series to at most max_points points, keeping each bucket's extremes.
+
+    The series is split into max_points // 2 buckets of consecutive points and
+    only the lowest and highest point of each bucket are kept, in x order, so
+    spikes survive where averaging or plain striding would hide them.
+    """
+    count = len(x)
+    if count <= max_points:
+        return x, y
+    size = -(-count // (max_points // 2))
+    full = count - count % size
+    blocks = y[:full].reshape(-1, size)
+    offsets = np.arange(0, full, size)
+    keep = [offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1)]
+    if full < count:
+        keep.append([full + y[full:].argmin(), full + y[full:].argmax()])
+    index = np.unique(np.concatenate(keep))
+    return x[index], y[index]
+
+
+def hour_label(hour):
+    return f"{hour}:00"
+
+
+# Chart factories keyed by (chart type, time period); the period is None for
+# charts that do not depend on it
+CHARTS = {
+    ("Focus Score vs Time", "Day"): lambda figure, name: BarChart(
+        figure, name, 'Focus Score vs Time (Day)', 'Hour of Day', 'Focus Score (0-10)',
+        "No data available for focus score by hour",
+        range(24), SessionColumns.mean_score_by_hour, hour_label),
+    ("Focus Score vs Time", "Week"): lambda figure, name: BarChart(
+        figure, name, 'Average Focus Score by Day (Week)', 'Day of Week', 'Average Focus Score (0-10)',
+        "No data available for focus score by weekday",
+        range(7), SessionColumns.mean_score_by_weekday, WEEKDAY_NAMES.__getitem__),
+    ("Focus Score vs Time", "Month"): lambda figure, name: BarChart(
+        figure, name, 'Average Focus Score by Day (Month)', 'Day of Month', 'Average Focus Score (0-10)',
+        "No data available for focus score by day",
+        range(1, 32), SessionColumns.mean_score_by_day_of_month),
+    ("Focus Score vs Time", "Year"): lambda figure, name: BarChart(
+        figure, name, 'Average Focus Score by Month (Year)', 'Month', 'Average Focus Score (0-10)',
+        "No data available for focus score by month",
+        range(1, 13), SessionColumns.mean_score_by_month, lambda m: MONTH_NAMES[m - 1]),
+    ("Focus vs. Distraction Time", None): PieChart,
+    ("Productivity by Time of Day", None): lambda figure, name: BarChart(
+        figure, name, 'Productivity by Time of Day', 'Hour of Day', 'Average Focus Score (0-10)',
+        "No data available for productivity by time of day",
+        range(24), SessionColumns.mean_score_by_hour, hour_label),
+    ("Focus Score Trend Over Days", None): TrendChart,
+}
+
+
+class ChartRenderer:
+    """Draws the Statistics charts onto one figure.
+
+    Each chart gets its own axes and artists the first time it is shown; after
+    that, switching charts only toggles axes visibility and updates bar heights,
+    line data and labels in place instead of clearing and restyling the figure.
+    """
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.figure.patch.set_facecolor(BACKGROUND_COLOR)
+        self.charts = {}
+        self.current = None
+
+    @staticmethod
+    def chart_key(chart_type, period):
+        """Key of the chart shown for a chart type and time period."""
+        if (chart_type, period) in CHARTS:
+            return chart_type, period
+        return chart_type, None
+
+    def render(self, chart_type, period, sessions):
+        """Show the chart for chart_type/period using a SessionColumns snapshot."""
+        key = self.chart_key(chart_type, period)
+        chart = self.charts.get(key)
+        if chart is None:
+            chart = CHARTS[key](self.figure, "/".join(str(part) for part in key))
+            self.charts[key] = chart
+
+        for other in self.charts.values():
+            other.ax.set_visible(other is chart)
+
+        if len(sessions) == 0:
+            chart.show_message("No data available")
+        else:
+            chart.update(sessions)
+        self.current = chart
+        return chart
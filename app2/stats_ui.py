@@ -1,16 +1,158 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem,
-                             QHeaderView, QGroupBox, QComboBox)
-from PyQt5.QtCore import Qt
+                             QPushButton, QTableView, QHeaderView, QGroupBox, QComboBox)
+from PyQt5.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex, QVariant
 from PyQt5.QtGui import QFont, QColor
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from collections import OrderedDict
 from matplotlib.figure import Figure
-import numpy as np
-from datetime import datetime, timedelta
-import pandas as pd 
-import pickle
-focus_data = pd.read_csv('finalised/dataset/focus_data.csv')
+from session_stats import SessionColumns
+from stats_charts import ChartRenderer
+from chart_images import RENDER_LOCK, ChartImageCache, ImageFigureCanvas
+
+
+class SessionTableModel(QAbstractTableModel):
+    """Table model over a user's full session history.
+    
+    Rows are read from the database a page at a time as the view scrolls to
+    them, and only the most recently used pages are kept in memory. Pages
+    survive refreshes until the sessions change. Colors and fonts come from
+    one shared palette instead of being created per cell.
+    """
+    
+    HEADERS = [
+        "Session ID", "Date", "Day", "Start Time", "End Time", 
+        "Task Type", "App Switches", "Distraction (min)", 
+        "Focus (min)", "Focus Score", "Productivity %", "Break (min)"
+    ]
+    FOCUS_SCORE_COLUMN = 9
+    PRODUCTIVITY_COLUMN = 10
+    BREAK_COLUMN = 11
+    
+    PAGE_SIZE = 200
+    MAX_CACHED_PAGES = 10
+    
+    # Shared palette, created on first use (QFont needs a running QApplication)
+    palette = None
+    
+    def __init__(self, db, user_id, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.user_id = user_id
+        self.row_count = 0
+        self.pages = OrderedDict()  # page number -> list of session tuples
+        
+        if SessionTableModel.palette is None:
+            SessionTableModel.palette = {
+                "good": QColor(100, 255, 100),      # Brighter green
+                "medium": QColor(255, 255, 100),    # Brighter yellow
+                "bad": QColor(255, 100, 100),       # Brighter red
+                "on_color": QColor(0, 0, 0),        # Black text on colored cells
+                "missing": QColor(255, 255, 255),   # White text for N/A
+                "break": QColor(0, 120, 215),       # Microsoft blue
+                "no_break": QColor(128, 128, 128),  # Gray
+                "bold": QFont("Arial", 9, QFont.Bold),
+            }
+    
+    def refresh(self, row_count):
+        """Drop cached pages and set the number of sessions."""
+        self.beginResetModel()
+        self.pages.clear()
+        self.row_count = row_count
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return QVariant()
+    
+    def session_at(self, row):
+        """Return the session tuple for a row, loading its page if needed."""
+        page_number = row // self.PAGE_SIZE
+        page = self.pages.get(page_number)
+        if page is None:
+            page = self.db.get_user_sessions(
+                self.user_id,
+                limit=self.PAGE_SIZE,
+                offset=page_number * self.PAGE_SIZE
+            )
+            self.pages[page_number] = page
+            if len(self.pages) > self.MAX_CACHED_PAGES:
+                self.pages.popitem(last=False)  # Forget the least recently used page
+        else:
+            self.pages.move_to_end(page_number)
+        
+        index = row % self.PAGE_SIZE
+        return page[index] if index < len(page) else None
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        
+        session = self.session_at(index.row())
+        if session is None:
+            return QVariant()
+        
+        column = index.column()
+        value = session[column]
+        
+        if role == Qt.DisplayRole:
+            return self.display_text(column, value)
+        if role == Qt.BackgroundRole:
+            return self.background_color(column, value)
+        if role == Qt.ForegroundRole:
+            return self.text_color(column, value)
+        if role == Qt.FontRole:
+            if column in (self.FOCUS_SCORE_COLUMN, self.PRODUCTIVITY_COLUMN):
+                return self.palette["bold"]
+            if column == self.BREAK_COLUMN and value:
+                return self.palette["bold"]
+        return QVariant()
+    
+    def display_text(self, column, value):
+        """Format a cell value for display."""
+        if column in (1, 2, 3):
+            return value
+        if column in (4, 5):
+            return value or "N/A"
+        if column in (7, 8):
+            return f"{value:.1f}" if value is not None else "N/A"
+        if column == self.FOCUS_SCORE_COLUMN:
+            return str(value) if value is not None else "N/A"
+        if column == self.PRODUCTIVITY_COLUMN:
+            return f"{value:.1f}%" if value is not None else "N/A"
+        if column == self.BREAK_COLUMN:
+            return str(value) if value else "0"
+        return str(value)
+    
+    def background_color(self, column, value):
+        """Color-code focus score and productivity cells."""
+        if value is None:
+            return QVariant()
+        if column == self.FOCUS_SCORE_COLUMN:
+            good, medium = 8, 5
+        elif column == self.PRODUCTIVITY_COLUMN:
+            good, medium = 80, 50
+        else:
+            return QVariant()
+        
+        if value >= good:
+            return self.palette["good"]
+        elif value >= medium:
+            return self.palette["medium"]
+        return self.palette["bad"]
+    
+    def text_color(self, column, value):
+        """Pick a readable text color for the colored columns."""
+        if column in (self.FOCUS_SCORE_COLUMN, self.PRODUCTIVITY_COLUMN):
+            return self.palette["on_color"] if value is not None else self.palette["missing"]
+        if column == self.BREAK_COLUMN:
+            return self.palette["break"] if value else self.palette["no_break"]
+        return QVariant()
 
 
 class StatsWidget(QWidget):
@@ -18,6 +160,13 @@ class StatsWidget(QWidget):
         super().__init__()
         self.db = db
         self.user_id = user_id
+        # Chart columns shared by every chart, re-read only when sessions change
+        self.sessions_snapshot = None
+        self.snapshot_version = None
+        # Bumped whenever the snapshot is rebuilt; part of every cached chart image key
+        self.snapshot_generation = 0
+        # Snapshot generation the table's row count and cached pages belong to
+        self.table_generation = None
         self.init_ui()
         
     def init_ui(self):
@@ -32,17 +181,16 @@ class StatsWidget(QWidget):
         main_layout.addWidget(title_label)
         
         # Session history table
-        history_group = QGroupBox("Recent Sessions")
+        history_group = QGroupBox("Session History")
         history_layout = QVBoxLayout()
         
-        self.session_table = QTableWidget()
-        self.session_table.setColumnCount(12)
-        self.session_table.setHorizontalHeaderLabels([
-            "Session ID", "Date", "Day", "Start Time", "End Time", 
-            "Task Type", "App Switches", "Distraction (min)", 
-            "Focus (min)", "Focus Score", "Productivity %", "Break (min)"
-        ])
+        self.session_model = SessionTableModel(self.db, self.user_id, self)
+        self.session_table = QTableView()
+        self.session_table.setModel(self.session_model)
         self.session_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Fixed row heights so the view never has to measure every row
+        self.session_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.session_table.verticalHeader().setVisible(False)
         history_layout.addWidget(self.session_table)
         
         history_group.setLayout(history_layout)
@@ -82,7 +230,7 @@ class StatsWidget(QWidget):
         
         # Chart canvas with custom event handling
         self.figure = Figure(figsize=(8, 4), dpi=100)
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = ImageFigureCanvas(self.figure)
         self.canvas.setMinimumHeight(300)  # Ensure enough height for the chart
         
         # Connect mouse events for zooming and panning
@@ -90,11 +238,24 @@ class StatsWidget(QWidget):
         self.canvas.mpl_connect('button_press_event', self.on_press)
         self.canvas.mpl_connect('button_release_event', self.on_release)
         self.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.canvas.mpl_connect('resize_event', self.on_resize)
+        self.chart_renderer = ChartRenderer(self.figure)
+        
+        # Charts are normally shown as images rendered off-thread; the live figure
+        # is only brought in sync when the user starts panning or zooming
+        self.chart_images = ChartImageCache(self)
+        self.chart_images.image_ready.connect(self.on_chart_image_ready)
+        self.live_chart_stale = True
         
-        # Variables for panning
+        # Variables for panning and zooming
         self.is_panning = False
-        self.pan_start_x = None
-        self.pan_start_y = None
+        self.pan_start = None
+        self.blit_background = None
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(150)
+        self.settle_timer.timeout.connect(self.finish_interaction)
         
         charts_layout.addWidget(self.canvas)
         
@@ -127,151 +288,170 @@ class StatsWidget(QWidget):
         """Handle mouse scroll events for zooming."""
         # Only zoom if Ctrl key is pressed
         if event.guiEvent.modifiers() & Qt.ControlModifier:
-            ax = self.figure.axes[0]
-            if not ax:
-                return
-                
-            # Get the current x and y limits
-            x_min, x_max = ax.get_xlim()
-            y_min, y_max = ax.get_ylim()
-            
-            # Calculate zoom factor
+            self.show_live_chart()
+            ax = self.chart_renderer.current.ax
             factor = 0.9 if event.button == 'up' else 1.1
-            
-            # Calculate new limits centered on mouse position
-            x_range = (x_max - x_min) * factor
-            y_range = (y_max - y_min) * factor
-            
-            # Center on mouse position
-            if event.xdata is not None and event.ydata is not None:
-                x_center = event.xdata
-                y_center = event.ydata
+            if ax.in_axes(event):
+                x_center, y_center = ax.transData.inverted().transform((event.x, event.y))
+                self.zoom_chart(factor, x_center, y_center)
             else:
-                x_center = (x_min + x_max) / 2
-                y_center = (y_min + y_max) / 2
-            
-            # Set new limits
-            ax.set_xlim([x_center - x_range/2, x_center + x_range/2])
-            ax.set_ylim([y_center - y_range/2, y_center + y_range/2])
-            
-            # Redraw the canvas
-            self.canvas.draw()
+                self.zoom_chart(factor)
+    
+    def zoom_chart(self, factor, x_center=None, y_center=None):
+        """Zoom the current chart around a point (the middle of the view by default)."""
+        ax = self.chart_renderer.current.ax
+        x_min, x_max = ax.get_xlim()
+        y_min, y_max = ax.get_ylim()
+        
+        if x_center is None or y_center is None:
+            x_center = (x_min + x_max) / 2
+            y_center = (y_min + y_max) / 2
+        
+        x_range = (x_max - x_min) * factor
+        y_range = (y_max - y_min) * factor
+        ax.set_xlim([x_center - x_range/2, x_center + x_range/2])
+        ax.set_ylim([y_center - y_range/2, y_center + y_range/2])
+        
+        self.draw_interaction_frame()
+        # Ticks and labels are redrawn once the wheel has stopped
+        self.settle_timer.start()
     
     def on_press(self, event):
         """Handle mouse button press events for panning."""
-        if event.button == 1:  # Left mouse button
+        if event.button != 1:  # Left mouse button
+            return
+        self.show_live_chart()
+        ax = self.chart_renderer.current.ax
+        if ax.in_axes(event):
             self.is_panning = True
-            self.pan_start_x = event.xdata
-            self.pan_start_y = event.ydata
+            self.pan_start = (event.x, event.y, ax.get_xlim(), ax.get_ylim())
     
     def on_release(self, event):
         """Handle mouse button release events."""
-        self.is_panning = False
+        if self.is_panning:
+            self.is_panning = False
+            self.finish_interaction()
     
     def on_motion(self, event):
         """Handle mouse motion events for panning."""
-        if self.is_panning and event.xdata is not None and event.ydata is not None:
-            ax = self.figure.axes[0]
-            if not ax or self.pan_start_x is None or self.pan_start_y is None:
-                return
-                
-            # Calculate the distance moved
-            dx = self.pan_start_x - event.xdata
-            dy = self.pan_start_y - event.ydata
-            
-            # Get the current limits
-            x_min, x_max = ax.get_xlim()
-            y_min, y_max = ax.get_ylim()
-            
-            # Set new limits
-            ax.set_xlim([x_min + dx, x_max + dx])
-            ax.set_ylim([y_min + dy, y_max + dy])
+        if self.is_panning:
+            self.pan_chart(event.x, event.y)
+    
+    def pan_chart(self, x, y):
+        """Move the current chart so the point grabbed on press follows the mouse."""
+        ax = self.chart_renderer.current.ax
+        start_x, start_y, (x_min, x_max), (y_min, y_max) = self.pan_start
+        
+        # Pixel offsets converted with the scale at press time, so the pan does not drift
+        dx = (x - start_x) * (x_max - x_min) / ax.bbox.width
+        dy = (y - start_y) * (y_max - y_min) / ax.bbox.height
+        ax.set_xlim([x_min - dx, x_max - dx])
+        ax.set_ylim([y_min - dy, y_max - dy])
+        
+        self.draw_interaction_frame()
+    
+    def draw_interaction_frame(self):
+        """Redraw only the chart data over a cached background and blit it.
+        
+        The first frame of a pan or zoom renders the figure once without the
+        data artists and caches the axes area; every following frame restores
+        that background and draws the bars or line on top of it.
+        """
+        chart = self.chart_renderer.current
+        with RENDER_LOCK:
+            if self.blit_background is None:
+                for artist in chart.artists:
+                    artist.set_animated(True)
+                self.canvas.draw()
+                self.blit_background = self.canvas.copy_from_bbox(chart.ax.bbox)
             
-            # Redraw the canvas
-            self.canvas.draw()
+            # Let the chart pick what to draw for the new visible range
+            chart.view_changed()
+            self.canvas.restore_region(self.blit_background)
+            for artist in chart.artists:
+                chart.ax.draw_artist(artist)
+            self.canvas.blit(chart.ax.bbox)
+    
+    def finish_interaction(self, redraw=True):
+        """Leave blitting mode and schedule one full redraw with updated ticks."""
+        self.settle_timer.stop()
+        if self.blit_background is None:
+            return
+        self.blit_background = None
+        for artist in self.chart_renderer.current.artists:
+            artist.set_animated(False)
+        if redraw:
+            self.canvas.draw_idle()
+    
+    def on_resize(self, event):
+        """Request the chart at the new size; the old image is stretched until it is ready."""
+        if not self.live_chart_stale:
+            # The user has panned or zoomed; matplotlib redraws the live figure at the new size
+            self.chart_renderer.current.view_changed()
+            return
+        # Images of other sizes won't be shown again
+        self.chart_images.clear()
+        self.show_chart_image()
+    
+    def show_live_chart(self):
+        """Stop showing a cached image and bring the live figure up to date."""
+        if self.live_chart_stale:
+            sessions = self.get_sessions()
+            # The background worker may be rendering; matplotlib can't do both at once
+            with RENDER_LOCK:
+                self.chart_renderer.render(self.chart_type_combo.currentText(),
+                                           self.time_period_combo.currentText(), sessions)
+            self.live_chart_stale = False
+            self.canvas.draw_idle()
+        self.canvas.show_live()
+    
+    def current_image_key(self):
+        """Cache key of the image for the selected chart at the current canvas size."""
+        chart_key = self.chart_renderer.chart_key(self.chart_type_combo.currentText(),
+                                                  self.time_period_combo.currentText())
+        size = (self.canvas.width(), self.canvas.height(), self.canvas.device_pixel_ratio)
+        return chart_key, self.snapshot_generation, size
+    
+    def on_chart_image_ready(self, key):
+        """Swap in a finished image if it is still the chart the user is looking at."""
+        # Don't replace a live figure the user may have zoomed or panned
+        if key == self.current_image_key() and self.live_chart_stale:
+            self.canvas.show_image(self.chart_images.get(key))
+    
+    def on_draw(self, event):
+        """Refresh the cached background if the figure is fully redrawn mid-interaction."""
+        if self.blit_background is not None:
+            self.blit_background = self.canvas.copy_from_bbox(self.chart_renderer.current.ax.bbox)
     
     def reset_view(self):
         """Reset the view to the original limits."""
         self.update_chart()  # Simply redraw the chart with default limits
     
+    def get_sessions(self):
+        """Return the session snapshot, querying the database only if it is stale."""
+        if self.sessions_snapshot is None or self.snapshot_version != self.db.sessions_version:
+            self.snapshot_version = self.db.sessions_version
+            self.sessions_snapshot = SessionColumns.from_rows(self.db.get_session_metrics(self.user_id))
+            self.snapshot_generation += 1
+        return self.sessions_snapshot
+    
+    def invalidate_snapshot(self):
+        """Force the next refresh to re-read sessions from the database."""
+        self.sessions_snapshot = None
+    
+    def on_session_ended(self, *args):
+        """Reload statistics when the Pomodoro timer records a session."""
+        self.invalidate_snapshot()
+        self.load_data()
+    
     def load_data(self):
         """Load session data from the database."""
-        sessions = self.db.get_user_sessions(self.user_id, limit=100)  # Increased limit for better analysis
-        
-        # Update table
-        self.session_table.setRowCount(len(sessions))
+        sessions = self.get_sessions()
         
-        for row, session in enumerate(sessions):
-            (session_id, date, day, start_time, end_time, task_type, 
-             app_switch_count, distraction_duration, total_focus_duration, 
-             focus_score, productivity_percentage, break_duration) = session
-            
-            # Format data for display
-            if productivity_percentage is not None:
-                productivity_str = f"{productivity_percentage:.1f}%"
-            else:
-                productivity_str = "N/A"
-                
-            # Add data to table
-            self.session_table.setItem(row, 0, QTableWidgetItem(str(session_id)))
-            self.session_table.setItem(row, 1, QTableWidgetItem(date))
-            self.session_table.setItem(row, 2, QTableWidgetItem(day))
-            self.session_table.setItem(row, 3, QTableWidgetItem(start_time))
-            self.session_table.setItem(row, 4, QTableWidgetItem(end_time or "N/A"))
-            self.session_table.setItem(row, 5, QTableWidgetItem(task_type or "N/A"))
-            self.session_table.setItem(row, 6, QTableWidgetItem(str(app_switch_count)))
-            self.session_table.setItem(row, 7, QTableWidgetItem(f"{distraction_duration:.1f}"))
-            self.session_table.setItem(row, 8, QTableWidgetItem(f"{total_focus_duration:.1f}"))
-            
-            # Color-code focus score
-            focus_item = QTableWidgetItem(str(focus_score) if focus_score is not None else "N/A")
-            if focus_score is not None:
-                # Set text color to black for better contrast with background
-                focus_item.setForeground(QColor(0, 0, 0))
-                focus_item.setFont(QFont("Arial", 9, QFont.Bold))
-                
-                if focus_score >= 8:
-                    focus_item.setBackground(QColor(100, 255, 100))  # Brighter green
-                elif focus_score >= 5:
-                    focus_item.setBackground(QColor(255, 255, 100))  # Brighter yellow
-                else:
-                    focus_item.setBackground(QColor(255, 100, 100))  # Brighter red
-            else:
-                # Make N/A more visible
-                focus_item.setForeground(QColor(255, 255, 255))  # White text
-                focus_item.setFont(QFont("Arial", 9, QFont.Bold))
-            self.session_table.setItem(row, 9, focus_item)
-            
-            # Color-code productivity
-            productivity_item = QTableWidgetItem(productivity_str)
-            if productivity_percentage is not None:
-                # Set text color to black for better contrast with background
-                productivity_item.setForeground(QColor(0, 0, 0))
-                productivity_item.setFont(QFont("Arial", 9, QFont.Bold))
-                
-                if productivity_percentage >= 80:
-                    productivity_item.setBackground(QColor(100, 255, 100))  # Brighter green
-                elif productivity_percentage >= 50:
-                    productivity_item.setBackground(QColor(255, 255, 100))  # Brighter yellow
-                else:
-                    productivity_item.setBackground(QColor(255, 100, 100))  # Brighter red
-            else:
-                # Make N/A more visible
-                productivity_item.setForeground(QColor(255, 255, 255))  # White text
-                productivity_item.setFont(QFont("Arial", 9, QFont.Bold))
-            self.session_table.setItem(row, 10, productivity_item)
-            
-            # Add break duration with better formatting
-            if break_duration is not None and break_duration > 0:
-                break_item = QTableWidgetItem(f"{break_duration}")
-                # Use blue color for break duration to make it stand out
-                break_item.setForeground(QColor(0, 120, 215))  # Microsoft blue
-                break_item.setFont(QFont("Arial", 9, QFont.Bold))
-            else:
-                break_item = QTableWidgetItem("0")
-                # Use gray for zero break duration
-                break_item.setForeground(QColor(128, 128, 128))  # Gray
-            self.session_table.setItem(row, 11, break_item)
+        # Update table, keeping its cached pages unless the sessions changed
+        if self.table_generation != self.snapshot_generation:
+            self.table_generation = self.snapshot_generation
+            self.session_model.refresh(len(sessions))
         
         # Update chart
         self.update_chart()
@@ -283,269 +463,25 @@ class StatsWidget(QWidget):
         # Show/hide time period selector based on chart type
         self.time_period_widget.setVisible(chart_type == "Focus Score vs Time")
         
-        # Clear the figure
-        self.figure.clear()
-        
-        # Configure figure for dark theme
-        ax = self.figure.add_subplot(111)
-        ax.set_facecolor('#2d2d2d')  # Dark background
-        self.figure.patch.set_facecolor('#2d2d2d')  # Dark background
-        
-        # Set text color to white for better visibility
-        ax.tick_params(colors='white', which='both')
-        ax.xaxis.label.set_color('white')
-        ax.yaxis.label.set_color('white')
-        ax.title.set_color('white')
-        
-        # Set grid color to a subtle gray
-        ax.grid(True, linestyle='--', alpha=0.3, color='#888888')
-        
-        # Get sessions data
-        sessions = self.db.get_user_sessions(self.user_id, limit=100)  # Increased limit for better analysis
-        
-        if not sessions:
-            ax.text(0.5, 0.5, "No data available", 
-                   horizontalalignment='center', verticalalignment='center',
-                   transform=ax.transAxes, color='white', fontsize=14)
-            self.canvas.draw()
-            return
-        
-        if chart_type == "Focus Score vs Time":
-            time_period = self.time_period_combo.currentText()
-            
-            if time_period == "Day":
-                # Group sessions by hour
-                hour_data = {}
-                for s in sessions:
-                    if s[3] and s[9] is not None:  # Start time and focus score
-                        try:
-                            hour = int(s[3].split(':')[0])
-                            if hour not in hour_data:
-                                hour_data[hour] = []
-                            hour_data[hour].append(s[9])  # Focus score
-                        except (ValueError, IndexError):
-                            continue
-                
-                if hour_data:
-                    hours = sorted(hour_data.keys())
-                    avg_scores = [sum(hour_data[h]) / len(hour_data[h]) for h in hours]
-                    
-                    # Plot with enhanced visibility
-                    bars = ax.bar(hours, avg_scores, color='#3daee9', width=0.7)
-                    
-                    # Add value labels on top of bars
-                    for bar in bars:
-                        height = bar.get_height()
-                        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                                f'{height:.1f}', ha='center', va='bottom', color='white')
-                    
-                    ax.set_title('Focus Score vs Time (Day)')
-                    ax.set_xlabel('Hour of Day')
-                    ax.set_ylabel('Focus Score (0-10)')
-                    ax.set_xticks(hours)
-                    ax.set_xticklabels([f"{h}:00" for h in hours])
-                else:
-                    ax.text(0.5, 0.5, "No data available for focus score by hour", 
-                           horizontalalignment='center', verticalalignment='center',
-                           transform=ax.transAxes, color='white', fontsize=14)
-                    ax.set_title('Focus Score vs Time (Day)')
-                    ax.set_xlabel('Hour of Day')
-                    ax.set_ylabel('Focus Score (0-10)')
-            
-            elif time_period == "Month":
-                # Group sessions by day of month
-                day_data = {}
-                for s in sessions:
-                    if s[1] and s[9] is not None:  # Date and focus score
-                        try:
-                            day = int(s[1].split('-')[2])
-                            if day not in day_data:
-                                day_data[day] = []
-                            day_data[day].append(s[9])  # Focus score
-                        except (ValueError, IndexError):
-                            continue
-                
-                if day_data:
-                    days = sorted(day_data.keys())
-                    avg_scores = [sum(day_data[d]) / len(day_data[d]) for d in days]
-                    
-                    # Plot with enhanced visibility
-                    bars = ax.bar(days, avg_scores, color='#3daee9', width=0.7)
-                    
-                    # Add value labels on top of bars
-                    for bar in bars:
-                        height = bar.get_height()
-                        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                                f'{height:.1f}', ha='center', va='bottom', color='white')
-                    
-                    ax.set_title('Average Focus Score by Day (Month)')
-                    ax.set_xlabel('Day of Month')
-                    ax.set_ylabel('Average Focus Score (0-10)')
-                    ax.set_xticks(days)
-                else:
-                    ax.text(0.5, 0.5, "No data available for focus score by day", 
-                           horizontalalignment='center', verticalalignment='center',
-                           transform=ax.transAxes, color='white', fontsize=14)
-                    ax.set_title('Average Focus Score by Day (Month)')
-                    ax.set_xlabel('Day of Month')
-                    ax.set_ylabel('Average Focus Score (0-10)')
-            
-            elif time_period == "Year":
-                # Group sessions by month
-                month_data = {}
-                month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", 
-                              "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-                
-                for s in sessions:
-                    if s[1] and s[9] is not None:  # Date and focus score
-                        try:
-                            month = int(s[1].split('-')[1])
-                            if month not in month_data:
-                                month_data[month] = []
-                            month_data[month].append(s[9])  # Focus score
-                        except (ValueError, IndexError):
-                            continue
-                
-                if month_data:
-                    months = sorted(month_data.keys())
-                    avg_scores = [sum(month_data[m]) / len(month_data[m]) for m in months]
-                    
-                    # Plot with enhanced visibility
-                    bars = ax.bar([month_names[m-1] for m in months], avg_scores, color='#3daee9', width=0.7)
-                    
-                    # Add value labels on top of bars
-                    for bar in bars:
-                        height = bar.get_height()
-                        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                                f'{height:.1f}', ha='center', va='bottom', color='white')
-                    
-                    ax.set_title('Average Focus Score by Month (Year)')
-                    ax.set_xlabel('Month')
-                    ax.set_ylabel('Average Focus Score (0-10)')
-                else:
-                    ax.text(0.5, 0.5, "No data available for focus score by month", 
-                           horizontalalignment='center', verticalalignment='center',
-                           transform=ax.transAxes, color='white', fontsize=14)
-                    ax.set_title('Average Focus Score by Month (Year)')
-                    ax.set_xlabel('Month')
-                    ax.set_ylabel('Average Focus Score (0-10)')
-        
-        elif chart_type == "Focus vs. Distraction Time":
-            # Extract data
-            focus_times = [s[8] for s in sessions if s[8] is not None]
-            distraction_times = [s[7] for s in sessions if s[7] is not None]
-            
-            if focus_times and distraction_times:  # Only plot if we have data
-                # Create chart
-                labels = ['Focus Time', 'Distraction Time']
-                sizes = [sum(focus_times), sum(distraction_times)]
-                colors = ['#66b3ff', '#ff9999']
-                
-                # Create a simpler pie chart without explode and shadow to avoid buffer overflow
-                wedges, texts, autotexts = ax.pie(sizes, labels=labels, colors=colors, 
-                                                 autopct='%1.1f%%', shadow=False, startangle=90)
-                
-                # Set label text to white
-                for text in texts:
-                    text.set_color('white')
-                    text.set_fontweight('bold')
-                
-                # Set percentage text to white
-                for autotext in autotexts:
-                    autotext.set_color('white')
-                    autotext.set_fontweight('bold')
-                
-                ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-                ax.set_title('Focus vs. Distraction Time Distribution')
-            else:
-                ax.text(0.5, 0.5, "No data available for pie chart", 
-                       horizontalalignment='center', verticalalignment='center',
-                       transform=ax.transAxes, color='white', fontsize=14)
-                ax.set_title('Focus vs. Distraction Time Distribution')
-        
-        elif chart_type == "Productivity by Time of Day":
-            # Group sessions by hour
-            hour_data = {}
-            for s in sessions:
-                if s[3] and s[9] is not None:  # Start time and focus score
-                    try:
-                        hour = int(s[3].split(':')[0])
-                        if hour not in hour_data:
-                            hour_data[hour] = []
-                        hour_data[hour].append(s[9])  # Focus score
-                    except (ValueError, IndexError):
-                        continue
-            
-            if hour_data:
-                hours = sorted(hour_data.keys())
-                avg_productivity = [sum(hour_data[h]) / len(hour_data[h]) for h in hours]
-                
-                # Plot with enhanced visibility
-                bars = ax.bar(hours, avg_productivity, color='#3daee9', width=0.7)
-                
-                # Add value labels on top of bars
-                for bar in bars:
-                    height = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                            f'{height:.1f}', ha='center', va='bottom', color='white')
-                
-                ax.set_title('Productivity by Time of Day')
-                ax.set_xlabel('Hour of Day')
-                ax.set_ylabel('Average Focus Score (0-10)')
-                ax.set_xticks(hours)
-                ax.set_xticklabels([f"{h}:00" for h in hours])
-            else:
-                ax.text(0.5, 0.5, "No data available for productivity by time of day",
-                       horizontalalignment='center', verticalalignment='center',
-                       transform=ax.transAxes, color='white', fontsize=14)
-                ax.set_title('Productivity by Time of Day')
-                ax.set_xlabel('Hour of Day')
-                ax.set_ylabel('Average Focus Score (0-10)')
-        
-        elif chart_type == "Focus Score Trend Over Days":
-            # Group sessions by date
-            date_data = {}
-            for s in sessions:
-                if s[1] and s[9] is not None:  # Date and focus score
-                    date = s[1]
-                    if date not in date_data:
-                        date_data[date] = []
-                    date_data[date].append(s[9])  # Focus score
-            
-            if date_data:
-                dates = sorted(date_data.keys())
-                avg_scores = [sum(date_data[d]) / len(date_data[d]) for d in dates]
-                
-                # Plot with enhanced visibility
-                ax.plot(range(len(dates)), avg_scores, 'o-', color='#3daee9', linewidth=2, markersize=8)
-                
-                # Add value labels next to points
-                for i, score in enumerate(avg_scores):
-                    ax.text(i, score + 0.1, f'{score:.1f}', ha='center', va='bottom', color='white')
-                
-                ax.set_title('Focus Score Trend Over Days')
-                ax.set_xlabel('Date')
-                ax.set_ylabel('Average Focus Score (0-10)')
-                
-                # Show only a subset of dates if there are many
-                if len(dates) > 10:
-                    step = len(dates) // 10
-                    ax.set_xticks(range(0, len(dates), step))
-                    ax.set_xticklabels([dates[i] for i in range(0, len(dates), step)])
-                else:
-                    ax.set_xticks(range(len(dates)))
-                    ax.set_xticklabels(dates)
-                
-                plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
-            else:
-                ax.text(0.5, 0.5, "No data available for focus score trend",
-                       horizontalalignment='center', verticalalignment='center',
-                       transform=ax.transAxes, color='white', fontsize=14)
-                ax.set_title('Focus Score Trend Over Days')
-                ax.set_xlabel('Date')
-                ax.set_ylabel('Average Focus Score (0-10)')
-        
-        self.canvas.draw() 
+        self.is_panning = False
+        self.finish_interaction(redraw=False)
+        self.live_chart_stale = True
+        self.show_chart_image()
+    
+    def show_chart_image(self):
+        """Show the selected chart as an image at the current canvas size.
+        
+        Previously viewed charts come straight from the image cache; others are
+        rendered in the background and swapped in when ready.
+        """
+        key = self.current_image_key()
+        image = self.chart_images.get(key)
+        if image is not None:
+            self.canvas.show_image(image)
+        else:
+            self.chart_images.request(key, self.chart_type_combo.currentText(),
+                                      self.time_period_combo.currentText(), self.get_sessions(),
+                                      self.figure.get_size_inches(), self.figure.dpi)
 
     def create_chart_widget(self):
         """Create the chart widget."""
@@ -587,7 +523,7 @@ class StatsWidget(QWidget):
         # Set figure background to match dark theme
         self.figure.patch.set_facecolor('#2d2d2d')
         
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = ImageFigureCanvas(self.figure)
         chart_layout.addWidget(self.canvas)
         
         chart_widget.setLayout(chart_layout)
@@ -1,18 +1,22 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTextEdit, QMessageBox, QLineEdit, QScrollArea)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QColor
-import pickle
-import pandas as pd
-import numpy as np
+                             QPushButton, QMessageBox, QLineEdit)
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QFont, QColor, QTextFrameFormat, QTextBlockFormat, QTextCharFormat
+from collections import deque
 from datetime import datetime
 import os
 from dotenv import load_dotenv
-import requests  # For Gemini API
-import json
 
-from database import Database
-from sklearn.preprocessing import LabelEncoder
+from chat_view import ChatView
+from gemini_client import GeminiClient, GeminiReplies, GEMINI_BASE_URL, GENERATION_CONFIG, READ_TIMEOUT
+from response_cache import ResponseCache
+from prompt_builder import PromptBuilder
+from intent_classifier import classifier
+from model_registry import models
+from recommendations import RecommendationEngine, UserProfile, format_hour
+from personalization import Personalizer, PersonalModels
+from features import load_encoders, prepare_sessions, MIN_SESSIONS
+from session_aggregates import load_user_aggregates, length_group, SESSION_LENGTHS, TASK_TYPES
 
 # Load environment variables
 load_dotenv()
@@ -34,70 +38,103 @@ class ChatMessage:
         self.is_user = is_user
         self.timestamp = datetime.now()
     
-    def format_html(self):
-        """Format the message as HTML for display"""
-        align = "right" if self.is_user else "left"
-        # Dark theme message colors
-        bg_color = ACCENT_COLOR if self.is_user else DARK_TERTIARY
-        text_color = DARK_TEXT
-        sender = "You" if self.is_user else "Focus AI"
-        time = self.timestamp.strftime("%H:%M")
-        
-        return f"""
-        <div style="text-align: {align}; margin: 10px;">
-            <div style="display: inline-block; background-color: {bg_color}; color: {text_color}; padding: 10px; border-radius: 10px; max-width: 80%;">
-                <b>{sender}</b>
-                <p style="color: {text_color};">{self.text.replace('\n', '<br>')}</p>
-                <div style="font-size: 8pt; color: #cccccc; text-align: right;">{time}</div>
-            </div>
-        </div>
-        """
+    def frame_format(self):
+        """Bubble around the message: accent for the user on the right, grey for Focus AI on the left"""
+        frame_format = QTextFrameFormat()
+        frame_format.setBackground(QColor(ACCENT_COLOR if self.is_user else DARK_TERTIARY))
+        frame_format.setPadding(10)
+        frame_format.setTopMargin(10)
+        frame_format.setBottomMargin(10)
+        # Keep bubbles to about 80% of the width
+        frame_format.setLeftMargin(80 if self.is_user else 10)
+        frame_format.setRightMargin(10 if self.is_user else 80)
+        return frame_format
+    
+    def render(self, cursor):
+        """Write the message at cursor, inside its frame"""
+        align = Qt.AlignRight if self.is_user else Qt.AlignLeft
+        block_format = QTextBlockFormat()
+        block_format.setAlignment(align)
+        
+        sender_format = QTextCharFormat()
+        sender_format.setForeground(QColor(DARK_TEXT))
+        sender_format.setFontWeight(QFont.Bold)
+        text_format = QTextCharFormat()
+        text_format.setForeground(QColor(DARK_TEXT))
+        time_format = QTextCharFormat()
+        time_format.setForeground(QColor("#cccccc"))
+        time_format.setFontPointSize(8)
+        time_block_format = QTextBlockFormat()
+        time_block_format.setAlignment(Qt.AlignRight)
+        
+        cursor.setBlockFormat(block_format)
+        cursor.insertText("You" if self.is_user else "Focus AI", sender_format)
+        cursor.insertBlock(block_format)
+        # Line separators keep the message in one block
+        cursor.insertText(self.text.replace('\n', '\u2028'), text_format)
+        cursor.insertBlock(time_block_format)
+        cursor.insertText(self.timestamp.strftime("%H:%M"), time_format)
+
+
+class PendingReply:
+    """A Gemini reply being streamed into a chat message"""
+    def __init__(self, request_id, message, user_text, fallback, cache_key):
+        self.request_id = request_id
+        self.message = message
+        self.user_text = user_text
+        self.fallback = fallback
+        self.cache_key = cache_key
+
 
 class SuggestionsUI(QWidget):
+    # The shared models finished loading; emitted from the loading thread
+    models_loaded = pyqtSignal()
+
     def __init__(self, db, user_id):
         super().__init__()
         self.db = db
         self.user_id = user_id
-        self.chat_history = []
         self.predictions = None
         self.user_patterns = {}
-        self.session_history = []
+        self.session_history = deque(maxlen=10)  # Last 10 sessions seen since startup
         self.productivity_trends = {}
         self.gemini_conversation_history = []  # Track conversation for Gemini
+        self.recommendation_engine = None
+        self.personal_models = None  # Models fine-tuned on this user's sessions, once ready
+        self.models_available = False  # Until then predictions come from the session aggregates
+        self.welcome_pending = False  # The chat shows the loading message instead of a welcome
+        self.pending_reply = None  # The chat message a Gemini reply is streaming into
         
-        # Initialize pattern detection
-        self.init_pattern_detection()
+        # Load the running session aggregates, catching up on any new sessions
+        self.seen_sessions_version = self.db.sessions_version
+        self.aggregates = load_user_aggregates(self.db, self.user_id)
         
         # Load the models
         self.load_models()
         
-        # Create refresh timer
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.check_for_new_sessions)
-        self.refresh_timer.start(60000)  # Check every minute
-        
-        # Store last session ID to track new sessions
-        self.last_session_id = self.get_last_session_id()
-        
         self.init_ui()
     
-    def get_last_session_id(self):
-        """Get the ID of the last session from the database"""
-        sessions = self.db.get_user_sessions(self.user_id, limit=1)
-        if sessions:
-            return sessions[0][0]  # First column is session_id
-        return None
-    
     def check_for_new_sessions(self):
         """Check for new sessions and update recommendations"""
-        current_last_id = self.get_last_session_id()
-        if current_last_id and current_last_id != self.last_session_id:
-            # New session detected
-            sessions = self.db.get_user_sessions(self.user_id, limit=1)
-            if sessions:
-                session = sessions[0]
+        # Nothing to read unless focus_sessions was written since the last check
+        if self.db.sessions_version == self.seen_sessions_version:
+            return
+        self.seen_sessions_version = self.db.sessions_version
+        
+        # Only sessions finished since the last check are read and folded in
+        new_sessions, break_changed = self.aggregates.catch_up(self.db, self.user_id)
+        if break_changed and not new_sessions:
+            # Only the last session's break was recorded, once the break ended
+            self.db.save_user_aggregates(self.user_id, self.aggregates.to_json())
+            self.response_cache.invalidate()
+            self.update_models()
+        if new_sessions:
+            self.db.save_user_aggregates(self.user_id, self.aggregates.to_json())
+            # Saved replies describe the sessions before this one
+            self.response_cache.invalidate()
+            for session in new_sessions:
                 # Convert session tuple to dictionary
-                session_data = {
+                self.session_history.append({
                     'Date': session[1],
                     'Day': session[2],
                     'Start Time': session[3],
@@ -109,13 +146,18 @@ class SuggestionsUI(QWidget):
                     'Focus Score (0-10)': session[9],
                     'Productivity %': session[10],
                     'Break Duration': session[11]
-                }
-                # Update models and display
-                self.update_models(session_data)
-                self.last_session_id = current_last_id
-                
-                # Add a notification message
-                self.add_message("🔄 Recommendations updated based on your latest session!")
+                })
+            # Update models and display
+            self.update_models()
+            self.personalizer.refresh()
+            
+            # Add a notification message
+            self.add_message("🔄 Recommendations updated based on your latest session!")
+    
+    def showEvent(self, event):
+        """Catch up on sessions recorded while the tab was hidden"""
+        super().showEvent(event)
+        self.check_for_new_sessions()
     
     def connect_to_pomodoro(self, pomodoro_widget):
         """Connect to pomodoro widget signals"""
@@ -139,86 +181,29 @@ class SuggestionsUI(QWidget):
         
         self.add_message(message)
 
-    def init_pattern_detection(self):
-        """Initialize pattern detection for user behavior"""
-        self.pattern_metrics = {
-            'focus_by_time': {},      # Track focus scores by time
-            'breaks_taken': {},       # Track break patterns
-            'task_completion': {},    # Track task completion rates
-            'distraction_sources': {} # Track common distractions
-        }
-        
-    def update_user_patterns(self, session_data):
-        """Update user patterns with new session data"""
-        hour = pd.to_datetime(session_data['Start Time']).hour
-        
-        # Update focus patterns by time
-        if hour not in self.pattern_metrics['focus_by_time']:
-            self.pattern_metrics['focus_by_time'][hour] = []
-        self.pattern_metrics['focus_by_time'][hour].append(session_data['Focus Score (0-10)'])
-        
-        # Update break patterns
-        break_duration = session_data.get('Break Duration', 0)
-        session_length = session_data['Total Focus Duration (mins)']
-        # Round session length to nearest 5 minutes for better grouping
-        session_length = round(session_length / 5) * 5
-        if session_length not in self.pattern_metrics['breaks_taken']:
-            self.pattern_metrics['breaks_taken'][session_length] = []
-        self.pattern_metrics['breaks_taken'][session_length].append(break_duration)
-        
-        # Update task completion tracking
-        task_type = session_data['Task Type']
-        if task_type not in self.pattern_metrics['task_completion']:
-            self.pattern_metrics['task_completion'][task_type] = {
-                'completed': 0,
-                'total': 0
-            }
-        self.pattern_metrics['task_completion'][task_type]['total'] += 1
-        if session_data['Productivity %'] >= 75:
-            self.pattern_metrics['task_completion'][task_type]['completed'] += 1
-
     def get_personalized_recommendations(self):
         """Generate personalized recommendations based on user patterns"""
         recommendations = []
         
         # Analyze focus patterns by time
-        if self.pattern_metrics['focus_by_time']:
-            best_hours = []
-            for hour, scores in self.pattern_metrics['focus_by_time'].items():
-                avg_score = sum(scores) / len(scores)
-                if avg_score >= 7:  # High focus threshold
-                    best_hours.append((hour, avg_score))
-            if best_hours:
-                best_hours.sort(key=lambda x: x[1], reverse=True)
-                hour_str = f"{best_hours[0][0]:02d}:00"
-                recommendations.append(f"You tend to be most focused around {hour_str}")
+        best_hour = self.aggregates.highest('hour', 'focus_score')
+        if best_hour and best_hour[1] >= 7:  # High focus threshold
+            recommendations.append(f"You tend to be most focused around {best_hour[0]:02d}:00")
 
         # Analyze break patterns
-        if self.pattern_metrics['breaks_taken']:
-            optimal_breaks = {}
-            for session_length, breaks in self.pattern_metrics['breaks_taken'].items():
-                avg_break = sum(breaks) / len(breaks)
-                optimal_breaks[session_length] = avg_break
-            if optimal_breaks:
-                best_ratio = max(optimal_breaks.items(), key=lambda x: x[1])
-                # Round break duration to nearest minute
-                break_mins = round(best_ratio[1])
-                recommendations.append(
-                    f"For {int(best_ratio[0])}-minute sessions, taking {break_mins}-minute breaks works best for you"
-                )
+        best_break = self.aggregates.highest('length', 'break_duration')
+        if best_break:
+            # Round break duration to nearest minute
+            recommendations.append(
+                f"For {best_break[0]}-minute sessions, taking {round(best_break[1])}-minute breaks works best for you"
+            )
 
         # Analyze task completion rates
-        if self.pattern_metrics['task_completion']:
-            task_success = {}
-            for task, stats in self.pattern_metrics['task_completion'].items():
-                if stats['total'] > 0:
-                    success_rate = (stats['completed'] / stats['total']) * 100
-                    task_success[task] = success_rate
-            if task_success:
-                best_task = max(task_success.items(), key=lambda x: x[1])
-                recommendations.append(
-                    f"You're most effective at {best_task[0]} tasks ({int(best_task[1])}% success rate)"
-                )
+        best_task = self.aggregates.highest('task_type', 'productive')
+        if best_task:
+            recommendations.append(
+                f"You're most effective at {best_task[0]} tasks ({int(best_task[1] * 100)}% success rate)"
+            )
 
         return recommendations
 
@@ -231,27 +216,26 @@ class SuggestionsUI(QWidget):
         day = current_time.strftime("%A").lower()
         
         # Get base predictions
-        best_length = self.predict_best_length(self.prepare_current_data())
-        
-        # Adjust based on time of day
-        if hour in self.pattern_metrics['focus_by_time']:
-            recent_scores = self.pattern_metrics['focus_by_time'][hour][-5:]  # Last 5 sessions
-            if recent_scores:
-                avg_recent_score = sum(recent_scores) / len(recent_scores)
-                if avg_recent_score < 5:  # If recent performance is poor
-                    best_length = min(best_length, 25)  # Suggest shorter sessions
-                elif avg_recent_score > 8:  # If recent performance is excellent
-                    best_length = max(best_length, 45)  # Allow longer sessions
+        if self.predictions:
+            best_length = self.predictions['best_length']
+        else:
+            best_length = self.aggregates.best_length() or 25
+        
+        # Adjust based on recent focus at this time of day
+        focus_at_hour = self.aggregates.mean('hour', 'focus_score')[hour]
+        if focus_at_hour < 5:  # If recent performance is poor
+            best_length = min(best_length, 25)  # Suggest shorter sessions
+        elif focus_at_hour > 8:  # If recent performance is excellent
+            best_length = max(best_length, 45)  # Allow longer sessions
         
         # Round best_length to nearest 5 minutes
         best_length = 5 * round(best_length / 5)
         
-        # Get optimal break duration
+        # Get optimal break duration for sessions of about this length
         optimal_break = 5  # Default break duration
-        if best_length in self.pattern_metrics['breaks_taken']:
-            breaks = self.pattern_metrics['breaks_taken'][best_length]
-            if breaks:
-                optimal_break = sum(breaks) / len(breaks)
+        breaks = self.aggregates.mean('length', 'break_duration')[SESSION_LENGTHS.index(length_group(best_length))]
+        if breaks == breaks:  # Not NaN
+            optimal_break = breaks
         
         # Round the break duration to nearest minute
         optimal_break = round(optimal_break)
@@ -270,12 +254,13 @@ class SuggestionsUI(QWidget):
         """Suggest tasks based on historical performance"""
         task_suggestions = []
         
-        # Check task completion rates for this time and day
-        for task, stats in self.pattern_metrics['task_completion'].items():
-            if stats['total'] >= 3:  # Minimum sessions for consideration
-                success_rate = (stats['completed'] / stats['total']) * 100
+        # Check task completion rates, counting recent sessions most
+        success_rates = self.aggregates.mean('task_type', 'productive') * 100
+        session_counts = self.aggregates.weighted_counts('task_type')
+        for task, success_rate, count in zip(TASK_TYPES, success_rates, session_counts):
+            if count >= 3:  # Minimum sessions for consideration
                 if success_rate >= 70:  # High success rate threshold
-                    task_suggestions.append((task, success_rate))
+                    task_suggestions.append((task.capitalize(), success_rate))
         
         # Sort by success rate
         task_suggestions.sort(key=lambda x: x[1], reverse=True)
@@ -287,7 +272,7 @@ class SuggestionsUI(QWidget):
         
         # Analyze productivity trends
         if self.session_history:
-            recent_sessions = self.session_history[-10:]  # Last 10 sessions
+            recent_sessions = self.session_history  # Last 10 sessions
             avg_focus = sum(s['Focus Score (0-10)'] for s in recent_sessions) / len(recent_sessions)
             
             if avg_focus > 7:
@@ -296,28 +281,16 @@ class SuggestionsUI(QWidget):
                 insights.append("Your focus scores have room for improvement. Consider shorter sessions or more frequent breaks.")
         
         # Analyze break patterns
-        if self.pattern_metrics['breaks_taken']:
-            most_productive_lengths = []
-            for length, breaks in self.pattern_metrics['breaks_taken'].items():
-                if len(breaks) >= 2:  # Need at least 2 data points
-                    most_productive_lengths.append((length, sum(breaks) / len(breaks)))
-            
-            if most_productive_lengths:
-                # Get the most productive session length
-                best_length = int(round(max(most_productive_lengths, key=lambda x: x[1])[0]))
-                insights.append(f"You're most productive in {best_length}-minute sessions.")
+        best_length = self.aggregates.highest('length', 'break_duration', min_count=2)  # Need at least 2 data points
+        if best_length:
+            insights.append(f"You're most productive in {best_length[0]}-minute sessions.")
         
-        insights.append("Analysis based on your last 10 focus sessions.")
+        insights.append("Analysis based on your focus sessions, with recent ones counting most.")
         return insights
 
-    def update_models(self, new_session_data):
-        """Update models with new session data"""
-        self.session_history.append(new_session_data)
-        self.update_user_patterns(new_session_data)
-        
-        # Update predictions with latest data (last 10 sessions)
-        current_data = self.prepare_current_data()
-        self.predictions = self.get_model_predictions(current_data)
+    def update_models(self):
+        """Update predictions and insights from the session aggregates"""
+        self.predictions = self.get_model_predictions()
         
         # Generate new insights
         insights = self.generate_insights()
@@ -363,8 +336,7 @@ class SuggestionsUI(QWidget):
         layout.addWidget(title_label)
         
         # Create chat display area
-        self.chat_display = QTextEdit()
-        self.chat_display.setReadOnly(True)
+        self.chat_display = ChatView()
         self.chat_display.setMinimumHeight(300)
         self.chat_display.setStyleSheet(f"""
             QTextEdit {{
@@ -447,22 +419,8 @@ class SuggestionsUI(QWidget):
         self.refresh_suggestions()
     
     def add_message(self, text, is_user=False):
-        """Add a message to the chat history and update display"""
-        message = ChatMessage(text, is_user)
-        self.chat_history.append(message)
-        self.update_chat_display()
-    
-    def update_chat_display(self):
-        """Update the chat display with all messages"""
-        html_content = ""
-        for message in self.chat_history:
-            html_content += message.format_html()
-        
-        self.chat_display.setHtml(html_content)
-        
-        # Scroll to bottom to show latest message
-        scrollbar = self.chat_display.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        """Add a message to the end of the chat"""
+        self.chat_display.append_message(ChatMessage(text, is_user))
     
     def send_message(self):
         """Handle user sending a message"""
@@ -470,6 +428,10 @@ class SuggestionsUI(QWidget):
         if not user_text:
             return
         
+        # A new message supersedes any reply still streaming
+        self.cancel_reply()
+        self.welcome_pending = False  # Keep the conversation once the models are loaded
+        
         # Add user message to chat
         self.add_message(user_text, is_user=True)
         self.message_input.clear()
@@ -482,179 +444,138 @@ class SuggestionsUI(QWidget):
         # Extract question intent
         question_intent = self.classify_question_intent(user_text)
         
-        # Build conversation history for context
-        conversation_history = []
-        if self.gemini_conversation_history:
-            # Get the full history, limited to last 5 exchanges for token efficiency
-            last_exchanges = self.gemini_conversation_history[-5:] 
-            for exchange in last_exchanges:
-                conversation_history.append({"role": "user", "parts": [{"text": exchange['user']}]})
-                conversation_history.append({"role": "model", "parts": [{"text": exchange['assistant']}]})
+        # Try to use Gemini API if we have a key
+        if self.gemini_api_key:
+            contents = self.prompt_builder.build(
+                self.gemini_conversation_history, self.get_context_facts(), user_text
+            )
+            
+            # Stream the reply in; fall back to a local response if the API fails
+            self.request_reply(contents, user_text,
+                               lambda: self.generate_local_response(user_text, question_intent))
+            return
         
-        # Build app context that includes current recommendations and usage patterns
-        app_context = "Focus Enhancement App Context:\n"
-        app_context += "- Analysis based on your last 10 focus sessions\n"
+        # Fallback to local response generation
+        self.generate_local_response(user_text, question_intent)
+    
+    def get_context_facts(self):
+        """Short facts about the user's focus data to send along with a chat message"""
+        facts = ["analysis based on your focus sessions, recent ones counting most"]
         
         if self.predictions:
-            app_context += f"- Your optimal focus time: {self.predictions['best_time']}\n"
-            app_context += f"- Your optimal session length: {self.predictions['best_length']} minutes\n"
-            app_context += f"- Your most productive day: {self.predictions['best_day']}\n"
+            facts.append(f"optimal focus time: {self.predictions['best_time']}")
+            facts.append(f"optimal session length: {self.predictions['best_length']} minutes")
+            facts.append(f"most productive day: {self.predictions['best_day']}")
         
         # Add recent patterns
         if self.session_history and len(self.session_history) >= 2:
             # Get statistics from recent sessions (limit to last 10)
-            recent_sessions = self.session_history[-10:]
+            recent_sessions = list(self.session_history)
             avg_focus = sum(s['Focus Score (0-10)'] for s in recent_sessions) / len(recent_sessions)
             avg_productivity = sum(s['Productivity %'] for s in recent_sessions) / len(recent_sessions)
             
-            app_context += f"- Recent average focus score: {avg_focus:.1f}/10\n"
-            app_context += f"- Recent productivity: {int(avg_productivity)}%\n"
+            facts.append(f"recent average focus score: {avg_focus:.1f}/10")
+            facts.append(f"recent productivity: {int(avg_productivity)}%")
             
             # Add trend information
             recent_trend = recent_sessions[-1]['Focus Score (0-10)'] - recent_sessions[-2]['Focus Score (0-10)']
             if recent_trend > 1:
-                app_context += "- Focus has been improving significantly\n"
+                facts.append("focus has been improving significantly")
             elif recent_trend > 0:
-                app_context += "- Focus has been slightly improving\n"
+                facts.append("focus has been slightly improving")
             elif recent_trend < -1:
-                app_context += "- Focus has decreased significantly\n"
+                facts.append("focus has decreased significantly")
             elif recent_trend < 0:
-                app_context += "- Focus has slightly decreased\n"
+                facts.append("focus has slightly decreased")
         
-        # Add personalized recommendations to context
-        recommendations = self.get_personalized_recommendations()
-        if recommendations:
-            app_context += "- Personalized recommendations:\n"
-            for rec in recommendations:
-                app_context += f"  • {rec}\n"
-        
-        # Build the main prompt
-        system_prompt = f"""You are a helpful, friendly AI assistant named Focus AI integrated into a Focus Enhancement app.
-
-Your primary purpose is to help users improve their focus, productivity, and work habits based on their session data.
-
-{app_context}
-
-The Focus Enhancement app includes:
-        1. Pomodoro Timer with customizable session lengths and break durations
-        2. App tracking that monitors productive vs distracting applications
-        3. Focus sessions that record productivity metrics
-        4. Statistics dashboard showing focus patterns
-        5. Todo list for task management
+        # Add personalized recommendations
+        facts.extend(self.get_personalized_recommendations())
+        return facts
+    
+    def request_reply(self, contents, user_text, fallback):
+        """Show a Gemini reply in a new chat message, from the cache or streamed from the API.
         
-Use a conversational, helpful tone. Be concise but informative. Always maintain context from previous messages.
-Respond to the user's specific query while considering their focus patterns and app usage."""
+        Args:
+            contents: The conversation to send
+            user_text: What to record as the user's turn once the reply is complete
+            fallback: Called instead if the request fails
+        """
+        self.cancel_reply()
+        cache_key = self.response_cache.key(
+            self.gemini_client.model, contents, GENERATION_CONFIG,
+            {"last_session_id": self.aggregates.last_session_id}
+        )
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            self.add_message(cached)
+            self.gemini_conversation_history.append({
+                "user": user_text,
+                "assistant": cached
+            })
+            return
         
-        # Try to use Gemini API if we have a key
-        if self.gemini_api_key:
-            try:
-                # Use Gemini 2.0 Flash model
-                url = f"https://generativelanguage.googleapis.com/v1/models/gemini-1.5-flash:generateContent?key={self.gemini_api_key}"
-                
-                headers = {
-                    "Content-Type": "application/json",
-                }
-                
-                # Create the content array for the Gemini API
-                contents = []
-                
-                # Add system prompt as the first message from the user
-                contents.append({
-                    "role": "user", 
-                    "parts": [{"text": f"You are the Focus AI assistant. Follow these instructions for all your responses: {system_prompt}"}]
-                })
-                
-                # Add a model acknowledgment 
-                contents.append({
-                    "role": "model", 
-                    "parts": [{"text": "I understand. I'm Focus AI, your productivity and focus assistant. I'll help you improve your work habits based on your session data and app usage patterns."}]
-                })
-                
-                # Add conversation history
-                if conversation_history:
-                    contents.extend(conversation_history)
-                
-                # Add current user message
-                contents.append({"role": "user", "parts": [{"text": user_text}]})
-                
-                data = {
-                    "contents": contents,
-                    "generationConfig": {
-                        "temperature": 0.7,
-                        "topK": 40,
-                        "topP": 0.95,
-                        "maxOutputTokens": 1024,
-                    }
-                }
-                
-                response = requests.post(url, headers=headers, data=json.dumps(data))
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_response = result["candidates"][0]["content"]["parts"][0]["text"]
-                    
-                    # Store the exchange in conversation history
-                    self.gemini_conversation_history.append({
-                        "user": user_text,
-                        "assistant": ai_response
-                    })
-                    
-                    self.add_message(ai_response)
-                    return
-                else:
-                    print(f"Gemini API error: {response.status_code} - {response.text}")
-                    
-            except Exception as e:
-                print(f"Gemini API error: {str(e)}")
-                import traceback
-                traceback.print_exc()
+        message = ChatMessage("…")
+        self.chat_display.append_message(message)
+        request_id = self.gemini_replies.request(contents)
+        self.pending_reply = PendingReply(request_id, message, user_text, fallback, cache_key)
+    
+    def cancel_reply(self):
+        """Stop the reply in flight, keeping whatever has arrived so far"""
+        if self.pending_reply is None:
+            return
+        self.gemini_replies.cancel()
+        message = self.pending_reply.message
+        self.pending_reply = None
+        if message.text == "…":
+            self.chat_display.remove_message(message)
+    
+    def take_reply(self, request_id):
+        """Return the pending reply and stop tracking it, if it is the one for request_id"""
+        reply = self.pending_reply
+        if reply is None or reply.request_id != request_id:
+            return None
+        self.pending_reply = None
+        return reply
+    
+    def on_reply_chunk(self, request_id, text):
+        """Show the reply received so far"""
+        if self.pending_reply is None or self.pending_reply.request_id != request_id:
+            return
+        self.pending_reply.message.text = text
+        self.chat_display.update_message(self.pending_reply.message)
+    
+    def on_reply_finished(self, request_id, text):
+        """Record a completed reply in the conversation history and the cache"""
+        reply = self.take_reply(request_id)
+        if reply is None:
+            return
+        if not text:
+            self.fall_back(reply, "Empty response")
+            return
+        reply.message.text = text
+        self.chat_display.update_message(reply.message)
+        self.response_cache.put(reply.cache_key, text)
         
-        # Fallback to local response generation
-        self.generate_local_response(user_text, question_intent)
+        # Store the exchange in conversation history
+        self.gemini_conversation_history.append({
+            "user": reply.user_text,
+            "assistant": text
+        })
+    
+    def on_reply_failed(self, request_id, error):
+        reply = self.take_reply(request_id)
+        if reply is not None:
+            self.fall_back(reply, error)
+    
+    def fall_back(self, reply, error):
+        """Replace a failed reply with the local fallback"""
+        print(f"Gemini API error: {error}")
+        self.chat_display.remove_message(reply.message)
+        reply.fallback()
     
     def classify_question_intent(self, user_text):
         """Classify the user's question to better understand their intent"""
-        text = user_text.lower()
-        
-        # Check if user is commenting that responses are repetitive
-        repetition_phrases = [
-            "same message", "same response", "same answer", "repetitive", 
-            "again and again", "keeps repeating", "giving same", "keeps saying",
-            "keeps telling", "always say", "always tell", "redundant"
-        ]
-        
-        for phrase in repetition_phrases:
-            if phrase in text:
-                return "complaint_repetition"
-        
-        # Define intent categories and their related keywords
-        intent_keywords = {
-            "time_question": ["when", "time", "morning", "afternoon", "evening", "night", "day time", "hour", "o'clock"],
-            "day_question": ["day", "week", "monday", "tuesday", "wednesday", "thursday", "friday", "weekend", "weekday"],
-            "duration_question": ["how long", "minutes", "length", "duration", "session", "pomodoro", "timer"],
-            "distraction_question": ["distract", "focus", "concentrate", "attention", "app block", "notification", "alert"],
-            "app_usage_question": ["how to use", "features", "app", "function", "tracker", "how does", "work"],
-            "statistics_question": ["stats", "data", "progress", "improvement", "history", "tracking", "report"],
-            "task_question": ["task", "todo", "to-do", "list", "what should I", "what to do", "priority", "work on"],
-            "break_question": ["break", "rest", "pause", "interval", "stop", "between"],
-            "tech_question": ["problem", "error", "bug", "not working", "issue", "help", "fix", "broken"],
-            "personal_question": ["you", "your", "who are", "what are", "chatbot", "assistant"]
-        }
-        
-        # Check for specific intent patterns
-        for intent, keywords in intent_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return intent
-        
-        # Check for question words
-        question_words = ["how", "what", "why", "where", "when", "who", "which", "can", "should", "could", "would"]
-        for word in question_words:
-            if text.startswith(word) or f" {word} " in text:
-                return "general_question"
-        
-        # Default intent
-        return "general_statement"
+        return classifier.classify(user_text)
     
     def generate_local_response(self, user_text, question_intent="general_statement"):
         """Generate a response locally when API is unavailable"""
@@ -861,262 +782,33 @@ What specifically would you like help with?"""
     
     def prepare_data_for_models(self, sessions):
         """Prepare the session data for model input"""
-        if not sessions or len(sessions) == 0:
-            print("No session data available for model preparation")
-            return None, None
-            
-        data = []
-        for session in sessions:
-            # Unpack session data 
-            session_id, date, day, start_time, end_time, task_type, app_switch_count, distraction_duration, total_focus_duration, focus_score, productivity_percentage, break_duration = session
-            
-            # Check for any invalid data
-            if None in [date, day, start_time, total_focus_duration, focus_score, productivity_percentage]:
-                print(f"Warning: Session {session_id} has missing critical data, skipping")
-                continue
-            
-            session_data = {
-                'Date': date,
-                'Day': day.lower() if isinstance(day, str) else 'monday',  # Ensure lowercase
-                'Start Time': start_time,
-                'End Time': end_time,
-                'Task Type': task_type.lower() if isinstance(task_type, str) else 'studying',  # Ensure lowercase
-                'App Switch Count': app_switch_count if app_switch_count is not None else 0,
-                'Distraction Duration (mins)': distraction_duration if distraction_duration is not None else 0,
-                'Total Focus Duration (mins)': total_focus_duration,
-                'Focus Score (0-10)': focus_score,
-                'Productivity %': productivity_percentage,
-            }
-            data.append(session_data)
-        
-        # Check if we have enough valid sessions
-        if len(data) < 3:
-            print("Not enough valid sessions for model preparation")
-            return None, None
-        
-        df = pd.DataFrame(data)
-        
-        # Convert date strings to datetime objects
-        try:
-            df['Date'] = pd.to_datetime(df['Date'])
-        except:
-            try:
-                df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
-            except Exception as e:
-                print(f"Warning: Could not parse dates: {str(e)}")
-                # Create a dummy date column to avoid errors
-                df['Date'] = pd.to_datetime('2023-01-01')
-        
-        # Add Hour column
-        try:
-            df['Hour'] = pd.to_datetime(df['Start Time'], format='%H:%M:%S').dt.hour
-        except:
-            try:
-                df['Hour'] = pd.to_datetime(df['Start Time'], format='%H:%M').dt.hour
-            except:
-                    df['Hour'] = df['Start Time'].apply(lambda x: 
-                        pd.to_datetime(x, format='%H:%M:%S').hour if ':' in str(x) else 9)
-        
-        # Calculate session duration and length (from Pomodoro notebook)
-        df['Session Duration (mins)'] = df['Total Focus Duration (mins)'] + df['Distraction Duration (mins)']
-        
-        # Round session length to multiples of 15, within 15-90 minute bounds
-        df['Session Length'] = df['Session Duration (mins)'].apply(
-            lambda x: min(90, max(15, 15 * round(x/15)))
-        )
-        
-        # Preprocessing for day model (from day_time notebook)
-        last_date = df['Date'].max()
-        df['Days Ago'] = (last_date - df['Date']).dt.days
-        df['Weight'] = df['Days Ago'].apply(self.assign_weight)
-        df['Weighted Focus Score'] = df['Focus Score (0-10)'] * df['Weight']
-        df['Weighted Productivity'] = df['Productivity %'] * df['Weight']
-        
-        # Encode categorical variables
-        day_encoder = LabelEncoder()
-        task_encoder = LabelEncoder()
-        df['Day_encoded'] = day_encoder.fit_transform(df['Day'])
-        df['Task_Type_encoded'] = task_encoder.fit_transform(df['Task Type'])
-        
-        # Calculate combined score metric
-        df['combined_score'] = df['Focus Score (0-10)'] * df['Productivity %'] / 10
-        
-        # Add productivity label
-        df['Productivity_Label'] = df['Productivity %'].apply(
-            lambda x: 'High' if x >= 75 else ('Mid' if x >= 50 else 'Low')
-        )
-        
-        print(f"Successfully prepared dataset with {len(df)} sessions")
+        df, day_encoder = prepare_sessions(sessions, self.encoders)
+        if df is not None:
+            print(f"Successfully prepared dataset with {len(df)} sessions")
         return df, day_encoder
-    
-    def assign_weight(self, days):
-        """Assign weight based on how recent the session is"""
-        if days <= 7:
-            return 1.0
-        elif days <= 14:
-            return 0.75
-        elif days <= 21:
-            return 0.5
-        else:
-            return 0.25
             
-    def predict_best_day(self, data_tuple):
-        """Predict the best day for productivity using the model"""
+    def get_model_predictions(self):
+        """Get predictions from the trained models, falling back to the session averages"""
         try:
-            df, day_encoder = data_tuple
-            if df is None:
-                return "Monday"  # Default fallback
-                
-            # Create feature set for day model
-            features = ['Day_encoded', 'App Switch Count', 
-                       'Distraction Duration (mins)', 'Total Focus Duration (mins)', 
-                       'Weighted Focus Score', 'Weighted Productivity']
-            
-            # Ensure all required features are present
-            for feature in features:
-                if feature not in df.columns:
-                    df[feature] = 0
-            
-            # Group by day and calculate average productivity
-            day_stats = df.groupby('Day').agg({
-                'Weighted Focus Score': 'mean',
-                'Weighted Productivity': 'mean',
-                'Focus Score (0-10)': 'mean',
-                'Productivity %': 'mean'
-            }).reset_index()
-            
-            # Find the best day based on combined metrics
-            day_stats['overall_score'] = (
-                day_stats['Weighted Focus Score'] * 
-                day_stats['Weighted Productivity'] * 
-                day_stats['Focus Score (0-10)'] * 
-                day_stats['Productivity %']
-            )
-            
-            best_day = day_stats.loc[day_stats['overall_score'].idxmax(), 'Day']
-            return best_day.capitalize()
-            
-        except Exception as e:
-            print(f"Error predicting best day: {str(e)}")
-            return "Monday"  # Default fallback
-    
-    def predict_best_time(self, data_tuple):
-        """Predict the best time for productivity using the model"""
-        try:
-            df, _ = data_tuple
-            if df is None:
-                return "9:00 AM"  # Default fallback
-                
-            # Group by hour and calculate average metrics
-            hour_stats = df.groupby('Hour').agg({
-                'Focus Score (0-10)': 'mean',
-                'Productivity %': 'mean',
-                'Weighted Focus Score': 'mean',
-                'Weighted Productivity': 'mean'
-            }).reset_index()
-            
-            # Calculate overall score for each hour
-            hour_stats['overall_score'] = (
-                hour_stats['Focus Score (0-10)'] * 
-                hour_stats['Productivity %'] * 
-                hour_stats['Weighted Focus Score'] * 
-                hour_stats['Weighted Productivity']
-            )
-            
-            # Find the best hour
-            best_hour = int(hour_stats.loc[hour_stats['overall_score'].idxmax(), 'Hour'])
-            
-            # Format as AM/PM time
-            if best_hour == 0:
-                return "12:00 AM"
-            elif best_hour < 12:
-                return f"{best_hour}:00 AM"
-            elif best_hour == 12:
-                return "12:00 PM"
-            else:
-                return f"{best_hour-12}:00 PM"
-                
-        except Exception as e:
-            print(f"Error predicting best time: {str(e)}")
-            return "9:00 AM"  # Default fallback
-    
-    def predict_best_length(self, data_tuple):
-        """Predict the best session length using the pomodoro model"""
-        try:
-            df, _ = data_tuple
-            if df is None:
-                print("Warning: Using default session length (25 min) due to missing data")
-                return 25  # Default fallback
-                
-            # Verify Session Length column exists and has valid values
-            if 'Session Length' not in df.columns or df['Session Length'].isna().all():
-                print("Warning: Session Length column is missing or all values are NaN")
-                return 25  # Default fallback
-            
-            # Check that there are multiple session lengths to compare
-            unique_lengths = df['Session Length'].unique()
-            if len(unique_lengths) < 2:
-                print(f"Warning: Only one session length in data ({unique_lengths[0]})")
-                # Still return the single value if it exists and is valid
-                if len(unique_lengths) == 1 and 15 <= unique_lengths[0] <= 90:
-                    return int(unique_lengths[0])
-                return 25  # Default fallback
-                
-            # Group by session length and calculate average metrics
-            length_stats = df.groupby('Session Length').agg({
-                'Focus Score (0-10)': 'mean',
-                'Productivity %': 'mean',
-                'Weighted Focus Score': 'mean',
-                'Weighted Productivity': 'mean'
-            }).reset_index()
-            
-            # Calculate overall score for each length
-            length_stats['overall_score'] = (
-                length_stats['Focus Score (0-10)'] * 
-                length_stats['Productivity %'] * 
-                length_stats['Weighted Focus Score'] * 
-                length_stats['Weighted Productivity']
-            )
-            
-            # Find the best length
-            best_length = int(length_stats.loc[length_stats['overall_score'].idxmax(), 'Session Length'])
-            
-            # Ensure the length is within reasonable bounds and a multiple of 15
-            best_length = max(15, min(90, best_length))
-            best_length = 15 * round(best_length/15)  # Round to nearest 15 minutes
-            
-            print(f"Predicted optimal session length: {best_length} minutes")
-            return int(best_length)
-            
-        except Exception as e:
-            print(f"Error predicting best length: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return 25  # Default Pomodoro length
-    
-    def get_model_predictions(self, data_tuple):
-        """Get predictions from all three models"""
-        try:
-            if data_tuple[0] is None:
+            if len(self.aggregates) < MIN_SESSIONS:
                 return {
                     'best_time': "9:00 AM",
                     'best_length': 25,
                     'best_day': "Monday"
                 }
-                
-            # Get best day prediction
-            best_day = self.predict_best_day(data_tuple)
             
-            # Get best time prediction
-            best_time = self.predict_best_time(data_tuple)
-            
-            # Get best session length
-            best_length = self.predict_best_length(data_tuple)
+            if self.models_available:
+                try:
+                    return self.get_recommendation_engine().recommend(self.build_user_profile())
+                except Exception as e:
+                    print(f"Model inference failed, using session averages: {str(e)}")
             
+            # Best day, hour and session length by recency-weighted focus x productivity
+            best_hour = self.aggregates.best_hour()
             return {
-                'best_time': best_time,
-                'best_length': best_length,
-                'best_day': best_day
+                'best_time': format_hour(best_hour) if best_hour is not None else "9:00 AM",
+                'best_length': self.aggregates.best_length() or 25,
+                'best_day': self.aggregates.best_day() or "Monday"
             }
         except Exception as e:
             print(f"Error getting predictions: {str(e)}")
@@ -1128,8 +820,45 @@ What specifically would you like help with?"""
                 'best_day': "Monday"
             }
     
+    def get_recommendation_engine(self):
+        """Return the engine that scores candidate sessions, creating it on first use"""
+        if self.recommendation_engine is None:
+            self.recommendation_engine = RecommendationEngine(self.personal_models or self.models)
+        return self.recommendation_engine
+    
+    def notify_models_loaded(self):
+        try:
+            self.models_loaded.emit()
+        except RuntimeError:
+            pass  # The widget was deleted (e.g. on logout) while the models loaded
+    
+    def on_models_loaded(self):
+        """Fill in the tab now that the models can be used without waiting"""
+        self.models_available = True
+        self.personalizer.refresh()
+        if self.welcome_pending:
+            self.refresh_suggestions()
+        elif self.predictions is not None:
+            self.predictions = self.get_model_predictions()
+    
+    def on_personal_models_ready(self, predictors):
+        """Swap in the models fine-tuned on this user's sessions"""
+        self.personal_models = PersonalModels(predictors, self.models)
+        # The next recommendation builds a new engine around them
+        self.recommendation_engine = None
+        if self.predictions is not None:
+            self.predictions = self.get_model_predictions()
+    
+    def build_user_profile(self):
+        """Summarise the user's sessions into the inputs every candidate session shares"""
+        return UserProfile(
+            app_switches_per_min=self.aggregates.app_switches_per_min(),
+            focus_score=self.aggregates.overall('focus_score'),
+            productivity=self.aggregates.overall('productivity')
+        )
+    
     def generate_initial_message(self, predictions, df):
-        """Generate the initial welcome message with personalized suggestions"""
+        """Show the initial welcome message with personalized suggestions, streamed from Gemini if available"""
         try:
             # Get some statistics to enrich the prompt
             avg_productivity = df['Productivity %'].mean()
@@ -1163,49 +892,24 @@ What specifically would you like help with?"""
             
             # Try to use Gemini API if we have a key
             if self.gemini_api_key:
-                try:
-                    # Use Gemini 2.0 Flash model
-                    url = f"https://generativelanguage.googleapis.com/v1/models/gemini-1.5-flash:generateContent?key={self.gemini_api_key}"
-                    
-                    headers = {
-                        "Content-Type": "application/json",
-                    }
-                    
-                    data = {
-                        "contents": [
-                            {
-                                "parts": [
-                                    {
-                                        "text": prompt
-                                    }
-                                ]
-                            }
-                        ],
-                        "generationConfig": {
-                            "temperature": 0.7,
-                            "topK": 40,
-                            "topP": 0.95,
-                            "maxOutputTokens": 1024,
-                        }
-                    }
-                    
-                    # Make the API call
-                    response = requests.post(url, headers=headers, data=json.dumps(data))
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        # Extract text from the response
-                        return result["candidates"][0]["content"]["parts"][0]["text"]
-                    else:
-                        print(f"Gemini API error: {response.status_code} - {response.text}")
-                except Exception as e:
-                    print(f"Gemini API error: {str(e)}")
-            
-            # Default message if API fails
-            return self.generate_default_welcome(predictions)
+                self.request_reply([{"parts": [{"text": prompt}]}], "Hi",
+                                   lambda: self.show_default_welcome(predictions))
+                return
                 
         except Exception as e:
-            return self.generate_default_welcome(predictions)
+            pass  # Not enough session data for the statistics
+        
+        # Default message if API is unavailable
+        self.show_default_welcome(predictions)
+    
+    def show_default_welcome(self, predictions):
+        """Show the default welcome message and record it as the first exchange"""
+        welcome = self.generate_default_welcome(predictions)
+        self.gemini_conversation_history.append({
+            "user": "Hi",
+            "assistant": welcome
+        })
+        self.add_message(welcome)
     
     def generate_default_welcome(self, predictions):
         """Generate a default welcome message when API is unavailable"""
@@ -1226,8 +930,10 @@ I can suggest personalized strategies to help you work with your natural rhythms
     def refresh_suggestions(self):
         """Start a new chat with initial suggestions"""
         # Clear chat history
-        self.chat_history = []
+        self.cancel_reply()
+        self.chat_display.clear_messages()
         self.gemini_conversation_history = []  # Clear Gemini conversation history
+        self.prompt_builder.reset()
         
         # Get last 10 sessions
         sessions = self.db.get_user_sessions(self.user_id, limit=10)
@@ -1240,22 +946,21 @@ In the meantime, I can still answer questions about focus and productivity techn
             self.add_message(welcome)
             return
         
+        if not self.models_available and len(self.aggregates) >= MIN_SESSIONS:
+            # Filled in by on_models_loaded; the chat works from the session averages meanwhile
+            self.predictions = self.get_model_predictions()
+            self.welcome_pending = True
+            self.add_message("⏳ Loading your recommendation models...")
+            return
+        self.welcome_pending = False
+        
         # Prepare data and get predictions
         try:
             data_tuple = self.prepare_data_for_models(sessions)
-            self.predictions = self.get_model_predictions(data_tuple)
+            self.predictions = self.get_model_predictions()
             
-            # Generate initial message with context
-            initial_message = self.generate_initial_message(self.predictions, data_tuple[0])  # Pass the DataFrame
-            
-            # Store initial message in Gemini conversation history
-            self.gemini_conversation_history.append({
-                "user": "Hi",
-                "assistant": initial_message
-            })
-            
-            # Add to chat
-            self.add_message(initial_message)
+            # Show initial message with context
+            self.generate_initial_message(self.predictions, data_tuple[0])  # Pass the DataFrame
         except Exception as e:
             print(f"Error generating initial message: {str(e)}")
             import traceback
@@ -1268,216 +973,42 @@ What would you like to know about focus, productivity, or work habits?"""
             self.add_message(welcome) 
 
     def load_models(self):
-        """Load and initialize the models"""
+        """Make sure the models are loading and check for the Gemini API key"""
+        # Models are loaded once per process by the shared registry; this is
+        # normally already done in the background by the time the tab opens
+        self.models = models
+        self.models.load_in_background()
+        self.models_available = self.models.loaded
+        if not self.models_available:
+            # Queued, so the tab is built before the slot runs even if loading ends meanwhile
+            self.models_loaded.connect(self.on_models_loaded, Qt.QueuedConnection)
+            self.models.when_loaded(self.notify_models_loaded)
         try:
-            # Load the time model
-            with open('finalised/Best_Time.pkl', 'rb') as f:
-                self.best_time_model = pickle.load(f)
-            
-            # Load the length model
-            with open('finalised/Best_Length.pkl', 'rb') as f:
-                self.best_length_model = pickle.load(f)
-            
-            # Load the day model
-            with open('finalised/Best_Day.pkl', 'rb') as f:
-                self.best_day_model = pickle.load(f)
-            
-            # Initialize model dictionaries if needed
-            if isinstance(self.best_day_model, dict) and "MLP" in self.best_day_model:
-                self.best_day_model = self.best_day_model["MLP"]
-            
-            if isinstance(self.best_time_model, dict) and "MLP" in self.best_time_model:
-                self.best_time_model = self.best_time_model["MLP"]
-            
-            if isinstance(self.best_length_model, dict):
-                if "model" in self.best_length_model:
-                    self.best_length_model = self.best_length_model["model"]
-                elif "DecisionTree" in self.best_length_model:
-                    self.best_length_model = self.best_length_model["DecisionTree"]
-                else:
-                    self.best_length_model = next(iter(self.best_length_model.values()))
-            
-            # Check for Gemini API key
-            self.gemini_api_key = os.getenv('GEMINI_API_KEY')
-            if not self.gemini_api_key:
-                self.gemini_api_key = ""
-                QMessageBox.warning(self, "Warning", "Gemini API key not found. Add GEMINI_API_KEY to your .env file for AI-powered suggestions using Gemini 2.0.")
-            
+            self.encoders = load_encoders(self.models)
         except Exception as e:
+            self.encoders = None
             QMessageBox.critical(self, "Error", f"Failed to load models: {str(e)}")
-            import traceback
-            traceback.print_exc() 
-
-    def prepare_current_data(self):
-        """Get the last 10 sessions and prepare data for predictions"""
-        sessions = self.db.get_user_sessions(self.user_id, limit=10)  # Get last 10 sessions
-        if not sessions or len(sessions) < 3:  # Require at least 3 sessions for meaningful predictions
-            print("Not enough session data for meaningful predictions (need at least 3 sessions)")
-            return None, None
-            
-        # Prepare the data using the existing method
-        data_tuple = self.prepare_data_for_models(sessions)
-        
-        # Verify the data has been properly processed
-        df, encoder = data_tuple
-        if df is None or df.empty or 'Session Length' not in df.columns:
-            print("Error: Dataset was not properly prepared or is missing required columns")
-            return None, None
-            
-        print(f"Successfully prepared data from {len(sessions)} sessions for model prediction")
-        return df, encoder
-
-    def predict_best_length(self, data_tuple):
-        """Predict the best session length using the pomodoro model"""
-        try:
-            df, _ = data_tuple
-            if df is None:
-                print("Warning: Using default session length (25 min) due to missing data")
-                return 25  # Default fallback
-                
-            # Verify Session Length column exists and has valid values
-            if 'Session Length' not in df.columns or df['Session Length'].isna().all():
-                print("Warning: Session Length column is missing or all values are NaN")
-                return 25  # Default fallback
-            
-            # Check that there are multiple session lengths to compare
-            unique_lengths = df['Session Length'].unique()
-            if len(unique_lengths) < 2:
-                print(f"Warning: Only one session length in data ({unique_lengths[0]})")
-                # Still return the single value if it exists and is valid
-                if len(unique_lengths) == 1 and 15 <= unique_lengths[0] <= 90:
-                    return int(unique_lengths[0])
-                return 25  # Default fallback
-                
-            # Group by session length and calculate average metrics
-            length_stats = df.groupby('Session Length').agg({
-                'Focus Score (0-10)': 'mean',
-                'Productivity %': 'mean',
-                'Weighted Focus Score': 'mean',
-                'Weighted Productivity': 'mean'
-            }).reset_index()
-            
-            # Calculate overall score for each length
-            length_stats['overall_score'] = (
-                length_stats['Focus Score (0-10)'] * 
-                length_stats['Productivity %'] * 
-                length_stats['Weighted Focus Score'] * 
-                length_stats['Weighted Productivity']
-            )
-            
-            # Find the best length
-            best_length = int(length_stats.loc[length_stats['overall_score'].idxmax(), 'Session Length'])
-            
-            # Ensure the length is within reasonable bounds and a multiple of 15
-            best_length = max(15, min(90, best_length))
-            best_length = 15 * round(best_length/15)  # Round to nearest 15 minutes
-            
-            print(f"Predicted optimal session length: {best_length} minutes")
-            return int(best_length)
-            
-        except Exception as e:
-            print(f"Error predicting best length: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return 25  # Default Pomodoro length
-
-    def prepare_data_for_models(self, sessions):
-        """Prepare the session data for model input"""
-        if not sessions or len(sessions) == 0:
-            print("No session data available for model preparation")
-            return None, None
-            
-        data = []
-        for session in sessions:
-            # Unpack session data 
-            session_id, date, day, start_time, end_time, task_type, app_switch_count, distraction_duration, total_focus_duration, focus_score, productivity_percentage, break_duration = session
-            
-            # Check for any invalid data
-            if None in [date, day, start_time, total_focus_duration, focus_score, productivity_percentage]:
-                print(f"Warning: Session {session_id} has missing critical data, skipping")
-                continue
-                
-            session_data = {
-                'Date': date,
-                'Day': day.lower() if isinstance(day, str) else 'monday',  # Ensure lowercase
-                'Start Time': start_time,
-                'End Time': end_time,
-                'Task Type': task_type.lower() if isinstance(task_type, str) else 'studying',  # Ensure lowercase
-                'App Switch Count': app_switch_count if app_switch_count is not None else 0,
-                'Distraction Duration (mins)': distraction_duration if distraction_duration is not None else 0,
-                'Total Focus Duration (mins)': total_focus_duration,
-                'Focus Score (0-10)': focus_score,
-                'Productivity %': productivity_percentage,
-            }
-            data.append(session_data)
-        
-        # Check if we have enough valid sessions
-        if len(data) < 3:
-            print("Not enough valid sessions for model preparation")
-            return None, None
-            
-        df = pd.DataFrame(data)
-        
-        # Convert date strings to datetime objects
-        try:
-            df['Date'] = pd.to_datetime(df['Date'])
-        except:
-            try:
-                df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
-            except Exception as e:
-                print(f"Warning: Could not parse dates: {str(e)}")
-                # Create a dummy date column to avoid errors
-                df['Date'] = pd.to_datetime('2023-01-01')
-        
-        # Add Hour column
-        try:
-            df['Hour'] = pd.to_datetime(df['Start Time'], format='%H:%M:%S').dt.hour
-        except:
-            try:
-                df['Hour'] = pd.to_datetime(df['Start Time'], format='%H:%M').dt.hour
-            except:
-                df['Hour'] = df['Start Time'].apply(lambda x: 
-                    pd.to_datetime(x, format='%H:%M:%S').hour if ':' in str(x) else 9)
-        
-        # Calculate session duration and length (from Pomodoro notebook)
-        df['Session Duration (mins)'] = df['Total Focus Duration (mins)'] + df['Distraction Duration (mins)']
-        
-        # Round session length to multiples of 15, within 15-90 minute bounds
-        df['Session Length'] = df['Session Duration (mins)'].apply(
-            lambda x: min(90, max(15, 15 * round(x/15)))
-        )
         
-        # Preprocessing for day model (from day_time notebook)
-        last_date = df['Date'].max()
-        df['Days Ago'] = (last_date - df['Date']).dt.days
-        df['Weight'] = df['Days Ago'].apply(self.assign_weight)
-        df['Weighted Focus Score'] = df['Focus Score (0-10)'] * df['Weight']
-        df['Weighted Productivity'] = df['Productivity %'] * df['Weight']
-        
-        # Encode categorical variables
-        day_encoder = LabelEncoder()
-        task_encoder = LabelEncoder()
-        df['Day_encoded'] = day_encoder.fit_transform(df['Day'])
-        df['Task_Type_encoded'] = task_encoder.fit_transform(df['Task Type'])
-        
-        # Calculate combined score metric
-        df['combined_score'] = df['Focus Score (0-10)'] * df['Productivity %'] / 10
-        
-        # Add productivity label
-        df['Productivity_Label'] = df['Productivity %'].apply(
-            lambda x: 'High' if x >= 75 else ('Mid' if x >= 50 else 'Low')
+        # Copies of the models fitted to this user's own history, in a worker process
+        self.personalizer = Personalizer(self.db, self.user_id, self.models, self)
+        self.personalizer.models_ready.connect(self.on_personal_models_ready)
+        self.personalizer.refresh()
+        
+        # Check for Gemini API key
+        self.gemini_api_key = os.getenv('GEMINI_API_KEY')
+        if not self.gemini_api_key:
+            self.gemini_api_key = ""
+            QMessageBox.warning(self, "Warning", "Gemini API key not found. Add GEMINI_API_KEY to your .env file for AI-powered suggestions using Gemini 2.0.")
+        
+        # Replies are streamed on a worker thread so a slow API never blocks the app
+        self.gemini_client = GeminiClient(
+            self.gemini_api_key,
+            base_url=os.getenv('GEMINI_BASE_URL', GEMINI_BASE_URL),
+            read_timeout=float(os.getenv('GEMINI_TIMEOUT', READ_TIMEOUT))
         )
-        
-        print(f"Successfully prepared dataset with {len(df)} sessions")
-        return df, day_encoder
-    
-    def assign_weight(self, days):
-        """Assign weight based on how recent the session is"""
-        if days <= 7:
-            return 1.0
-        elif days <= 14:
-            return 0.75
-        elif days <= 21:
-            return 0.5
-        else:
-            return 0.25 
\ No newline at end of file
+        self.gemini_replies = GeminiReplies(self.gemini_client, self)
+        self.gemini_replies.chunk_received.connect(self.on_reply_chunk)
+        self.gemini_replies.finished.connect(self.on_reply_finished)
+        self.gemini_replies.failed.connect(self.on_reply_failed)
+        self.response_cache = ResponseCache(self.db, self.user_id)
+        self.prompt_builder = PromptBuilder()
@@ -0,0 +1,62 @@
+"""GeminiClient against a local stand-in for streamGenerateContent."""
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from gemini_client import GeminiClient
+
+REPLY = ["✨ Your optimal focus time is ", "10:00 AM at the café 📅"]
+
+
+class StreamingStub(BaseHTTPRequestHandler):
+    """Streams REPLY as server-sent events in raw UTF-8, with no charset, as the API does."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        body = b"".join(
+            b"data: " + json.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]},
+                                   ensure_ascii=False).encode("utf-8") + b"\r\n\r\n"
+            for text in REPLY
+        )
+        # Chunks of a few bytes split the multi-byte characters between reads
+        for i in range(0, len(body), 5):
+            self.write_chunk(body[i:i + 5])
+        self.write_chunk(b"")
+
+    def write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamingStub)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_decodes_non_ascii_text_as_utf8(base_url):
+    client = GeminiClient("test", base_url=base_url, max_retries=0)
+    try:
+        chunks = list(client.stream([{"parts": [{"text": "Hi"}]}]))
+    finally:
+        client.close()
+    assert chunks == REPLY
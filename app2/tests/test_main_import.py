@@ -0,0 +1,21 @@
+"""main.py must be importable without side effects.
+
+Worker processes started with the spawn method (the Personalizer's) import
+the app's main module as __mp_main__, so anything main.py does outside its
+__main__ guard runs in every worker.
+"""
+import os
+import runpy
+import threading
+
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_import_as_spawn_worker_starts_no_tracker():
+    pytest.importorskip("win32gui")  # app_tracker, imported by main.py, is Windows-only
+    before = set(threading.enumerate())
+    runpy.run_path(os.path.join(APP_DIR, "main.py"), run_name="__mp_main__")
+    started = [thread for thread in threading.enumerate() if thread not in before]
+    assert started == []
@@ -2,7 +2,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QPushButton, QListWidget, QListWidgetItem,
                              QMessageBox, QFrame, QTextEdit, QDialog, QFormLayout,
                              QComboBox)
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
 
 class TaskDialog(QDialog):
@@ -76,6 +76,19 @@ class TodoWidget(QWidget):
         add_task_button.clicked.connect(self.add_task)
         main_layout.addWidget(add_task_button)
         
+        # Search bar for tasks
+        self.task_search_bar = QLineEdit()
+        self.task_search_bar.setPlaceholderText("Search tasks...")
+        self.task_search_bar.setClearButtonEnabled(True)
+        self.task_search_bar.textChanged.connect(self.on_search_text_changed)
+        main_layout.addWidget(self.task_search_bar)
+        
+        # Wait for a short pause in typing before querying the database
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.load_tasks)
+        
         # Task list
         self.task_list = QListWidget()
         self.task_list.setAlternatingRowColors(True)
@@ -106,17 +119,41 @@ class TodoWidget(QWidget):
         # Set the layout
         self.setLayout(main_layout)
         
+    def on_search_text_changed(self, text):
+        """Restart the search delay whenever the query changes."""
+        self.search_timer.start()
+    
     def load_tasks(self):
-        """Load active tasks from the database."""
+        """Load active tasks from the database, filtered by the search bar."""
         self.task_list.clear()
-        tasks = self.db.get_tasks(self.user_id, status="active")
+        query = self.task_search_bar.text().strip()
+        if query:
+            tasks = self.db.search_tasks(self.user_id, query, limit=200)
+        else:
+            tasks = self.db.get_tasks(self.user_id, status="active")
+        
+        # Focus totals for every task come from one aggregate query
+        task_stats = self.db.get_task_focus_stats(self.user_id, status="active")
         
         for task_id, title, description, created_at in tasks:
-            item = QListWidgetItem(title)
+            item = QListWidgetItem(self.format_task_text(title, task_stats.get(task_id)))
             item.setData(Qt.UserRole, task_id)
             item.setData(Qt.UserRole + 1, description)
+            item.setData(Qt.UserRole + 2, title)
             self.task_list.addItem(item)
     
+    def format_task_text(self, title, stats):
+        """Return the list text for a task, with its focus totals if it has any sessions."""
+        if not stats or stats[0] == 0:
+            return title
+        
+        session_count, total_focus, avg_score = stats
+        sessions_str = "1 session" if session_count == 1 else f"{session_count} sessions"
+        summary = f"{sessions_str} · {total_focus:.0f} min focused"
+        if avg_score is not None:
+            summary += f" · avg score {avg_score:.1f}"
+        return f"{title}\n    {summary}"
+    
     def add_task(self):
         """Open dialog to add a new task."""
         dialog = TaskDialog(self)
@@ -195,7 +232,7 @@ class TodoWidget(QWidget):
             return
         
         task_id = current_item.data(Qt.UserRole)
-        title = current_item.text()
+        title = current_item.data(Qt.UserRole + 2)
         description = current_item.data(Qt.UserRole + 1)
         
         dialog = TaskDialog(self, title, description)
@@ -0,0 +1,342 @@
+"""Train the Suggestions models from the datasets in finalised/dataset.
+
+Replaces the Final_day_time, Final_Pomodoro and Final_Anomly notebooks. The
+datasets are read in parallel from their columnar cache (see
+dataset_cache) and go through one preprocessing pipeline,
+features.add_features, the same one the app runs on a user's sessions. The
+models are then trained in a process pool, one model per process. Each run
+can also train on the app's own sessions exported to the feature_store
+(--with-sessions). Each run writes its artifacts to a new version directory with a metadata.json
+(features, encoders, metrics, training time and dataset checksums) and
+points finalised/models.json at them, so the app loads them at next start.
+
+Usage, from the app2 directory:
+    python train.py [--jobs N] [--version VERSION] [--no-publish]
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+import dataset_cache
+from dataset_cache import DATASET_DIR, source_sha256
+from features import FixedEncoder, add_features, lowercase_labels
+from model_registry import MODEL_DIR, MANIFEST_FORMAT, PREDICTORS
+
+# The datasets the notebooks trained on; the distraction model only used
+# the student logs
+STUDENT_DATASETS = [f"student{i}.csv" for i in range(1, 10)]
+DATASETS = STUDENT_DATASETS + ["focus.xlsx", "focus_data.csv"]
+
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Task types the encoded models know, in LabelEncoder order. Fixed rather
+# than fitted on the data, so training on the app's sessions (which add
+# "meeting" and "other") doesn't change the encoders the models not
+# retrained were fitted with; other labels count as "others". Not the
+# same list as session_aggregates.TASK_TYPES, the types the forms offer.
+MODEL_TASK_TYPES = ["coding", "others", "reading", "studying", "writing"]
+
+# Artifact file names the app already knows, kept so older manifests still line up
+ARTIFACT_FILES = {
+    "best_day": "Best_Day.pkl",
+    "best_time": "Best_Time.pkl",
+    "best_length": "Best_Length.pkl",
+    "anomaly": "Anomly_detection.pkl",
+}
+
+# Fixed seeds so the same datasets always give the same artifacts
+RANDOM_STATE = 42
+
+# Share of each model's rows held out to compute its metrics
+TEST_SIZE = 0.2
+
+
+def normalize(df, name):
+    """Lowercase a dataset's day and task type labels and tag its rows with name."""
+    df['Day'] = lowercase_labels(df['Day'], 'monday')
+    df['Task Type'] = lowercase_labels(df['Task Type'], 'studying')
+    df['Dataset'] = name
+    return df
+
+
+def load_dataset(path):
+    return normalize(dataset_cache.load_dataset(path), os.path.basename(path))
+
+
+def load_user_sessions(store):
+    """The sessions in a feature_store.SessionStore as one dataset per user."""
+    return [normalize(sessions.reset_index(drop=True), f"user{user_id}")
+            for user_id, sessions in store.read().groupby("user_id")]
+
+
+def load_datasets(dataset_dir, names, jobs):
+    """Read the datasets on a thread pool, in the order given."""
+    paths = [os.path.join(dataset_dir, name) for name in names]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(load_dataset, paths))
+
+
+def prepare(datasets):
+    """Add the model features to every dataset and combine them.
+
+    Features are added per dataset, so recency weights count back from each
+    user's own last session as they do in the app. Returns the combined
+    frame and the task type and day LabelEncoders the encoded models use.
+    """
+    from sklearn.preprocessing import LabelEncoder
+
+    # Object labels, like the encoders fitted on dataset columns before
+    task_type_encoder = LabelEncoder().fit(pd.Series(MODEL_TASK_TYPES, dtype=object))
+    day_encoder = LabelEncoder().fit(DAYS)
+    encoders = {
+        'day': FixedEncoder(DAYS),
+        'task_type': FixedEncoder(MODEL_TASK_TYPES, default='others'),
+    }
+    df = pd.concat([add_features(df, encoders) for df in datasets], ignore_index=True)
+
+    # Day_encoded follows DAYS (Monday = 0); the encoded models expect
+    # the alphabetical codes of their LabelEncoders instead
+    df['Task Type Code'] = encoders['task_type'].encode(df['Task Type'])
+    df['Day Code'] = day_encoder.transform(df['Day'])
+    return df, task_type_encoder, day_encoder
+
+
+def focus_labels(df):
+    """'Low', 'Mid' or 'High' by tercile of the averaged focus score and productivity."""
+    combined = 0.5 * df['Focus Score (0-10)'] + 0.5 * df['Productivity %']
+    return pd.qcut(combined, q=3, labels=['Low', 'Mid', 'High']).astype(str)
+
+
+def training_data(name, df):
+    """The (X, y) frames a model is trained on, with columns in its FEATURES order."""
+    features = PREDICTORS[name].FEATURES
+    if name in ("best_day", "best_time"):
+        df = df.fillna(0)
+        return df[features], focus_labels(df)
+
+    df = df.assign(**{'Task Type': df['Task Type Code'], 'Day': df['Day Code']})
+    if name == "best_length":
+        # Sessions of 7.5 minutes or less round to no length at all
+        df = df[df['Session Duration (mins)'] > 7.5]
+        df = df.dropna(subset=features)
+        return df[features], df['Session Length'].astype(int)
+
+    df = df[df['Dataset'].isin(STUDENT_DATASETS)].dropna(subset=features)
+    return df[features], df['Distraction Duration (mins)']
+
+
+def build_estimator(name):
+    if name in ("best_day", "best_time"):
+        from sklearn.neural_network import MLPClassifier
+        return MLPClassifier(max_iter=1000, random_state=RANDOM_STATE)
+    if name == "best_length":
+        from sklearn.tree import DecisionTreeClassifier
+        return DecisionTreeClassifier(random_state=1, class_weight='balanced')
+    from sklearn.neural_network import MLPRegressor
+    return MLPRegressor(hidden_layer_sizes=(64, 32), max_iter=1000, random_state=RANDOM_STATE)
+
+
+def score(name, model, X, y):
+    from sklearn import metrics
+    predicted = model.predict(X)
+    if name == "anomaly":
+        return {
+            "mae": round(float(metrics.mean_absolute_error(y, predicted)), 4),
+            "r2": round(float(metrics.r2_score(y, predicted)), 4),
+        }
+    return {
+        "accuracy": round(float(metrics.accuracy_score(y, predicted)), 4),
+        "f1_macro": round(float(metrics.f1_score(y, predicted, average='macro')), 4),
+    }
+
+
+def train_model(name, X, y, task_type_encoder, day_encoder):
+    """Score a model on a held-out split, then fit it on all rows.
+
+    Runs in a worker process. Returns (name, estimator name, pickled
+    artifact, metrics, seconds). The artifact is pickled here, straight
+    after fitting: a model that has been through the pool's own pickling
+    shares different strings and would not give the same bytes every run.
+    """
+    import warnings
+    from sklearn.exceptions import ConvergenceWarning
+    from sklearn.model_selection import train_test_split
+
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+        metrics = score(name, build_estimator(name).fit(X_train, y_train), X_test, y_test)
+        model = build_estimator(name).fit(X, y)
+    metrics["rows"] = len(X)
+    data = pickle.dumps(artifact(name, model, task_type_encoder, day_encoder))
+    return name, type(model).__name__, data, metrics, round(time.perf_counter() - start, 2)
+
+
+def artifact(name, model, task_type_encoder, day_encoder):
+    """The object pickled for a model, in the layout its Predictor reads."""
+    predictor = PREDICTORS[name]
+    if not hasattr(predictor, "ENCODER_KEYS"):
+        return model
+    task_type_key, day_key = predictor.ENCODER_KEYS
+    return {"model": model, task_type_key: task_type_encoder, day_key: day_encoder}
+
+
+def new_version(model_dir, version=None):
+    """Today's date as YYYY.MM.DD, with a .N suffix if that directory is taken."""
+    base = version or datetime.now().strftime("%Y.%m.%d")
+    version, n = base, 1
+    while os.path.exists(os.path.join(model_dir, version)):
+        n += 1
+        version = f"{base}.{n}"
+    return version
+
+
+def write_json(path, data):
+    """Write JSON through a temporary file so readers never see half of it."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def train(model_dir=MODEL_DIR, dataset_dir=DATASET_DIR, jobs=None, version=None,
+          publish=True, names=None, store=None):
+    """Train the models and write them as a new version.
+
+    Returns the metadata written to the version's metadata.json. With
+    publish, models.json in model_dir is rewritten to point at the new
+    artifacts; otherwise they are only written to their directory. With a
+    feature_store.SessionStore, its users' sessions are added to the
+    datasets; like the bundled datasets other than the student logs, they
+    are not used for the distraction model.
+    """
+    import sklearn
+
+    jobs = jobs or os.cpu_count() or 1
+    names = names or list(PREDICTORS)
+    timings = {}
+
+    encoders = {"day": DAYS, "task_type": MODEL_TASK_TYPES}
+    manifest_path = os.path.join(model_dir, "models.json")
+    manifest = {"models": {}}
+    if publish and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    if set(names) != set(PREDICTORS) and manifest.get("encoders", encoders) != encoders:
+        # The models left alone would be published with encoders they weren't fitted with
+        raise ValueError("models.json was published with other encoders; retrain every model")
+
+    start = time.perf_counter()
+    datasets = load_datasets(dataset_dir, DATASETS, jobs)
+    if store is not None:
+        datasets += load_user_sessions(store)
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df, task_type_encoder, day_encoder = prepare(datasets)
+    data = {name: training_data(name, df) for name in names}
+    timings["preprocess"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=min(jobs, len(names))) as pool:
+        futures = [pool.submit(train_model, name, X, y, task_type_encoder, day_encoder)
+                   for name, (X, y) in data.items()]
+        for future in futures:
+            name, estimator, data_bytes, metrics, seconds = future.result()
+            results[name] = (estimator, data_bytes, metrics, seconds)
+            print(f"Trained {name} in {seconds:.1f} s: {metrics}")
+    timings["train"] = time.perf_counter() - start
+
+    version = new_version(model_dir, version)
+    version_dir = os.path.join(model_dir, version)
+    os.makedirs(version_dir)
+
+    entries = {}
+    for name in names:
+        estimator, data_bytes, metrics, seconds = results[name]
+        file = f"{version}/{ARTIFACT_FILES[name]}"
+        with open(os.path.join(model_dir, file), "wb") as f:
+            f.write(data_bytes)
+        entries[name] = {
+            "file": file,
+            "version": version,
+            "sha256": hashlib.sha256(data_bytes).hexdigest(),
+            "estimator": estimator,
+            "features": PREDICTORS[name].FEATURES,
+            "metrics": metrics,
+            "training_seconds": seconds,
+        }
+
+    metadata = {
+        "version": version,
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "sklearn_version": sklearn.__version__,
+        "random_state": RANDOM_STATE,
+        "test_size": TEST_SIZE,
+        "datasets": {name: source_sha256(os.path.join(dataset_dir, name)) for name in DATASETS},
+        "sessions": {"rows": store.rows, "watermark": store.watermark} if store is not None else None,
+        "encoders": encoders,
+        "timings": {stage: round(seconds, 2) for stage, seconds in timings.items()},
+        "models": entries,
+    }
+    write_json(os.path.join(version_dir, "metadata.json"), metadata)
+
+    if publish:
+        # Models not retrained keep their entries; the encoders are the same for all
+        manifest.update(format=MANIFEST_FORMAT, sklearn_version=sklearn.__version__, encoders=encoders)
+        for name, entry in entries.items():
+            manifest["models"][name] = {key: entry[key] for key in ("file", "version", "sha256")}
+        write_json(manifest_path, manifest)
+    return metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the Suggestions models.")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes (default: one per CPU core)")
+    parser.add_argument("--version", default=None,
+                        help="version name (default: today's date as YYYY.MM.DD)")
+    parser.add_argument("--model-dir", default=MODEL_DIR,
+                        help="where to write the version directory and models.json")
+    parser.add_argument("--dataset-dir", default=DATASET_DIR)
+    parser.add_argument("--with-sessions", nargs="?", const="focus_enhancement.db", metavar="DATABASE",
+                        help="export new sessions from the app database and train on them too")
+    parser.add_argument("--no-publish", action="store_true",
+                        help="write the artifacts without pointing models.json at them")
+    parser.add_argument("models", nargs="*",
+                        help=f"models to train, from {', '.join(PREDICTORS)} (default: all)")
+    args = parser.parse_args()
+    unknown = set(args.models) - set(PREDICTORS)
+    if unknown:
+        parser.error(f"unknown models: {', '.join(sorted(unknown))}")
+
+    start = time.perf_counter()
+    store = None
+    if args.with_sessions:
+        from database import Database
+        from feature_store import SessionStore
+        store = SessionStore()
+        exported = store.export(Database(args.with_sessions))
+        print(f"Exported {exported} new sessions; training on {store.rows}")
+    try:
+        metadata = train(args.model_dir, args.dataset_dir, args.jobs, args.version,
+                         not args.no_publish, args.models or None, store)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Wrote version {metadata['version']} in {time.perf_counter() - start:.1f} s "
+          f"({', '.join(f'{stage} {seconds} s' for stage, seconds in metadata['timings'].items())})")
+
+
+if __name__ == "__main__":
+    main()